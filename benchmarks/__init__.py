@@ -0,0 +1 @@
+"""Performance benchmarks for the Preflop Range Solver."""
\ No newline at end of file
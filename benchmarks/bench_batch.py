@@ -0,0 +1,75 @@
+"""
+Cold-start and throughput benchmark for the headless batch mode.
+Times 'main.py batch' end to end in fresh processes and checks that it never imports tkinter.
+
+Usage: python -m benchmarks.bench_batch [--files 5000] [--workers N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.synthetic import write_range_corpus
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+
+# Runs the batch entry point in-process, then reports whether any GUI module was loaded
+IMPORT_CHECK = (
+    "import sys, runpy; sys.argv = ['main.py'] + sys.argv[1:]\n"
+    "try:\n"
+    "    runpy.run_path({main!r}, run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "loaded = sorted(m for m in sys.modules if m.split('.')[0] in ('tkinter', '_tkinter', 'gui'))\n"
+    "print('GUI modules:', loaded, file=sys.stderr)\n"
+)
+
+
+def run_seconds(args):
+    """Run main.py with args in a fresh interpreter and return the wall time."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, MAIN] + args, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise Exception(f"main.py {' '.join(args)} failed:\n{result.stderr}")
+    return elapsed
+
+
+def best_of(args, repeat):
+    return min(run_seconds(args) for _ in range(repeat))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--files', type=int, default=5000, help="synthetic library size")
+    arg_parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per cold-start timing")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        single = os.path.join(root, 'single')
+        library = os.path.join(root, 'library')
+        write_range_corpus(single, 1, density=0.3)
+        write_range_corpus(library, args.files, density=0.3)
+        out = os.path.join(root, 'stats.csv')
+        workers = ['--workers', str(args.workers)] if args.workers else []
+
+        batch_args = ['batch', '--folder', single, '--out', out]
+        check = subprocess.run([sys.executable, '-c', IMPORT_CHECK.format(main=MAIN)] + batch_args,
+                               capture_output=True, text=True)
+        loaded = check.stderr.strip().splitlines()[-1] if check.stderr.strip() else 'no output'
+        if loaded != 'GUI modules: []':
+            raise Exception(f"Batch mode imported GUI modules ({loaded})")
+        print("Batch mode imports no GUI modules")
+
+        print(f"{'argument parsing only':<32} {best_of(['batch', '--help'], args.repeat) * 1e3:8.0f} ms")
+        print(f"{'cold start, one-file library':<32} {best_of(batch_args, args.repeat) * 1e3:8.0f} ms")
+
+        elapsed = run_seconds(['batch', '--folder', library, '--out', out] + workers)
+        print(f"{f'{args.files} files':<32} {elapsed:8.2f} s   {args.files / elapsed:,.0f} files/s")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Benchmark for weighted multi-board aggregation.
+Aggregates a scenario across a synthetic board library, checks the pooled result against a
+direct per-file computation and against a serial run, checks the board filters and weightings,
+then times the aggregation for one worker and for all cores.
+
+Usage: python -m benchmarks.bench_boards [--boards 400] [--workers N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from data.board_report import aggregate_boards, board_features, parse_board_filter, isomorphic_weight
+from data.card_removal import dead_combo_mask, parse_dead_cards
+from data.decision_tree import normalize_action
+from data.hand_range import NUM_CLASSES, COMBO_CLASS
+from data.solution_loader import SolutionLoader
+from benchmarks.synthetic import write_solution_library
+
+
+def expected_frequencies(folder, files, weights):
+    """Aggregate the root node file by file with plain numpy, as the reference result."""
+    loader = SolutionLoader(memory_budget=0, use_packs=False)
+    numerators = {}
+    denominator = np.zeros(NUM_CLASSES)
+    for path, board in files:
+        node = loader.open_tree(os.path.join(folder, path)).node(())
+        reach = node.range.frequencies if node.range else np.ones(1326)
+        reach = np.where(dead_combo_mask(parse_dead_cards(board)), 0, reach) * weights[board]
+        for label, strategy in zip(node.actions, node.strategy):
+            for combo in np.flatnonzero(reach):
+                values = numerators.setdefault(normalize_action(label), np.zeros(NUM_CLASSES))
+                values[COMBO_CLASS[combo]] += reach[combo] * strategy[combo]
+        denominator += np.bincount(COMBO_CLASS, weights=reach, minlength=NUM_CLASSES)
+    reached = denominator > 0
+    return {action: np.where(reached, values / np.where(reached, denominator, 1), 0)
+            for action, values in numerators.items()}
+
+
+def check_features():
+    cases = {'AsAdKs': (True, 'two-tone', 'A'), '2h7h9h': (False, 'monotone', '9'), 'Tc4dJs': (False, 'rainbow', 'J')}
+    for board, (paired, texture, high) in cases.items():
+        features = board_features(board)
+        if (features['paired'], features['texture'], features['high']) != (paired, texture, high):
+            raise Exception(f"Wrong features for {board}: {features}")
+    counts = {'Tc4dJs': 24, '2h7h9h': 4, 'AsAdKs': 12, 'AsAdKh': 12, 'AsAdAh': 4}
+    for board, count in counts.items():
+        if isomorphic_weight(parse_dead_cards(board)) != count:
+            raise Exception(f"Wrong isomorphic weight for {board}")
+    if not parse_board_filter('paired,high=AK')(board_features('AsAdKs')) or parse_board_filter('rainbow')(board_features('AsAdKs')):
+        raise Exception("Board filter mismatch")
+    print("Board features, isomorphic weights and filters ok")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--boards', type=int, default=400, help="board files in the scenario")
+    arg_parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = arg_parser.parse_args()
+
+    check_features()
+    with tempfile.TemporaryDirectory() as root:
+        folder = os.path.join(root, 'library')
+        write_solution_library(folder, games=1, stacks=1, scenarios=1, boards=args.boards, tree_nodes=2)
+        game = os.listdir(folder)[0]
+        folder = os.path.join(folder, game)
+        stack = os.listdir(folder)[0]
+        scenario = next(name for name in os.listdir(os.path.join(folder, stack)) if not name.endswith('.txt'))
+
+        report = aggregate_boards(folder, stack, scenario, weighting='isomorphic', workers=args.workers, chunk_size=8)
+        if report.errors or len(report.boards) != args.boards:
+            raise Exception(f"Aggregated {len(report.boards)} boards with errors {report.errors[:3]}")
+        serial = aggregate_boards(folder, stack, scenario, weighting='isomorphic', workers=1)
+        for action, values in report.class_frequencies().items():
+            if not np.allclose(values, serial.class_frequencies()[action], rtol=1e-9, atol=1e-12):
+                raise Exception(f"Parallel and serial results differ for {action}")
+
+        files = [(os.path.join(stack, scenario, row['board'] + '.txt'), row['board']) for row in report.boards[:40]]
+        weights = {board: isomorphic_weight(parse_dead_cards(board)) for _, board in files}
+        subset = aggregate_boards(folder, stack, scenario, weighting=weights, workers=args.workers)
+        expected = expected_frequencies(folder, files, weights)
+        for action, values in subset.class_frequencies().items():
+            if not np.allclose(values, expected[action], atol=1e-9):
+                raise Exception(f"Aggregated frequencies for {action} differ from the direct computation")
+        if len(subset.boards) != len(files) or subset.skipped != args.boards - len(files):
+            raise Exception("A board weight mapping must skip unlisted boards")
+        print(f"Pooled, serial and direct aggregation agree ({len(files)} boards checked directly)")
+
+        for terms in ('paired', 'unpaired', 'monotone', 'two-tone', 'rainbow', 'high=A'):
+            matches = sum(parse_board_filter(terms)(board_features(row['board'])) for row in report.boards)
+            filtered = aggregate_boards(folder, stack, scenario, board_filter=parse_board_filter(terms), workers=args.workers)
+            if len(filtered.boards) != matches:
+                raise Exception(f"Filter {terms!r} kept {len(filtered.boards)} boards, expected {matches}")
+            print(f"  {terms:<10} {matches:>5} boards")
+
+        print(f"{'workers':>8} {'seconds':>9} {'boards/s':>10}")
+        for workers in (1, args.workers or os.cpu_count() or 1):
+            start = time.perf_counter()
+            aggregate_boards(folder, stack, scenario, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:9.2f} {args.boards / elapsed:10,.0f}")
+        print("overall: " + ', '.join(f"{action} {value * 100:.1f}%" for action, value in report.overall().items()))
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
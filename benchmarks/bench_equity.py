@@ -0,0 +1,126 @@
+"""
+Build-time, size and lookup-latency report for the preflop equity tables.
+Uses the tables in --dir, building them into a temporary folder when they are missing.
+
+Usage: python -m benchmarks.bench_equity [--dir Settings/Equity] [--boards 20000] [--repeat 200] [--pairings 4000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from data.equity_table import (
+    EQUITY_DIR, COMBO_EQUITY_FILE, EquityTable, build_combo_equity, build_class_equity, save_tables
+)
+from data.card_removal import stack_ranges, pair_weights
+from data.hand_range import COMBO_CONFLICTS
+from data.range_parser import RangeParser
+from benchmarks.synthetic import random_range_line
+
+SAMPLE_FILE = os.path.join('Settings', 'Solutions', '6-max Cash', '100', 'UTG_open.txt')
+
+
+def time_per_call(func, repeat):
+    """Return the mean seconds per call of func()."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def report_table(table, repeat):
+    parser = RangeParser()
+    rng = np.random.default_rng(0)
+    villain = parser.parse_range_line(random_range_line(rng, 0.3))
+    if os.path.exists(SAMPLE_FILE):
+        with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+            hero = parser.parse_range_line(f.read())
+    else:
+        hero = parser.parse_range_line(random_range_line(rng, 0.1))
+
+    print(f"Table size: {table.nbytes / 1e6:.2f} MB "
+          f"(combo {table.combo.nbytes / 1e6:.2f} MB, class {table.classes.nbytes / 1e6:.2f} MB)")
+
+    start = time.perf_counter()
+    table.range_vs_range(hero, villain)
+    print(f"{'first lookup (cold map)':<28} {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+    timings = [
+        ('class vs class', lambda: table.class_vs_class('AKs', 'QQ')),
+        ('combo vs range', lambda: table.hand_vs_range('AcKd', villain)),
+        ('class vs range', lambda: table.hand_vs_range('AKo', villain)),
+        ('range vs range', lambda: table.range_vs_range(hero, villain)),
+        ('range vs random', lambda: table.range_vs_range(hero)),
+        ('all combos vs range', lambda: table.combo_equities(villain))
+    ]
+    for label, func in timings:
+        print(f"{label:<28} {time_per_call(func, repeat) * 1e6:8.1f} us")
+    print(f"Hero range vs random: {table.range_vs_range(hero) * 100:.1f}%, "
+          f"vs synthetic range: {table.range_vs_range(hero, villain) * 100:.1f}%")
+    print(f"Hero range vs random with AhKs7d dead: {table.range_vs_range(hero, dead_cards='AhKs7d') * 100:.1f}%")
+
+
+def report_batched(table, pairings):
+    """Check card removal against the conflict mask and time batched pairings."""
+    parser = RangeParser()
+    rng = np.random.default_rng(1)
+    distinct = 64
+    heroes = stack_ranges([parser.parse_range_line(random_range_line(rng, 0.2)) for _ in range(distinct)])
+    villains = stack_ranges([parser.parse_range_line(random_range_line(rng, 0.4)) for _ in range(distinct)])
+
+    # Reference: the full 1326x1326 non-conflict product
+    live = (~COMBO_CONFLICTS).astype(np.float64)
+    expected = heroes.astype(np.float64) @ live @ villains.T.astype(np.float64)
+    error = np.abs(pair_weights(heroes, villains) - expected).max() / expected.max()
+    if error > 1e-5:
+        raise Exception(f"Card removal weights differ from the conflict mask product (relative error {error:.2e})")
+    matrix = table.equity_matrix(heroes, villains)
+    pairwise = table.pairwise_equity(heroes, villains)
+    if np.nanmax(np.abs(np.diag(matrix) - pairwise)) > 1e-5:
+        raise Exception("Pairwise equities disagree with the equity matrix")
+    print(f"Card removal check: {distinct}x{distinct} matchup weights match the conflict mask product")
+
+    repeat = max(1, pairings // distinct)
+    heroes = np.tile(heroes, (repeat, 1))
+    villains = np.tile(villains, (repeat, 1))
+    start = time.perf_counter()
+    table.pairwise_equity(heroes, villains, dead_cards='Ah')
+    elapsed = time.perf_counter() - start
+    print(f"{'pairwise range vs range':<28} {len(heroes) / elapsed:10,.0f} pairings/s ({len(heroes)} pairings)")
+
+    side = int(np.sqrt(pairings))
+    start = time.perf_counter()
+    table.equity_matrix(heroes[:side], villains[:side])
+    elapsed = time.perf_counter() - start
+    print(f"{'all-vs-all equity matrix':<28} {side * side / elapsed:10,.0f} pairings/s ({side}x{side})")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--dir', default=EQUITY_DIR, help="table directory")
+    arg_parser.add_argument('--boards', type=int, default=20000, help="boards sampled if the tables must be built")
+    arg_parser.add_argument('--repeat', type=int, default=200, help="repetitions per lookup timing")
+    arg_parser.add_argument('--pairings', type=int, default=4000, help="range pairings per batched timing")
+    args = arg_parser.parse_args()
+
+    if os.path.exists(os.path.join(args.dir, COMBO_EQUITY_FILE)):
+        table = EquityTable(args.dir)
+        report_table(table, args.repeat)
+        report_batched(table, args.pairings)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        combo_equity = build_combo_equity(args.boards)
+        class_equity = build_class_equity(combo_equity)
+        save_tables(directory, combo_equity, class_equity)
+        print(f"Built tables from {args.boards} boards in {time.perf_counter() - start:.1f}s")
+        table = EquityTable(directory)
+        report_table(table, args.repeat)
+        report_batched(table, args.pairings)
+        del table
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Redraw benchmark for the range grid renderers.
+Animates the button grid and the canvas grid through the same range sequence and checks they show the same cells.
+
+Usage: python -m benchmarks.bench_grid [--frames 300] [--grids 4] [--change 0.1]
+Needs a display (on a headless machine run it under xvfb-run).
+"""
+
+import argparse
+import random
+import time
+import tkinter as tk
+import numpy as np
+from data.hand_range import NUM_CLASSES, Range
+from gui.range_grid import RangeGrid, CanvasRangeGrid
+
+FREQUENCY_STEPS = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def range_sequence(frames, change, seed=0):
+    """Build ranges where each frame redraws a change share of the previous frame's classes."""
+    rng = random.Random(seed)
+    class_freqs = np.array([rng.choice(FREQUENCY_STEPS) for _ in range(NUM_CLASSES)], dtype=np.float32)
+    ranges = []
+    for _ in range(frames):
+        for index in rng.sample(range(NUM_CLASSES), max(1, int(change * NUM_CLASSES))):
+            class_freqs[index] = rng.choice(FREQUENCY_STEPS)
+        ranges.append(Range.from_class_frequencies(class_freqs.copy()))
+    return ranges
+
+
+def time_frames(root, grids, ranges):
+    """Show every range on every grid, letting Tk redraw after each frame; returns ms per frame."""
+    root.update()
+    start = time.perf_counter()
+    for range_data in ranges:
+        for grid in grids:
+            grid.update_range(range_data)
+        root.update_idletasks()
+    return (time.perf_counter() - start) * 1000 / len(ranges)
+
+
+def check_same_cells(buttons, canvas):
+    """Compare what the two renderers show, cell by cell."""
+    for index in range(NUM_CLASSES):
+        row, col = divmod(index, 13)
+        button = buttons.buttons[(row, col)]
+        fill = canvas.canvas.itemcget(canvas.rect_items[index], 'fill')
+        text = canvas.canvas.itemcget(canvas.text_items[index], 'text')
+        if button.cget('text') != text or button.cget('bg').lower() != fill.lower():
+            raise Exception(f"Cell {buttons.get_hand_text(row, col)}: button shows "
+                            f"{button.cget('text')!r} on {button.cget('bg')}, canvas {text!r} on {fill}")
+
+
+def build_grids(root, grid_class, count):
+    """Place count grids side by side in their own frame."""
+    frame = tk.Frame(root)
+    frame.pack(side='top')
+    grids = []
+    for i in range(count):
+        cell = tk.Frame(frame)
+        cell.grid(row=0, column=i, padx=4)
+        grid = grid_class(cell)
+        grid.grid.grid(row=0, column=0)
+        grids.append(grid)
+    return frame, grids
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--frames', type=int, default=300, help="ranges per animation")
+    arg_parser.add_argument('--grids', type=int, default=4, help="grids shown side by side")
+    arg_parser.add_argument('--change', type=float, default=0.1, help="share of classes changing per frame")
+    args = arg_parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SystemExit(f"No display available ({e}); run under xvfb-run")
+
+    smooth = range_sequence(args.frames, args.change)
+    jumpy = range_sequence(args.frames, 1.0, seed=1)
+
+    # Correctness first: both renderers must show the same cells after every kind of update
+    frame, (buttons,) = build_grids(root, RangeGrid, 1)
+    canvas_frame, (canvas,) = build_grids(root, CanvasRangeGrid, 1)
+    for range_data in smooth[:50] + jumpy[:50]:
+        buttons.update_range(range_data)
+        canvas.update_range(range_data)
+        check_same_cells(buttons, canvas)
+    buttons.clear()
+    canvas.clear()
+    check_same_cells(buttons, canvas)
+    frame.destroy()
+    canvas_frame.destroy()
+    print("Canvas grid matches the button grid")
+
+    print(f"{'renderer':<10} {'grids':>5} {'smooth ms/frame':>16} {'random ms/frame':>16}")
+    for count in sorted({1, args.grids}):
+        for name, grid_class in (('buttons', RangeGrid), ('canvas', CanvasRangeGrid)):
+            frame, grids = build_grids(root, grid_class, count)
+            smooth_ms = time_frames(root, grids, smooth)
+            jumpy_ms = time_frames(root, grids, jumpy)
+            frame.destroy()
+            print(f"{name:<10} {count:>5} {smooth_ms:>16.2f} {jumpy_ms:>16.2f}")
+
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Benchmark for the hand -> range inverted index.
+Checks index lookups against a brute-force scan of the range matrix (including incremental
+updates and a save/load round trip), then times point lookups on a large synthetic index.
+
+Usage: python -m benchmarks.bench_hand_index [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from data.hand_index import HandIndex, default_index_path, frequency_buckets, bucket_range
+from data.hand_range import CLASS_INDEX, COMBO_CLASS, combo_index
+from data.preload import preload
+from data.range_store import class_matrix
+from data.solution_loader import SolutionLoader
+from benchmarks.synthetic import random_range_line, write_solution_library
+
+# (hand, search options) pairs checked against the brute-force scan
+QUERIES = [
+    ('KQo', {'pure': True}),
+    ('22', {'min_frequency': 0.25, 'max_frequency': 0.75}),
+    ('A5s', {'min_frequency': 0.5}),
+    ('72o', {}),
+    ('AA', {'max_frequency': 0.3})
+]
+
+
+def brute_force(matrix, live, hand, min_frequency=None, max_frequency=None, pure=False):
+    """Get the live rows of an (n, 1326) matrix matching a search, from the bucketed frequencies."""
+    if hand in CLASS_INDEX:
+        frequencies = class_matrix(matrix)[:, CLASS_INDEX[hand]]
+    else:
+        frequencies = matrix[:, combo_index(hand)]
+    played = frequencies > 0
+    buckets = np.zeros(len(matrix), dtype=np.uint8)
+    buckets[played] = frequency_buckets(frequencies[played])
+    first, last = (100, 100) if pure else bucket_range(min_frequency, max_frequency)
+    return np.flatnonzero(played & (buckets >= first) & (buckets <= last) & live)
+
+
+def check_index(index, matrix, queries):
+    for hand, options in queries:
+        expected = brute_force(matrix, index.live, hand, **options)
+        found = index.search(hand, **options)
+        if not np.array_equal(found, expected):
+            raise Exception(f"search({hand!r}, {options}) found {len(found)} ranges, expected {len(expected)}")
+
+
+def index_matrix(folder, index):
+    """Get the range matrix in the index's id order by reparsing every indexed range."""
+    loader = SolutionLoader(memory_budget=0)
+    rows = []
+    for path, slot in zip(index.paths, index.slots):
+        full_path = os.path.join(folder, path)
+        solution = loader.load_solution(full_path) if os.path.exists(full_path) else None
+        if solution is None or not solution.get(slot):
+            rows.append(np.zeros(1326, dtype=np.float32))
+        else:
+            rows.append(solution[slot].frequencies)
+    return np.stack(rows)
+
+
+def check_library(root):
+    """Index a small library with combos, then update it and round-trip it through save/load."""
+    folder = os.path.join(root, 'library')
+    write_solution_library(folder, games=2, stacks=3, scenarios=6, boards=2, tree_nodes=1)
+    index = HandIndex.build(folder, include_combos=True, workers=2)
+    queries = QUERIES + [('KhQd', {}), ('AsAh', {'pure': True})]
+    check_index(index, index_matrix(folder, index), queries)
+
+    existing = sorted({path for path in index.paths})
+    os.remove(os.path.join(folder, existing[0]))
+    with open(os.path.join(folder, existing[1]), 'w', encoding='utf-8') as f:
+        f.write(random_range_line(random.Random(1), 0.4))
+    stat = os.stat(os.path.join(folder, existing[1]))
+    os.utime(os.path.join(folder, existing[1]), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    with open(os.path.join(folder, os.path.dirname(existing[1]), 'SB_vs_BB.txt'), 'w', encoding='utf-8') as f:
+        f.write(random_range_line(random.Random(2), 0.4))
+    counts = index.update(folder, workers=1)
+    if counts != (1, 1, 1):
+        raise Exception(f"update() reported {counts}, expected (1, 1, 1)")
+    check_index(index, index_matrix(folder, index), queries)
+
+    path = default_index_path(folder)
+    index.save(path)
+    loaded = HandIndex.load(path)
+    check_index(loaded, index_matrix(folder, loaded), queries)
+    if len(loaded) != len(preload(folder, workers=1).ranges):
+        raise Exception("Saved index does not cover every range of the library")
+    print(f"Index matches a brute-force scan on {len(existing)} files; update and save/load round trip ok")
+
+
+def synthetic_matrix(rows, seed=0):
+    """Get rows drawn from a pool of random ranges with pure and mixed frequencies."""
+    rng = random.Random(seed)
+    parser = SolutionLoader(memory_budget=0).range_parser
+    pool = np.stack([parser.parse_range_line(random_range_line(rng, rng.uniform(0.05, 0.6))).frequencies
+                     for _ in range(256)])
+    # Random combos are almost never pure as a class, so make a few classes pure in each range
+    for row in pool:
+        row[np.isin(COMBO_CLASS, rng.sample(range(169), 12))] = 1.0
+    return pool[np.random.default_rng(seed).integers(0, len(pool), rows)]
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=100000, help="ranges in the synthetic index")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per query timing")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        check_library(root)
+
+        matrix = synthetic_matrix(args.rows)
+        paths = [f"game/{row}.txt" for row in range(args.rows)]
+
+        def build():
+            index = HandIndex()
+            index.add_ranges(matrix, paths, ['range'] * args.rows, [0] * args.rows)
+            return index
+
+        build_ms, index = timed(build, 1)
+        check_index(index, matrix, QUERIES)
+        print(f"Synthetic index: {len(index):,} ranges, {index.nbytes / 1e6:.1f} MB, built in {build_ms:.0f} ms")
+
+        for hand, options in QUERIES:
+            index_ms, found = timed(lambda: index.search(hand, **options), args.repeat)
+            scan_ms, _ = timed(lambda: brute_force(matrix, index.live, hand, **options), 1)
+            print(f"{hand:>4} {str(options):<48} {len(found):>7} hits  {index_ms:7.2f} ms  (scan {scan_ms:7.1f} ms)")
+
+        both = [('KQo', {'pure': True}), ('22', {'min_frequency': 0.25, 'max_frequency': 0.75})]
+        both_ms, found = timed(lambda: index.search_all(both), args.repeat)
+        print(f"KQo pure and 22 at 25-75%: {len(found)} hits in {both_ms:.2f} ms")
+
+        path = os.path.join(root, 'big.hand-index.npz')
+        save_ms, _ = timed(lambda: index.save(path), 1)
+        load_ms, loaded = timed(lambda: HandIndex.load(path), args.repeat)
+        print(f"save {save_ms:.0f} ms, load {load_ms:.0f} ms, file {os.path.getsize(path) / 1e6:.1f} MB")
+        if not np.array_equal(loaded.search('KQo', pure=True), index.search('KQo', pure=True)):
+            raise Exception("Loaded index answers differently")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Benchmark for content-hash interning of ranges.
+Loads a board-heavy library with and without interning, checks that every range is
+unchanged and that identical ranges share one instance, then checks the deduplicated
+pack and compiled cache formats and reports parse counts, dedup ratios and sizes.
+
+Usage: python -m benchmarks.bench_intern [--boards 8]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from data.solution_cache import SolutionCache
+from data.solution_loader import SolutionLoader
+from data.solution_pack import SolutionPack, build_pack, dedup_summary
+from benchmarks.synthetic import write_solution_library
+
+RANGE_NAMES = ('range', 'oop_range', 'ip_range')
+
+
+def solution_paths(folder):
+    return sorted(os.path.join(directory, name)
+                  for directory, _, names in os.walk(folder) for name in names if name.endswith('.txt'))
+
+
+def count_parses(loader):
+    """Wrap a loader's parse_range_line to count calls; returns the counter list."""
+    calls = [0]
+    parse = loader.range_parser.parse_range_line
+
+    def counted(*args, **kwargs):
+        calls[0] += 1
+        return parse(*args, **kwargs)
+
+    loader.range_parser.parse_range_line = counted
+    return calls
+
+
+def load_all(loader, paths):
+    start = time.perf_counter()
+    solutions = [loader.load_solution(path) for path in paths]
+    return solutions, (time.perf_counter() - start) * 1000
+
+
+def check_same(solutions, expected, label):
+    for solution, reference in zip(solutions, expected):
+        for name in RANGE_NAMES:
+            if solution[name] != reference[name]:
+                raise Exception(f"{label}: {name} differs from the plain parse")
+
+
+def distinct_instances(solutions):
+    return len({id(solution[name]) for solution in solutions for name in RANGE_NAMES})
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--boards', type=int, default=8, help="board files per scenario")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        folder = os.path.join(root, 'library')
+        write_solution_library(folder, games=1, stacks=4, scenarios=10, boards=args.boards, tree_nodes=1)
+        paths = solution_paths(folder)
+
+        plain = SolutionLoader(memory_budget=0, use_packs=False, intern_ranges=False)
+        plain_calls = count_parses(plain)
+        expected, plain_ms = load_all(plain, paths)
+
+        interned = SolutionLoader(memory_budget=0, use_packs=False)
+        interned_calls = count_parses(interned)
+        solutions, interned_ms = load_all(interned, paths)
+        check_same(solutions, expected, "interned loader")
+        if any(solution[name].frequencies.flags.writeable for solution in solutions for name in RANGE_NAMES):
+            raise Exception("Interned ranges must be read-only")
+        first = {}
+        for solution in solutions:
+            for name in RANGE_NAMES:
+                key = solution[name].frequencies.tobytes()
+                if first.setdefault(key, solution[name]) is not solution[name]:
+                    raise Exception("Identical ranges are not shared")
+
+        stats = interned.intern_stats()
+        print(f"{len(paths)} files, {len(paths) * len(RANGE_NAMES)} range slots")
+        print(f"{'mode':<10} {'parses':>8} {'instances':>10} {'load ms':>9}")
+        print(f"{'plain':<10} {plain_calls[0]:>8} {distinct_instances(expected):>10} {plain_ms:9.1f}")
+        print(f"{'interned':<10} {interned_calls[0]:>8} {distinct_instances(solutions):>10} {interned_ms:9.1f}")
+        print(f"dedup ratio {stats['dedup_ratio']:.1f}x ({stats['hits']} of {stats['lookups']} lookups shared)")
+
+        pack_path, _ = build_pack(folder)
+        pack = SolutionPack(pack_path)
+        check_same([pack.load_path(path) for path in paths], expected, "pack")
+        print(f"pack {os.path.getsize(pack_path) / 1e6:.2f} MB: {dedup_summary(pack.header)}")
+
+        cache = SolutionCache(cache_dir=os.path.join(root, 'cache'))
+        for path, solution in zip(paths, expected):
+            cache.store(path, solution)
+        check_same([cache.load(path) for path in paths], expected, "compiled cache")
+        cached = SolutionLoader(cache=cache, memory_budget=0, use_packs=False)
+        check_same(load_all(cached, paths)[0], expected, "loader over the compiled cache")
+        cache_bytes = sum(os.path.getsize(os.path.join(root, 'cache', name)) for name in os.listdir(os.path.join(root, 'cache')))
+        print(f"compiled cache {cache_bytes / 1e6:.2f} MB; round trips ok")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
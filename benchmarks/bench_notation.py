@@ -0,0 +1,112 @@
+"""
+Benchmark for the shorthand range notation compiler and exporter.
+Checks known expressions and export/compile round trips on random and solver ranges,
+then times compiling with and without the expression cache, and exporting.
+
+Usage: python -m benchmarks.bench_notation [--ranges 500] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+import numpy as np
+from data.hand_range import Range, COMBO_CLASS, NUM_CLASSES, class_combo_mask
+from data.range_notation import RangeNotation
+from data.range_parser import RangeParser
+from benchmarks.synthetic import random_range_line
+
+# Expressions and the classes they must cover (every combo at frequency 1 unless weighted)
+EXPECTED_CLASSES = [
+    ("AA-TT", ['AA', 'KK', 'QQ', 'JJ', 'TT']),
+    ("TT+", ['AA', 'KK', 'QQ', 'JJ', 'TT']),
+    ("ATs+", ['AKs', 'AQs', 'AJs', 'ATs']),
+    ("AKs-ATs", ['AKs', 'AQs', 'AJs', 'ATs']),
+    ("KQ", ['KQs', 'KQo']),
+    ("98s-65s", ['98s', '87s', '76s', '65s']),
+    ("J9o-T8o", ['J9o', 'T8o'])
+]
+
+# Export results that must be exactly this short
+EXPECTED_EXPORTS = [
+    ("AA, KK, QQ, JJ, TT, AKs, AQs, AJs, ATs, KQo", "TT+, ATs+, KQo"),
+    ("AKs-ATs:0.5, AA-TT", "TT+, ATs+:0.5"),
+    ("AK, AhKh:0", "AK, AhKh:0"),
+    ("22+, A2+", "22+, A2+")
+]
+
+
+def check_known(compiler):
+    for text, classes in EXPECTED_CLASSES:
+        expected = Range(class_combo_mask(classes).astype(np.float32))
+        if compiler.compile(text) != expected:
+            raise Exception(f"{text!r} does not compile to {classes}")
+    mixed = compiler.compile("AKs-ATs:0.5, AA-TT, AcKd:25%")
+    if mixed.hand_frequency('AQs') != 0.5 or mixed.hand_frequency('AcKd') != 0.25 or mixed.hand_frequency('TT') != 1:
+        raise Exception("Weighted terms compile to the wrong frequencies")
+    for text, expected in EXPECTED_EXPORTS:
+        exported = compiler.export(compiler.compile(text))
+        if exported != expected:
+            raise Exception(f"{text!r} exports as {exported!r}, expected {expected!r}")
+    for bad in ("AAs", "AK-QJs", "AxKx", "AK:x", "AcAc"):
+        try:
+            compiler.compile(bad)
+        except ValueError:
+            continue
+        raise Exception(f"{bad!r} should be rejected")
+
+
+def sample_ranges(count, seed=0):
+    """Get solver-like ranges (class-level frequencies with a few combo exceptions) and raw random ones."""
+    rng = np.random.default_rng(seed)
+    parser = RangeParser()
+    weights = np.array([0, 0, 1, 1, 0.5, 0.25, 0.35, 0.7], dtype=np.float32)
+    ranges = []
+    for i in range(count):
+        frequencies = weights[rng.integers(0, len(weights), NUM_CLASSES)][COMBO_CLASS]
+        exceptions = rng.integers(0, len(frequencies), rng.integers(0, 12))
+        frequencies[exceptions] = rng.random(len(exceptions)).astype(np.float32)
+        ranges.append(Range(frequencies))
+        if i % 10 == 0:
+            ranges.append(parser.parse_range_line(random_range_line(random.Random(i), 0.3)))
+    return ranges
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--ranges', type=int, default=500, help="random ranges to round-trip")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per timing")
+    args = arg_parser.parse_args()
+
+    compiler = RangeNotation()
+    check_known(compiler)
+    ranges = sample_ranges(args.ranges)
+    texts = [compiler.export(range_data) for range_data in ranges]
+    for range_data, text in zip(ranges, texts):
+        if compiler.compile(text) != range_data:
+            raise Exception(f"Round trip failed for {text[:80]!r}...")
+    line_chars = np.mean([len(' '.join(f"{i}_{f}" for i, f in enumerate(r.frequencies) if f)) for r in ranges[:50]])
+    print(f"{len(ranges)} ranges round-trip exactly; shorthand averages {np.mean([len(t) for t in texts]):.0f} "
+          f"characters (combo lines ~{line_chars:.0f})")
+
+    uncached = RangeNotation(cache_size=0)
+    cold_ms, _ = timed(lambda: [uncached.compile(text) for text in texts], args.repeat)
+    warm_ms, _ = timed(lambda: [compiler.compile(text) for text in texts], args.repeat)
+    export_ms, _ = timed(lambda: [compiler.export(range_data) for range_data in ranges], 1)
+    print(f"compile uncached {cold_ms / len(texts) * 1000:8.1f} us/range")
+    print(f"compile cached   {warm_ms / len(texts) * 1000:8.1f} us/range")
+    print(f"export           {export_ms / len(ranges) * 1000:8.1f} us/range")
+    print(f"cache: {compiler.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Benchmark for palette-coded range storage.
+Checks that compact solutions and tree nodes decode to what was parsed (per-kind round
+trips are in tests/test_palette.py), then compares the resident memory of a fully
+preloaded library with and without compact_memory and times cache hits in both modes.
+
+Usage: python -m benchmarks.bench_palette [--repeat 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from data.solution_loader import SolutionLoader
+from benchmarks.synthetic import write_solution_library
+
+
+def check_library(folder, loader):
+    """Compare compact cache hits and compact tree nodes with freshly parsed data."""
+    plain = SolutionLoader(memory_budget=0)
+    paths = solution_paths(folder)
+    for path in paths:
+        loader.load_solution(path)
+    for path in paths:
+        expected, cached = plain.load_solution(path), loader.load_solution(path)
+        for name in ('range', 'oop_range', 'ip_range'):
+            if cached[name] != expected[name]:
+                raise Exception(f"Compact cache changed {name} of {path}")
+        tree, plain_tree = loader.open_tree(path), plain.open_tree(path)
+        for node_path in list(tree.paths())[:4]:
+            for _ in range(2):
+                node, expected_node = tree.node(node_path), plain_tree.node(node_path)
+                if node.actions != expected_node.actions or not np.array_equal(node.strategy, expected_node.strategy):
+                    raise Exception(f"Compact tree node {node_path} of {path} differs")
+                if (node.range is None) != (expected_node.range is None) or (node.range and node.range != expected_node.range):
+                    raise Exception(f"Compact tree node {node_path} of {path} has a different range")
+    print(f"Compact cache and tree nodes match the parser on {len(paths)} files")
+
+
+def solution_paths(folder):
+    return sorted(os.path.join(directory, name)
+                  for directory, _, names in os.walk(folder) for name in names if name.endswith('.txt'))
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per timing")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        folder = os.path.join(root, 'library')
+        write_solution_library(folder, games=2, stacks=6, scenarios=15, boards=2, tree_nodes=2)
+        check_library(folder, SolutionLoader(memory_budget=1 << 30, compact_memory=True))
+
+        paths = solution_paths(folder)
+        print(f"{'mode':<10} {'resident MB':>12} {'per file KB':>12} {'hit us':>8}")
+        for compact in (False, True):
+            loader = SolutionLoader(memory_budget=1 << 30, compact_memory=compact)
+            loader.preload(folder, workers=2)
+            resident = loader.cache_stats()['resident_bytes']
+            hit_ms, _ = timed(lambda: [loader.load_solution(path) for path in paths], args.repeat)
+            print(f"{'compact' if compact else 'float32':<10} {resident / 1e6:12.2f} {resident / len(paths) / 1e3:12.2f} "
+                  f"{hit_ms * 1000 / len(paths):8.1f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
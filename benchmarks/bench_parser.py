@@ -0,0 +1,112 @@
+"""
+Micro-benchmark for range line parsing.
+Compares the lookup-table tokenizer with the original per-token dict parser.
+
+Usage: python -m benchmarks.bench_parser [--files 10000] [--repeat 200]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from data.range_parser import RangeParser
+from benchmarks.synthetic import write_range_corpus
+
+SAMPLE_FILE = os.path.join('Settings', 'Solutions', '6-max Cash', '100', 'UTG_open.txt')
+
+
+def legacy_convert_to_generic_hand(specific_hand):
+    """The original convert_to_generic_hand, kept as the benchmark baseline."""
+    if len(specific_hand) != 4:
+        return None
+        
+    rank1, suit1, rank2, suit2 = specific_hand[0], specific_hand[1], specific_hand[2], specific_hand[3]
+    
+    rank_order = {'A': 14, 'K': 13, 'Q': 12, 'J': 11, 'T': 10, '9': 9, '8': 8, 
+                  '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2}
+    
+    if rank_order.get(rank1, 0) < rank_order.get(rank2, 0):
+        rank1, rank2 = rank2, rank1
+        
+    if rank1 == rank2:
+        return f"{rank1}{rank2}"
+    elif suit1 == suit2:
+        return f"{rank1}{rank2}s"
+    else:
+        return f"{rank1}{rank2}o"
+
+
+def legacy_parse_range_line(line):
+    """The original dict-based parse_range_line, kept as the benchmark baseline."""
+    range_dict = {}
+    
+    if not line.strip():
+        return range_dict
+        
+    for part in line.split():
+        if '_' in part:
+            hand, freq_str = part.rsplit('_', 1)
+            try:
+                frequency = float(freq_str)
+                generic_hand = legacy_convert_to_generic_hand(hand)
+                if generic_hand:
+                    range_dict[generic_hand] = frequency
+            except ValueError:
+                continue
+                
+    return range_dict
+
+
+def time_per_call(func, arg, repeat):
+    """Return the mean seconds per call of func(arg)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - start) / repeat
+
+
+def time_files(func, paths):
+    """Return the seconds taken to read and parse every file in paths."""
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            func(f.read())
+    return time.perf_counter() - start
+
+
+def report(label, legacy, fast, unit, scale):
+    print(f"{label:<28} legacy {legacy * scale:10.1f} {unit}   "
+          f"fast {fast * scale:10.1f} {unit}   speedup {legacy / fast:5.1f}x")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--files', type=int, default=10000, help="synthetic corpus size")
+    arg_parser.add_argument('--repeat', type=int, default=200, help="repetitions per single-line timing")
+    arg_parser.add_argument('--density', type=float, default=1.0, help="share of combos per synthetic line")
+    args = arg_parser.parse_args()
+    
+    parser = RangeParser()
+    
+    if os.path.exists(SAMPLE_FILE):
+        with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+            line = f.read()
+        tokens = len(line.split())
+        legacy = time_per_call(legacy_parse_range_line, line, args.repeat)
+        fast = time_per_call(parser.parse_range_line, line, args.repeat)
+        report(f"sample ({tokens} tokens)", legacy, fast, "us/line", 1e6)
+    else:
+        print(f"Sample file not found: {SAMPLE_FILE}")
+        
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_range_corpus(root, args.files, density=args.density)
+        # Warm the page cache so both passes measure parsing rather than disk reads
+        time_files(len, paths)
+        legacy = time_files(legacy_parse_range_line, paths)
+        fast = time_files(parser.parse_range_line, paths)
+        report(f"corpus ({args.files} files)", legacy, fast, "s total", 1)
+        print(f"{'':<28} legacy {args.files / legacy:10.0f} files/s  fast {args.files / fast:10.0f} files/s")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Benchmark for the columnar range store.
+Checks a store built from a generated library against SolutionLoader, then times
+cross-scenario queries, save, load and append on a large synthetic store.
+
+Usage: python -m benchmarks.bench_store [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from data.range_store import RangeStore
+from data.solution_loader import SolutionLoader
+from benchmarks.synthetic import GAME_NAMES, POSITIONS, STACK_SIZES, random_range_line, write_solution_library
+
+
+def check_library(root):
+    """Build a store from a small library and compare it with SolutionLoader; also checks update()."""
+    folder = os.path.join(root, 'library')
+    write_solution_library(folder, games=2, stacks=3, scenarios=6, boards=2, tree_nodes=1)
+    store = RangeStore.build(folder, workers=2)
+    loader = SolutionLoader(memory_budget=0)
+
+    paths = store.column('path')
+    slots = store.column('slot')
+    for row in range(len(store)):
+        expected = loader.load_solution(os.path.join(folder, paths[row]))[slots[row]]
+        if not np.array_equal(store.combos[row], expected.frequencies):
+            raise Exception(f"Row {row} ({paths[row]} {slots[row]}) differs from the loader")
+        if abs(store.hand_frequency('A5s')[row] - expected.hand_frequency('A5s')) > 1e-6:
+            raise Exception(f"Row {row}: class frequency differs")
+
+    # Group-by against a plain Python aggregation
+    mask = store.select(slot='range')
+    vpip = store.vpip()
+    expected = {}
+    for row in np.flatnonzero(mask):
+        key = (store.column('position')[row], float(store.numeric['stack'][row]))
+        expected.setdefault(key, []).append(vpip[row])
+    grouped = store.group_by(['position', 'stack'], vpip, 'mean', mask)
+    for key, values in expected.items():
+        if abs(grouped[key] - np.mean(values)) > 1e-9:
+            raise Exception(f"group_by mean for {key} is {grouped[key]}, expected {np.mean(values)}")
+    maxima = store.group_by('game', vpip, 'max')
+    for game in set(store.column('game')):
+        if abs(maxima[game] - vpip[store.select(game=game)].max()) > 1e-9:
+            raise Exception(f"group_by max for {game} is wrong")
+
+    # Round trip, then an update with one new, one changed and one deleted file
+    directory = os.path.join(root, 'store')
+    store.save(directory)
+    store = RangeStore.load(directory)
+    existing = sorted(set(paths))
+    os.remove(os.path.join(folder, existing[0]))
+    with open(os.path.join(folder, existing[1]), 'w', encoding='utf-8') as f:
+        f.write(random_range_line(random.Random(1), 0.2))
+    stat = os.stat(os.path.join(folder, existing[1]))
+    os.utime(os.path.join(folder, existing[1]), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    new_path = os.path.join(os.path.dirname(existing[1]), 'SB_vs_BB.txt')
+    with open(os.path.join(folder, new_path), 'w', encoding='utf-8') as f:
+        f.write(random_range_line(random.Random(2), 0.2))
+    counts = store.update(folder, workers=1)
+    if counts != (1, 1, 1):
+        raise Exception(f"update() reported {counts}, expected (1, 1, 1)")
+    store.save(directory)
+    reloaded = RangeStore.load(directory, mmap=False)
+    if len(reloaded) != len(store) or not np.array_equal(reloaded.combos, store.combos):
+        raise Exception("Store changed across save/load after update")
+    if set(reloaded.column('path')) != set(loader_paths(folder)):
+        raise Exception("Updated store does not cover the library")
+    print(f"Store matches SolutionLoader on {len(existing)} files; update and save/load round trip ok")
+
+
+def loader_paths(folder):
+    return [os.path.relpath(os.path.join(directory, name), folder).replace(os.sep, '/')
+            for directory, _, names in os.walk(folder) for name in names if name.endswith('.txt')]
+
+
+def synthetic_store(rows, seed=0):
+    """Fill a store with rows drawn from a pool of random ranges and random metadata."""
+    rng = random.Random(seed)
+    parser = SolutionLoader(memory_budget=0).range_parser
+    pool = np.stack([parser.parse_range_line(random_range_line(rng, rng.uniform(0.05, 0.6))).frequencies
+                     for _ in range(64)])
+    np_rng = np.random.default_rng(seed)
+    store = RangeStore()
+    batch = 10000
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        combos = pool[np_rng.integers(0, len(pool), count)]
+        metadata = {
+            'path': [f"game/{start + i}.txt" for i in range(count)],
+            'game': [GAME_NAMES[i % len(GAME_NAMES)] for i in np_rng.integers(0, 4, count)],
+            'stack': np.array(STACK_SIZES, dtype=np.float32)[np_rng.integers(0, len(STACK_SIZES), count)],
+            'position': [POSITIONS[i] for i in np_rng.integers(0, len(POSITIONS), count)],
+            'facing': [('open', 'vs raise', 'vs 3bet')[i] for i in np_rng.integers(0, 3, count)],
+            'slot': ['range'] * count
+        }
+        store.append(combos, metadata)
+    return store
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--rows', type=int, default=100000, help="ranges in the synthetic store")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="runs per query timing")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        check_library(root)
+
+        start = time.perf_counter()
+        store = synthetic_store(args.rows)
+        print(f"Synthetic store: {len(store):,} ranges, {store.nbytes / 1e6:.0f} MB, "
+              f"built in {time.perf_counter() - start:.2f}s")
+
+        queries = [
+            ("A5s above 50%", lambda: store.records(store.hand_frequency('A5s') > 0.5, limit=20)),
+            ("A5s above 50%, BU opens", lambda: np.count_nonzero(
+                store.select(position='BU', facing='open') & (store.hand_frequency('A5s') > 0.5))),
+            ("mean VPIP by position x stack", lambda: store.group_by(['position', 'stack'], store.vpip(), 'mean')),
+            ("max AKo by game, stack >= 20", lambda: store.group_by(
+                'game', store.hand_frequency('AKo'), 'max', store.select(stack=lambda s: s >= 20))),
+            ("mean range of CO opens", lambda: store.combos[store.select(position='CO', facing='open')].mean(axis=0))
+        ]
+        for name, query in queries:
+            ms, _ = timed(query, args.repeat)
+            print(f"{name:<34} {ms:8.2f} ms")
+
+        directory = os.path.join(root, 'big-store')
+        save_ms, _ = timed(lambda: store.save(directory), 1)
+        load_ms, loaded = timed(lambda: RangeStore.load(directory), args.repeat)
+        query_ms, _ = timed(lambda: loaded.group_by(['position', 'stack'], loaded.vpip(), 'mean'), args.repeat)
+        print(f"{'save (full write)':<34} {save_ms:8.2f} ms")
+        print(f"{'load (memory-mapped)':<34} {load_ms:8.2f} ms")
+        print(f"{'VPIP group-by after load':<34} {query_ms:8.2f} ms")
+
+        extra = np.tile(store.combos[0], (1000, 1))
+        append_ms, _ = timed(lambda: (store.append(extra, {'game': ['new'] * 1000}), store.save(directory)), 1)
+        print(f"{'append 1000 rows + save':<34} {append_ms:8.2f} ms")
+        if len(RangeStore.load(directory)) != len(store):
+            raise Exception("Appended rows were not persisted")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+Benchmark suite over synthetic solution libraries.
+Times folder scanning, file parsing, range statistics and grid updates at each scale point,
+writes the results as JSON and fails when a regression threshold is exceeded.
+
+Usage: python -m benchmarks.suite [--scales small,medium] [--out results.json]
+                                  [--thresholds benchmarks/thresholds.json]
+                                  [--baseline previous.json --max-regression 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from data.solution_loader import SolutionLoader
+from data.scan_index import SCAN_INDEX_FILE_NAME
+from benchmarks.synthetic import write_solution_library
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thresholds.json')
+
+# Library shape at each scale point (arguments of write_solution_library)
+SCALES = {
+    'small': {'games': 1, 'stacks': 4, 'scenarios': 10, 'boards': 0, 'density': 0.5, 'tree_nodes': 0},
+    'medium': {'games': 2, 'stacks': 6, 'scenarios': 15, 'boards': 4, 'density': 0.6, 'tree_nodes': 3},
+    'large': {'games': 3, 'stacks': 8, 'scenarios': 20, 'boards': 6, 'density': 0.5, 'tree_nodes': 4}
+}
+
+# Reported metrics and their units; smaller is better except for HIGHER_IS_BETTER
+METRIC_UNITS = {
+    'scan_cold_ms': 'ms',
+    'scan_warm_ms': 'ms',
+    'parse_ms_per_file': 'ms',
+    'parse_mb_per_s': 'MB/s',
+    'stats_ms_per_range': 'ms',
+    'grid_ms_per_update': 'ms'
+}
+HIGHER_IS_BETTER = {'parse_mb_per_s'}
+
+
+def git_commit():
+    """Get the current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def best_of(func, repeat):
+    """Run func repeat times; returns (fastest seconds, last result)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def time_scan(folder, repeat):
+    """Time a cold scan (no persisted index) and a warm rescan of an unchanged folder."""
+    index_path = os.path.join(os.path.abspath(folder), SCAN_INDEX_FILE_NAME)
+
+    def cold_scan():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        SolutionLoader(memory_budget=0, use_packs=False).scan_solutions_folder(folder)
+
+    # A fresh loader each time, so the warm scan reads the persisted index like a restart would
+    def warm_scan():
+        SolutionLoader(memory_budget=0, use_packs=False).scan_solutions_folder(folder)
+
+    cold, _ = best_of(cold_scan, repeat)
+    warm, _ = best_of(warm_scan, repeat)
+    return cold * 1000, warm * 1000
+
+
+def time_parse(folder, repeat):
+    """Parse every file with caching off; returns (solutions, ms per file, MB/s)."""
+    paths = sorted(os.path.join(directory, name)
+                   for directory, _, names in os.walk(folder) for name in names if name.endswith('.txt'))
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    # Interning off too: the generated files repeat a few range lines, which would skip most parses
+    loader = SolutionLoader(memory_budget=0, use_packs=False, intern_ranges=False)
+
+    elapsed, solutions = best_of(lambda: [loader.load_solution(path) for path in paths], repeat)
+    return solutions, elapsed * 1000 / len(paths), total_bytes / 1e6 / elapsed
+
+
+def collect_ranges(solutions):
+    ranges = []
+    for solution in solutions:
+        for name in ('range', 'oop_range', 'ip_range'):
+            if solution.get(name):
+                ranges.append(solution[name])
+    return ranges
+
+
+def time_stats(range_parser, ranges, repeat):
+    """Time calculate_range_statistics per range."""
+    range_parser.class_equities()
+    elapsed, _ = best_of(lambda: [range_parser.calculate_range_statistics(range_data) for range_data in ranges],
+                         repeat)
+    return elapsed * 1000 / len(ranges)
+
+
+def time_grid(ranges, max_updates=500):
+    """Time CanvasRangeGrid.update_range plus a Tk redraw; None when there is no display."""
+    try:
+        import tkinter as tk
+        from gui.range_grid import CanvasRangeGrid
+        root = tk.Tk()
+    except Exception as e:
+        return None, f"no display ({e})"
+
+    try:
+        grid = CanvasRangeGrid(root)
+        grid.grid.pack()
+        root.update()
+        updates = ranges[:max_updates]
+        start = time.perf_counter()
+        for range_data in updates:
+            grid.update_range(range_data)
+            root.update_idletasks()
+        return (time.perf_counter() - start) * 1000 / len(updates), None
+    finally:
+        root.destroy()
+
+
+def run_scale(name, shape, repeat=3):
+    """Generate one library and measure it; returns the result record."""
+    with tempfile.TemporaryDirectory() as root:
+        folder = os.path.join(root, 'library')
+        start = time.perf_counter()
+        library = write_solution_library(folder, **shape)
+        generate_s = time.perf_counter() - start
+
+        metrics = {}
+        metrics['scan_cold_ms'], metrics['scan_warm_ms'] = time_scan(folder, repeat)
+        solutions, metrics['parse_ms_per_file'], metrics['parse_mb_per_s'] = time_parse(folder, repeat)
+        ranges = collect_ranges(solutions)
+        metrics['stats_ms_per_range'] = time_stats(SolutionLoader(memory_budget=0).range_parser, ranges, repeat)
+        grid_ms, skipped = time_grid(ranges)
+        notes = {}
+        if grid_ms is None:
+            notes['grid_ms_per_update'] = f"skipped: {skipped}"
+        else:
+            metrics['grid_ms_per_update'] = grid_ms
+
+    return {
+        'scale': name,
+        'shape': shape,
+        'files': library['files'],
+        'bytes': library['bytes'],
+        'ranges': len(ranges),
+        'generate_s': generate_s,
+        'metrics': metrics,
+        'notes': notes
+    }
+
+
+def check_thresholds(results, thresholds):
+    """Get failures against absolute limits: {scale: {metric: limit}} (minimums for MB/s)."""
+    failures = []
+    for result in results:
+        for metric, limit in thresholds.get(result['scale'], {}).items():
+            value = result['metrics'].get(metric)
+            if value is None:
+                continue
+            if metric in HIGHER_IS_BETTER and value < limit:
+                failures.append(f"{result['scale']} {metric}: {value:.3f} below the minimum {limit}")
+            elif metric not in HIGHER_IS_BETTER and value > limit:
+                failures.append(f"{result['scale']} {metric}: {value:.3f} above the limit {limit}")
+    return failures
+
+
+def check_baseline(results, baseline, max_regression):
+    """Get failures for metrics more than max_regression worse than a previous results file."""
+    previous = {result['scale']: result['metrics'] for result in baseline.get('results', [])}
+    failures = []
+    for result in results:
+        for metric, value in result['metrics'].items():
+            old = previous.get(result['scale'], {}).get(metric)
+            if not old:
+                continue
+            change = old / value - 1 if metric in HIGHER_IS_BETTER else value / old - 1
+            if change > max_regression:
+                failures.append(f"{result['scale']} {metric}: {value:.3f} vs {old:.3f} "
+                                f"({change:+.0%}, allowed {max_regression:.0%})")
+    return failures
+
+
+def print_table(results):
+    metrics = list(METRIC_UNITS)
+    print(f"{'scale':<8} {'files':>6} {'MB':>7}  " + '  '.join(f"{metric:>18}" for metric in metrics))
+    for result in results:
+        values = [result['metrics'].get(metric) for metric in metrics]
+        cells = [f"{value:>18.3f}" if value is not None else f"{'-':>18}" for value in values]
+        print(f"{result['scale']:<8} {result['files']:>6} {result['bytes'] / 1e6:>7.1f}  " + '  '.join(cells))
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--scales', default='small,medium',
+                            help=f"comma-separated scale points ({', '.join(SCALES)} or ones from --config)")
+    arg_parser.add_argument('--config', default=None,
+                            help="JSON file of extra scale points: {name: write_solution_library arguments}")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="runs per timing; the fastest is kept")
+    arg_parser.add_argument('--out', default=None, help="write the results as JSON")
+    arg_parser.add_argument('--thresholds', default=DEFAULT_THRESHOLDS,
+                            help="JSON limits per scale and metric ('' to skip)")
+    arg_parser.add_argument('--baseline', default=None, help="previous --out file to compare against")
+    arg_parser.add_argument('--max-regression', type=float, default=0.25,
+                            help="allowed slowdown against --baseline (0.25 = 25%%)")
+    args = arg_parser.parse_args(argv)
+
+    scales = dict(SCALES)
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            scales.update(json.load(f))
+
+    results = []
+    for name in args.scales.split(','):
+        name = name.strip()
+        if name not in scales:
+            raise SystemExit(f"Unknown scale {name!r}; expected one of {', '.join(scales)}")
+        print(f"Running {name}...", file=sys.stderr)
+        results.append(run_scale(name, scales[name], args.repeat))
+    print_table(results)
+
+    report = {
+        'version': RESULTS_VERSION,
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': args.repeat,
+        'units': METRIC_UNITS,
+        'results': results
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    if args.thresholds:
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            failures += check_thresholds(results, json.load(f))
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failures += check_baseline(results, json.load(f), args.max_regression)
+
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
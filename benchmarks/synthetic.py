@@ -0,0 +1,137 @@
+"""
+Synthetic solution data for benchmarks.
+Writes solver-style range lines and small solution libraries.
+"""
+
+import os
+import random
+from data.hand_range import NUM_COMBOS, combo_string
+
+# Solver frequencies mostly sit on this grid
+FREQUENCY_GRID = ['0', '0.25', '0.50', '0.75', '1']
+
+
+def random_range_line(rng, density=1.0):
+    """Build one range line; density is the share of the 1326 combos written out."""
+    tokens = []
+    for index in range(NUM_COMBOS):
+        if density < 1.0 and rng.random() >= density:
+            continue
+        tokens.append(f"{combo_string(index)}_{rng.choice(FREQUENCY_GRID)}")
+    return ' '.join(tokens)
+
+
+def write_range_corpus(root, num_files, density=1.0, seed=0):
+    """Write num_files bare range files as <stack>/<scenario>.txt and return their paths."""
+    rng = random.Random(seed)
+    # A handful of distinct lines keeps generation fast while parsing still does full work
+    lines = [random_range_line(rng, density) for _ in range(16)]
+    
+    paths = []
+    per_stack = 500
+    for i in range(num_files):
+        stack_dir = os.path.join(root, str(10 + i // per_stack))
+        if i % per_stack == 0:
+            os.makedirs(stack_dir, exist_ok=True)
+        path = os.path.join(stack_dir, f"scenario_{i % per_stack}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(lines[i % len(lines)])
+        paths.append(path)
+    return paths
+
+GAME_NAMES = ['6-max Cash', '3-max Tournament', 'HU Cash', '9-max MTT']
+STACK_SIZES = ['9', '11', '14', '20', '25', '30', '50', '100', '150', '200']
+POSITIONS = ['UTG', 'MP', 'CO', 'BU', 'SB', 'BB']
+# Tree actions after a check or nothing, and after a bet
+PASSIVE_ACTIONS = ['check', 'bet 33', 'bet 75']
+FACING_ACTIONS = ['fold', 'call', 'raise 100']
+_CARDS = [rank + suit for rank in '23456789TJQKA' for suit in 'cdhs']
+
+
+def scenario_names(count):
+    """Get count preflop scenario names: opens, then calls and 3-bets against each open."""
+    names = [f"{position}_open" for position in POSITIONS[:-1]]
+    for i, opener in enumerate(POSITIONS[:-1]):
+        for responder in POSITIONS[i + 1:]:
+            names.append(f"{responder}_vs_{opener}")
+            names.append(f"{opener}_vs_{responder}_3bet")
+    # Past the distinct spots, repeat them with an open sizing
+    base = list(names)
+    size = 2
+    while len(names) < count:
+        names.extend(f"{name}_{size}x" for name in base)
+        size += 1
+    return names[:count]
+
+
+def tree_node_headers(num_nodes):
+    """Get num_nodes node headers breadth first, each with its action labels."""
+    nodes = [('root', PASSIVE_ACTIONS)]
+    queue = [('root', PASSIVE_ACTIONS)]
+    while queue and len(nodes) < num_nodes:
+        header, actions = queue.pop(0)
+        for index, action in enumerate(actions, 1):
+            child_actions = FACING_ACTIONS if action.startswith(('bet', 'raise')) else PASSIVE_ACTIONS
+            if action in ('fold', 'call'):
+                continue
+            child = (f"{header}, {index} {action}", child_actions)
+            nodes.append(child)
+            queue.append(child)
+            if len(nodes) >= num_nodes:
+                break
+    return nodes[:num_nodes]
+
+
+def solution_text(lines, rng, game, stack, scenario, tree_nodes):
+    """Build a postflop solution file: game line, both ranges and tree nodes."""
+    parts = [
+        f"game = '{game}', preflop situation = '{scenario}', stack = '{stack}', pot = '5', bets = '33 75 100'",
+        "OOP preflop range",
+        rng.choice(lines),
+        "IP preflop range",
+        rng.choice(lines)
+    ]
+    for header, actions in tree_node_headers(tree_nodes):
+        parts.append(header)
+        for action in actions:
+            parts.append(f"{action}: {rng.choice(lines)}")
+    return '\n'.join(parts) + '\n'
+
+
+def write_solution_library(root, games=1, stacks=4, scenarios=10, boards=0, density=0.5, tree_nodes=0, seed=0):
+    """
+    Write a solver-style library as <game>/<stack>/<scenario>.txt.
+
+    Every scenario gets a bare preflop range file; with boards > 0 it also
+    gets a <scenario>/<board>.txt folder of postflop solutions holding both
+    ranges and tree_nodes decision-tree nodes. density is the share of the
+    1326 combos written per range line. Returns {'files': n, 'bytes': b}.
+    """
+    rng = random.Random(seed)
+    lines = [random_range_line(rng, density) for _ in range(16)]
+    game_names = GAME_NAMES + [f"Game {i}" for i in range(len(GAME_NAMES), games)]
+    stack_sizes = STACK_SIZES + [str(int(STACK_SIZES[-1]) + 50 * i) for i in range(1, stacks)]
+    
+    files = 0
+    total_bytes = 0
+    for game in game_names[:games]:
+        for stack in stack_sizes[:stacks]:
+            stack_dir = os.path.join(root, game, stack)
+            os.makedirs(stack_dir, exist_ok=True)
+            for scenario in scenario_names(scenarios):
+                texts = {os.path.join(stack_dir, f"{scenario}.txt"): rng.choice(lines)}
+                if boards:
+                    board_dir = os.path.join(stack_dir, scenario)
+                    os.makedirs(board_dir, exist_ok=True)
+                    flops = set()
+                    while len(flops) < boards:
+                        flops.add(''.join(rng.sample(_CARDS, 3)))
+                    for flop in sorted(flops):
+                        texts[os.path.join(board_dir, f"{flop}.txt")] = solution_text(
+                            lines, rng, game, stack, scenario, tree_nodes)
+                for path, text in texts.items():
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                    files += 1
+                    total_bytes += len(text)
+    return {'files': files, 'bytes': total_bytes}
\ No newline at end of file
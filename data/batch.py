@@ -0,0 +1,232 @@
+"""
+Headless batch statistics over a solution library.
+Runs SolutionLoader and RangeParser.calculate_range_statistics for every file across a
+process pool and streams one row per range to CSV, JSON Lines or Parquet.
+
+Usage: python main.py batch --folder <solutions folder> --out stats.csv|stats.jsonl|stats.parquet
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .scan_index import ScanIndex, path_to_key
+from .solution_loader import SolutionLoader
+from .range_parser import RangeParser
+from .preload import RANGE_SLOTS
+
+KEY_COLUMNS = ['path', 'game', 'stack', 'scenario', 'board', 'range']
+COUNT_COLUMNS = ('total_combos', 'played_combos')
+OUTPUT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 8192
+
+_worker_state = {}
+
+
+def output_columns(range_parser=None):
+    """Get the output column names: the file key, then every statistic."""
+    range_parser = range_parser or RangeParser()
+    return KEY_COLUMNS + list(range_parser.get_empty_stats())
+
+
+class CsvWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row))
+            self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Writes row groups with pyarrow, which is only needed for this format."""
+
+    def __init__(self, path, columns):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("Parquet output needs pyarrow (pip install pyarrow); use .csv or .jsonl instead")
+        self.pyarrow = pyarrow
+        # Fixed types, so a batch where a column is all None (e.g. equity) keeps the schema
+        fields = []
+        for column in columns:
+            if column in KEY_COLUMNS:
+                fields.append((column, pyarrow.string()))
+            elif column in COUNT_COLUMNS:
+                fields.append((column, pyarrow.int64()))
+            else:
+                fields.append((column, pyarrow.float64()))
+        self.schema = pyarrow.schema(fields)
+        self.buffer = []
+        self.writer = None
+        self.path = path
+
+    def write_rows(self, rows):
+        self.buffer.extend(rows)
+        if len(self.buffer) >= PARQUET_BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        table = self.pyarrow.Table.from_pylist(self.buffer, schema=self.schema)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'parquet': ParquetWriter}
+
+
+def output_format(out_path, fmt=None):
+    """Get the output format from an explicit name or the file extension."""
+    fmt = fmt or os.path.splitext(out_path)[1].lstrip('.').lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise Exception(f"Unknown output format {fmt!r}; expected one of {', '.join(OUTPUT_FORMATS)}")
+    return fmt
+
+
+def _init_worker(strength_masks, dead_cards):
+    """Process pool initializer: one loader and parser per worker."""
+    loader = SolutionLoader(memory_budget=0)
+    # Reuse the parent's strength categories instead of estimating them again in every worker
+    loader.range_parser.set_strength_masks(strength_masks)
+    _worker_state['loader'] = loader
+    _worker_state['dead_cards'] = dead_cards
+
+
+def _stats_chunk(folder, chunk):
+    """Compute statistics for a chunk of relative paths; returns (rows, errors)."""
+    loader = _worker_state['loader']
+    dead_cards = _worker_state['dead_cards']
+    rows = []
+    errors = []
+    for relative_path in chunk:
+        try:
+            solution = loader.load_solution(os.path.join(folder, relative_path))
+        except Exception as e:
+            errors.append((relative_path, str(e)))
+            continue
+
+        game, stack, scenario, board = path_to_key(relative_path) or ('', '', '', '')
+        for name in RANGE_SLOTS:
+            range_data = solution.get(name)
+            if not range_data:
+                continue
+            row = {'path': relative_path, 'game': game, 'stack': stack,
+                   'scenario': scenario, 'board': board, 'range': name}
+            row.update(loader.range_parser.calculate_range_statistics(range_data, dead_cards))
+            rows.append(row)
+    return rows, errors
+
+
+def run_batch(folder, out_path, fmt=None, workers=None, dead_cards=None, chunk_size=64, progress=None):
+    """
+    Write statistics for every range in a solution library.
+
+    Files are listed through the persistent scan index and split into chunks
+    for the process pool; rows are written in library order as chunks finish,
+    so memory stays flat however large the library is. progress, if given, is
+    called as progress(done_files, total_files, elapsed). Returns a summary dict.
+    """
+    start = time.perf_counter()
+    folder = os.path.abspath(folder)
+    fmt = output_format(out_path, fmt)
+    workers = workers or os.cpu_count() or 1
+
+    index = ScanIndex(folder)
+    index.refresh()
+    index.save()
+    paths = list(index.solution_files())
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    range_parser = RangeParser()
+    strength_masks = range_parser.strength_masks()
+    writer = WRITERS[fmt](out_path, output_columns(range_parser))
+    written = 0
+    done = 0
+    errors = []
+
+    def collect(chunk, result):
+        nonlocal written, done
+        rows, chunk_errors = result
+        writer.write_rows(rows)
+        written += len(rows)
+        errors.extend(chunk_errors)
+        done += len(chunk)
+        if progress is not None:
+            progress(done, len(paths), time.perf_counter() - start)
+
+    try:
+        if workers == 1 or len(chunks) <= 1:
+            _init_worker(strength_masks, dead_cards)
+            try:
+                for chunk in chunks:
+                    collect(chunk, _stats_chunk(folder, chunk))
+            finally:
+                _worker_state.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(strength_masks, dead_cards)) as pool:
+                # map yields in submission order, so the output follows the library order
+                results = pool.map(_stats_chunk, [folder] * len(chunks), chunks)
+                for chunk, result in zip(chunks, results):
+                    collect(chunk, result)
+    finally:
+        writer.close()
+
+    return {
+        'files': len(paths),
+        'rows': written,
+        'errors': errors,
+        'seconds': time.perf_counter() - start,
+        'format': fmt
+    }
+
+
+def main(args):
+    """Entry point for 'main.py batch' with already parsed arguments."""
+    def report(done, total, elapsed):
+        sys.stderr.write(f"\r{done}/{total} files  {done / max(elapsed, 1e-9):,.0f} files/s")
+        sys.stderr.flush()
+
+    try:
+        summary = run_batch(args.folder, args.out, fmt=args.format, workers=args.workers,
+                            dead_cards=args.dead_cards, progress=report)
+    except Exception as e:
+        print(f"Batch failed: {e}", file=sys.stderr)
+        return 1
+    sys.stderr.write("\n")
+    for path, error in summary['errors']:
+        print(f"Error loading {path}: {error}", file=sys.stderr)
+    print(f"Wrote {summary['rows']} rows for {summary['files']} files to {args.out} "
+          f"({summary['format']}) in {summary['seconds']:.2f}s", file=sys.stderr)
+    return 1 if summary['errors'] else 0
\ No newline at end of file
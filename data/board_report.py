@@ -0,0 +1,313 @@
+"""
+Weighted aggregation of a scenario's strategy across its board files.
+Reads one tree node (the root by default) from every <stack>/<scenario>/<board>.txt across a
+process pool and combines the per-combo action frequencies into a hand-class grid, weighted by
+board and by the node's range, with a one-row summary per board.
+
+Usage: python main.py boards --folder <solutions folder> --stack 20 --scenario BU_open
+                             [--filter paired,high=AK] [--weighting isomorphic] [--out-grid grid.csv]
+"""
+
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .hand_range import NUM_COMBOS, NUM_CLASSES, COMBO_CLASS, HAND_CLASSES, GRID_RANKS, RANKS
+from .card_removal import parse_dead_cards, dead_combo_mask
+from .decision_tree import parse_action_path, normalize_action, DecisionTree
+from .solution_loader import SolutionLoader
+
+TEXTURES = ('monotone', 'two-tone', 'rainbow')
+WEIGHTINGS = ('uniform', 'isomorphic')
+BOARD_COLUMNS = ['board', 'weight', 'paired', 'texture', 'high', 'combos']
+
+# Every way of relabelling the four suits
+_SUIT_PERMUTATIONS = np.array(list(itertools.permutations(range(4))))
+
+_worker_state = {}
+
+
+def board_features(board):
+    """Get the cards, pairing, suit texture and high card of a board name like 'TsQs3s'."""
+    cards = parse_dead_cards(board)
+    ranks = cards // 4
+    suits = len(set((cards % 4).tolist()))
+    return {
+        'cards': cards,
+        'paired': len(set(ranks.tolist())) < len(cards),
+        'texture': TEXTURES[min(suits, 3) - 1],
+        'high': RANKS[int(ranks.max())]
+    }
+
+
+def isomorphic_weight(cards):
+    """Count the boards that play the same as this one up to suit relabelling (e.g. 24 for a rainbow flop)."""
+    relabelled = (cards // 4 * 4)[None, :] + _SUIT_PERMUTATIONS[:, cards % 4]
+    return len({frozenset(row.tolist()) for row in relabelled})
+
+
+def parse_board_filter(text):
+    """
+    Build a predicate on board_features from terms like 'paired,monotone,high=AKQ'.
+    Every term must hold: paired, unpaired, monotone, two-tone, rainbow, high=<ranks>.
+    """
+    tests = []
+    for term in (text or '').split(','):
+        term = term.strip().lower()
+        if not term:
+            continue
+        if term == 'paired':
+            tests.append(lambda features: features['paired'])
+        elif term == 'unpaired':
+            tests.append(lambda features: not features['paired'])
+        elif term in TEXTURES:
+            tests.append(lambda features, texture=term: features['texture'] == texture)
+        elif term.startswith('high='):
+            ranks = term[5:].upper()
+            if not ranks or any(rank not in RANKS for rank in ranks):
+                raise ValueError(f"Invalid high card filter: {term!r}")
+            tests.append(lambda features, ranks=ranks: features['high'] in ranks)
+        else:
+            raise ValueError(f"Unknown board filter {term!r}; expected paired, unpaired, "
+                             f"{', '.join(TEXTURES)} or high=<ranks>")
+    return lambda features: all(test(features) for test in tests)
+
+
+class BoardReport:
+    """Running totals of an aggregation; chunks from the pool are merged in with add()."""
+
+    def __init__(self, node_path):
+        self.node_path = node_path
+        # Action labels in first-seen order
+        self.actions = []
+        # action -> (169,) sum over boards of weight * reach * frequency
+        self.numerators = {}
+        # (169,) sum over boards of weight * reach
+        self.denominator = np.zeros(NUM_CLASSES, dtype=np.float64)
+        self.boards = []
+        self.errors = []
+        self.skipped = 0
+
+    def add(self, numerators, denominator, rows, errors):
+        for action, values in numerators.items():
+            if action not in self.numerators:
+                self.actions.append(action)
+                self.numerators[action] = np.zeros(NUM_CLASSES, dtype=np.float64)
+            self.numerators[action] += values
+        self.denominator += denominator
+        self.boards.extend(rows)
+        self.errors.extend(errors)
+
+    def class_frequencies(self):
+        """Get {action: (169,) weighted frequency per hand class}; classes never reached are 0."""
+        reached = self.denominator > 0
+        result = {}
+        for action in self.actions:
+            frequencies = np.zeros(NUM_CLASSES, dtype=np.float64)
+            frequencies[reached] = self.numerators[action][reached] / self.denominator[reached]
+            result[action] = frequencies
+        return result
+
+    def overall(self):
+        """Get {action: weighted frequency over every class}."""
+        total = self.denominator.sum()
+        return {action: float(self.numerators[action].sum() / total) if total else 0.0 for action in self.actions}
+
+    def grid(self, action):
+        """Get one action's frequencies as the 13x13 hand grid (pairs on the diagonal, suited above)."""
+        return self.class_frequencies()[action].reshape(13, 13)
+
+    def format_grid(self, action):
+        rows = ['     ' + ' '.join(f"{rank:>4}" for rank in GRID_RANKS)]
+        for rank, values in zip(GRID_RANKS, self.grid(action)):
+            rows.append(f"{rank:>4} " + ' '.join(f"{value * 100:4.0f}" for value in values))
+        return '\n'.join(rows)
+
+    def write_grid_csv(self, path):
+        """One row per hand class: its total weight and weighted frequency per action."""
+        frequencies = self.class_frequencies()
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['hand', 'weight'] + self.actions)
+            for index, hand in enumerate(HAND_CLASSES):
+                writer.writerow([hand, f"{self.denominator[index]:.6g}"]
+                                + [f"{frequencies[action][index]:.6f}" for action in self.actions])
+
+    def write_boards_csv(self, path):
+        """One row per board: weight, texture, reached combos and overall frequency per action."""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=BOARD_COLUMNS + self.actions, restval=0.0)
+            writer.writeheader()
+            writer.writerows(self.boards)
+
+    def summary(self):
+        return {
+            'boards': len(self.boards),
+            'skipped': self.skipped,
+            'errors': len(self.errors),
+            'weight': sum(row['weight'] for row in self.boards),
+            'overall': self.overall()
+        }
+
+
+def _init_worker(node_path):
+    """Process pool initializer: one uncached loader per worker, so memory stays flat."""
+    _worker_state['loader'] = SolutionLoader(memory_budget=0, use_packs=False)
+    _worker_state['node_path'] = node_path
+
+
+def _aggregate_chunk(folder, chunk):
+    """Aggregate a chunk of (relative_path, board, weight); returns partial sums plus board rows."""
+    loader = _worker_state['loader']
+    node_path = _worker_state['node_path']
+    numerators = {}
+    denominator = np.zeros(NUM_CLASSES, dtype=np.float64)
+    rows = []
+    errors = []
+    for relative_path, board, weight in chunk:
+        try:
+            features = board_features(board)
+            # Only the one node is read; the tree index is dropped after each file
+            record = DecisionTree(loader.open_solution(os.path.join(folder, relative_path))).node(node_path)
+        except Exception as e:
+            errors.append((relative_path, str(e)))
+            continue
+
+        reach = record.range.frequencies if record.range else np.ones(NUM_COMBOS, dtype=np.float32)
+        reach = np.where(dead_combo_mask(features['cards']), 0, reach).astype(np.float64)
+        weighted = reach * weight
+        denominator += np.bincount(COMBO_CLASS, weights=weighted, minlength=NUM_CLASSES)
+        combos = float(reach.sum())
+        row = {'board': board, 'weight': weight, 'paired': features['paired'],
+               'texture': features['texture'], 'high': features['high'], 'combos': round(combos, 3)}
+        for label, strategy in zip(record.actions, record.strategy):
+            action = normalize_action(label)
+            values = np.bincount(COMBO_CLASS, weights=weighted * strategy, minlength=NUM_CLASSES)
+            numerators[action] = numerators.get(action, 0) + values
+            row[action] = round(float(strategy @ reach) / combos, 6) if combos else 0.0
+        rows.append(row)
+    return numerators, denominator, rows, errors
+
+
+def scenario_board_files(folder, stack, scenario, game=''):
+    """Get (relative_path, board) for every board file of a scenario, in sorted order."""
+    # Only the scenario's own folder is listed; a report never touches the rest of the library
+    scenario_dir = '/'.join(part for part in (game, str(stack), scenario) if part)
+    try:
+        with os.scandir(os.path.join(folder, scenario_dir)) as entries:
+            names = sorted(entry.name for entry in entries if entry.name.endswith('.txt') and entry.is_file())
+    except OSError:
+        return []
+    return [(f"{scenario_dir}/{name}", name[:-4]) for name in names]
+
+
+def board_weight(board, features, weighting):
+    """Get a board's weight: 1, its isomorphic count, or its entry in a {board: weight} mapping (0 if absent)."""
+    if isinstance(weighting, dict):
+        return float(weighting.get(board, 0.0))
+    if weighting == 'isomorphic':
+        return float(isomorphic_weight(features['cards']))
+    return 1.0
+
+
+def aggregate_boards(folder, stack, scenario, game='', node_path=(), board_filter=None, weighting='uniform',
+                     workers=None, chunk_size=16, progress=None):
+    """
+    Aggregate one tree node of a scenario across all its board files.
+
+    board_filter is a predicate on board_features (see parse_board_filter);
+    weighting is 'uniform', 'isomorphic' or a {board: weight} mapping. Work is
+    split into chunks for the process pool and only per-class sums come back,
+    so memory does not grow with the size of the board files. progress, if
+    given, is called as progress(done_boards, total_boards, elapsed). Returns a BoardReport.
+    """
+    start = time.perf_counter()
+    folder = os.path.abspath(folder)
+    workers = workers or os.cpu_count() or 1
+    node_path = parse_action_path(node_path)
+    report = BoardReport(node_path)
+
+    selected = []
+    for relative_path, board in scenario_board_files(folder, stack, scenario, game):
+        try:
+            features = board_features(board)
+        except ValueError as e:
+            report.errors.append((relative_path, str(e)))
+            continue
+        weight = board_weight(board, features, weighting)
+        if weight <= 0 or (board_filter is not None and not board_filter(features)):
+            report.skipped += 1
+            continue
+        selected.append((relative_path, board, weight))
+    chunks = [selected[i:i + chunk_size] for i in range(0, len(selected), chunk_size)]
+
+    done = 0
+
+    def collect(chunk, result):
+        nonlocal done
+        report.add(*result)
+        done += len(chunk)
+        if progress is not None:
+            progress(done, len(selected), time.perf_counter() - start)
+
+    if workers == 1 or len(chunks) <= 1:
+        _init_worker(node_path)
+        try:
+            for chunk in chunks:
+                collect(chunk, _aggregate_chunk(folder, chunk))
+        finally:
+            _worker_state.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(node_path,)) as pool:
+            # map yields in submission order, so the sums come out the same for any worker count
+            results = pool.map(_aggregate_chunk, [folder] * len(chunks), chunks)
+            for chunk, result in zip(chunks, results):
+                collect(chunk, result)
+    return report
+
+
+def main(args):
+    """Entry point for 'main.py boards' with already parsed arguments."""
+    def report_progress(done, total, elapsed):
+        sys.stderr.write(f"\r{done}/{total} boards  {done / max(elapsed, 1e-9):,.0f} boards/s")
+        sys.stderr.flush()
+
+    try:
+        weighting = args.weighting
+        if weighting not in WEIGHTINGS:
+            with open(weighting, 'r', encoding='utf-8') as f:
+                weighting = json.load(f)
+        start = time.perf_counter()
+        report = aggregate_boards(args.folder, args.stack, args.scenario, game=args.game, node_path=args.node,
+                                  board_filter=parse_board_filter(args.filter), weighting=weighting,
+                                  workers=args.workers, progress=report_progress)
+    except Exception as e:
+        print(f"Board report failed: {e}", file=sys.stderr)
+        return 1
+    sys.stderr.write("\n")
+    for path, error in report.errors:
+        print(f"Error reading {path}: {error}", file=sys.stderr)
+    if not report.boards:
+        print("No boards matched", file=sys.stderr)
+        return 1
+
+    summary = report.summary()
+    print(f"{summary['boards']} boards (weight {summary['weight']:g}, {summary['skipped']} filtered out) "
+          f"in {time.perf_counter() - start:.2f}s")
+    for action, frequency in summary['overall'].items():
+        print(f"  {action:<16} {frequency * 100:6.2f}%")
+    action = args.grid_action or report.actions[0]
+    if action not in report.actions:
+        print(f"No action {action!r}; the node has {', '.join(report.actions)}", file=sys.stderr)
+        return 1
+    print(f"\n{action} by hand class (%):")
+    print(report.format_grid(action))
+    if args.out_grid:
+        report.write_grid_csv(args.out_grid)
+    if args.out_boards:
+        report.write_boards_csv(args.out_boards)
+    return 1 if report.errors else 0
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Card removal over the 1326-combo space.
+Dead-card and board filtering plus blocker-adjusted combo counts, batched over many ranges at once.
+"""
+
+import re
+import numpy as np
+from .hand_range import (
+    NUM_CARDS, NUM_COMBOS, COMBO_CARDS, COMBO_CARD_MASK, as_range, card_index
+)
+
+# Float copy of the card incidence for matrix products: (1326, 52)
+_COMBO_CARDS_FLOAT = COMBO_CARD_MASK.astype(np.float32)
+_CARD_SEPARATORS = re.compile(r'[\s,]+')
+
+
+def parse_dead_cards(cards):
+    """
+    Normalize dead cards to a sorted array of unique card indexes.
+
+    Accepts None, a string like 'AcKd7h' or 'Ac Kd, 7h', or an iterable of
+    card strings / indexes.
+    """
+    if cards is None:
+        return np.zeros(0, dtype=np.int64)
+    if isinstance(cards, str):
+        text = _CARD_SEPARATORS.sub('', cards)
+        if len(text) % 2:
+            raise ValueError(f"Invalid cards: {cards!r}")
+        cards = [text[i:i + 2] for i in range(0, len(text), 2)]
+
+    indexes = []
+    for card in cards:
+        index = card_index(card) if isinstance(card, str) else int(card)
+        if not 0 <= index < NUM_CARDS:
+            raise ValueError(f"Invalid card: {card!r}")
+        indexes.append(index)
+    return np.unique(np.array(indexes, dtype=np.int64))
+
+
+def dead_combo_mask(dead_cards):
+    """Get a 1326 boolean mask of the combos that hold any dead card."""
+    dead = parse_dead_cards(dead_cards)
+    if not len(dead):
+        return np.zeros(NUM_COMBOS, dtype=bool)
+    return COMBO_CARD_MASK[:, dead].any(axis=1)
+
+
+def remove_dead_cards(range_data, dead_cards):
+    """Get a copy of a range with every combo holding a dead card set to zero."""
+    range_data = as_range(range_data)
+    mask = dead_combo_mask(dead_cards)
+    if not mask.any():
+        return range_data
+    return range_data.masked(~mask)
+
+
+def stack_ranges(ranges, dead_cards=None):
+    """
+    Stack ranges into an (n, 1326) float32 matrix, zeroing dead combos.
+
+    ranges may be an (n, 1326) array or a sequence of Ranges / dicts / 1326
+    vectors / None, where None stands for a uniformly random hand.
+    """
+    if isinstance(ranges, np.ndarray):
+        matrix = np.array(np.atleast_2d(ranges), dtype=np.float32)
+    else:
+        matrix = np.empty((len(ranges), NUM_COMBOS), dtype=np.float32)
+        for row, range_data in enumerate(ranges):
+            if range_data is None:
+                matrix[row] = 1
+            elif isinstance(range_data, np.ndarray):
+                matrix[row] = range_data
+            else:
+                matrix[row] = as_range(range_data).frequencies
+    mask = dead_combo_mask(dead_cards)
+    if mask.any():
+        matrix[:, mask] = 0
+    return matrix
+
+
+def live_weights(villains):
+    """
+    Get, for every hero combo, the villain weight that survives the hero's cards.
+
+    villains is a 1326 vector or an (n, 1326) matrix; the result has the same
+    shape. Uses per-card sums, so it costs O(n * 1326) rather than a product
+    with the 1326x1326 conflict mask.
+    """
+    villains = np.asarray(villains, dtype=np.float32)
+    card_weight = villains @ _COMBO_CARDS_FLOAT
+    # Combos holding either hero card, counting the hero combo itself once
+    blocked = card_weight[..., COMBO_CARDS[:, 0]] + card_weight[..., COMBO_CARDS[:, 1]] - villains
+    return villains.sum(axis=-1, dtype=np.float64)[..., None] - blocked
+
+
+def pair_weights(heroes, villains):
+    """
+    Get the (n, m) matrix of hero-vs-villain matchup weight with card removal.
+
+    Entry [i, j] is the total weight of non-conflicting combo pairs between
+    hero range i and villain range j (sum of H_a * V_b over pairs sharing no card).
+    """
+    heroes = np.atleast_2d(np.asarray(heroes, dtype=np.float32))
+    villains = np.atleast_2d(np.asarray(villains, dtype=np.float32))
+    totals = np.outer(heroes.sum(axis=1, dtype=np.float64), villains.sum(axis=1, dtype=np.float64))
+    # Pairs sharing a card, by inclusion-exclusion over the two hero cards
+    shared = (heroes @ _COMBO_CARDS_FLOAT) @ (villains @ _COMBO_CARDS_FLOAT).T - heroes @ villains.T
+    return totals - shared
+
+
+def combo_counts(heroes, villains):
+    """
+    Get the expected number of villain combos once each hero range's cards are removed.
+
+    Returns an (n, m) matrix: the villain's combo count averaged over the
+    combos the hero holds, so a hero range full of aces blocks aces.
+    """
+    heroes = np.atleast_2d(np.asarray(heroes, dtype=np.float32))
+    hero_totals = heroes.sum(axis=1, dtype=np.float64)[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        counts = pair_weights(heroes, villains) / hero_totals
+    return np.where(hero_totals > 0, counts, 0)
\ No newline at end of file
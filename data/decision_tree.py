@@ -0,0 +1,168 @@
+"""
+Random-access index of a solution's decision tree keyed by action path.
+
+A node header lists the actions from the root, e.g. "root, 2 bet 75, 1 call";
+the leading numbers are sibling indexes and are ignored when matching. Node
+bodies hold one "action: AcKd_0.5 ..." line per action, plus optionally a bare
+combo line with the range reaching the node.
+"""
+
+import re
+from collections import OrderedDict
+import numpy as np
+from .hand_range import NUM_COMBOS, Range
+from .palette import PaletteArray
+from .solution_stream import parse_node_body
+
+_ACTION_INDEX = re.compile(r'^\d+\s+')
+_PATH_SEPARATORS = re.compile(r'\s*(?:,|->|→)\s*')
+
+
+def normalize_action(label):
+    """Normalize an action label: drop a sibling index and extra spaces ('2 Bet  75' -> 'bet 75')."""
+    label = _ACTION_INDEX.sub('', label.strip().lower())
+    return ' '.join(label.split())
+
+
+def parse_action_path(path):
+    """Turn 'root → 2 bet 75 → call', 'bet 75, call' or a sequence of labels into a tuple of actions."""
+    if isinstance(path, str):
+        path = _PATH_SEPARATORS.split(path)
+    actions = (normalize_action(action) for action in path)
+    return tuple(action for action in actions if action and action != 'root')
+
+
+class NodeRecord:
+    """One materialized tree node: per-action strategy vectors over the 1326 combos."""
+
+    __slots__ = ('path', 'actions', 'strategy', 'range', 'info')
+
+    def __init__(self, path, actions, strategy, range_data=None, info=None):
+        self.path = path
+        # Action labels in file order, one strategy row each
+        self.actions = actions
+        # float32 (n_actions, 1326): frequency each combo takes each action
+        self.strategy = strategy
+        self.range = range_data
+        self.info = info or []
+
+    @classmethod
+    def from_body(cls, path, body):
+        """Build a record from a parsed node body (see parse_node_body)."""
+        actions = list(body['actions'])
+        strategy = np.zeros((len(actions), NUM_COMBOS), dtype=np.float32)
+        for row, label in enumerate(actions):
+            strategy[row] = body['actions'][label].frequencies
+        return cls(path, actions, strategy, body['range'], body['info'])
+
+    def action_range(self, action):
+        """Get the per-combo frequencies of one action as a Range."""
+        wanted = normalize_action(action)
+        for row, label in enumerate(self.actions):
+            if normalize_action(label) == wanted:
+                return Range(self.strategy[row])
+        raise KeyError(f"Node has no action {action!r}")
+
+    def action_frequencies(self):
+        """Get how often each action is taken overall, weighted by the node range when present."""
+        if not self.actions:
+            return np.zeros(0, dtype=np.float32)
+        weights = self.range.frequencies if self.range else np.ones(NUM_COMBOS, dtype=np.float32)
+        total = float(weights.sum())
+        if total <= 0:
+            return np.zeros(len(self.actions), dtype=np.float32)
+        return (self.strategy @ weights / total).astype(np.float32)
+
+    def __repr__(self):
+        return f"NodeRecord(path={self.path!r}, actions={self.actions!r})"
+
+
+class CompactNodeRecord:
+    """A NodeRecord with its strategy rows and range encoded together under one palette."""
+
+    __slots__ = ('path', 'actions', 'vectors', 'has_range', 'info')
+
+    def __init__(self, record):
+        self.path = record.path
+        self.actions = record.actions
+        self.has_range = record.range is not None
+        rows = [record.strategy, record.range.frequencies[None]] if self.has_range else [record.strategy]
+        self.vectors = PaletteArray.encode(np.concatenate(rows))
+        self.info = record.info
+
+    def decode(self):
+        vectors = self.vectors.decode()
+        if self.has_range:
+            return NodeRecord(self.path, self.actions, vectors[:-1], Range(vectors[-1]), self.info)
+        return NodeRecord(self.path, self.actions, vectors, None, self.info)
+
+
+class DecisionTree:
+    """Action-path index over a LazySolution's tree nodes; nodes are parsed on demand."""
+
+    def __init__(self, lazy_solution, node_cache_size=256, compact=False):
+        self.solution = lazy_solution
+        self.node_cache_size = node_cache_size
+        # Keep cached nodes palette-coded and decode them on each lookup
+        self.compact = compact
+        self._node_cache = OrderedDict()
+
+        # Trie of normalized actions; each trie node is [node position or -1, {action: child}]
+        self._root = [-1, {}]
+        for position, header in enumerate(lazy_solution.node_names):
+            trie_node = self._root
+            for action in parse_action_path(header):
+                trie_node = trie_node[1].setdefault(action, [-1, {}])
+            if trie_node[0] < 0:
+                trie_node[0] = position
+
+    def _find(self, path):
+        trie_node = self._root
+        for action in parse_action_path(path):
+            trie_node = trie_node[1].get(action)
+            if trie_node is None:
+                return None
+        return trie_node
+
+    def __contains__(self, path):
+        trie_node = self._find(path)
+        return trie_node is not None and trie_node[0] >= 0
+
+    def children(self, path=()):
+        """Get the actions available after a path."""
+        trie_node = self._find(path)
+        if trie_node is None:
+            raise KeyError(f"No tree node at {path!r}")
+        return list(trie_node[1])
+
+    def node(self, path=()):
+        """Look up a node by action path in O(depth), reading and parsing only that node."""
+        trie_node = self._find(path)
+        if trie_node is None or trie_node[0] < 0:
+            raise KeyError(f"No tree node at {path!r}")
+        position = trie_node[0]
+
+        record = self._node_cache.get(position)
+        if record is not None:
+            self._node_cache.move_to_end(position)
+            return record.decode() if self.compact else record
+
+        body = parse_node_body(self.solution.node_text(position), self.solution.loader.range_parser)
+        record = NodeRecord.from_body(parse_action_path(path), body)
+        self._node_cache[position] = CompactNodeRecord(record) if self.compact else record
+        if len(self._node_cache) > self.node_cache_size:
+            self._node_cache.popitem(last=False)
+        return record
+
+    def paths(self):
+        """Yield the action path of every node, depth first."""
+        pending = [((), self._root)]
+        while pending:
+            path, trie_node = pending.pop()
+            if trie_node[0] >= 0:
+                yield path
+            for action in reversed(list(trie_node[1])):
+                pending.append((path + (action,), trie_node[1][action]))
+
+    def __len__(self):
+        return len(self.solution.node_names)
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+Precomputed all-in preflop equity tables.
+Builds the 1326x1326 combo-vs-combo and 169x169 class-vs-class equity matrices offline
+and serves them memory-mapped, so a range's equity is one matrix-vector product.
+
+Usage: python -m data.equity_table build [--boards 20000] [--dir Settings/Equity]
+       python -m data.equity_table info [--dir Settings/Equity]
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from .hand_range import (
+    NUM_CARDS, NUM_COMBOS, NUM_CLASSES, SUITS, COMBO_CARDS, COMBO_INDEX,
+    COMBO_CLASS, COMBO_CARD_MASK, COMBO_CONFLICTS, CLASS_INDEX, combo_index
+)
+from .hand_evaluator import evaluate
+from .card_removal import stack_ranges, live_weights, pair_weights, dead_combo_mask
+
+# Under the project folder (the parent of data/), whatever the working directory
+EQUITY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Settings', 'Equity')
+COMBO_EQUITY_FILE = 'preflop_combo_equity.npy'
+CLASS_EQUITY_FILE = 'preflop_class_equity.npy'
+
+# Boards evaluated per batch; each needs 1326 7-card evaluations
+BOARD_CHUNK = 64
+
+# (52, 1326) float card incidence, for marking combos blocked by a board
+_CARD_INCIDENCE = COMBO_CARD_MASK.T.astype(np.float32)
+
+_loaded_tables = {}
+
+
+def _suit_permutations():
+    """Get the (24, 1326) combo permutations induced by relabelling suits."""
+    from itertools import permutations
+
+    perms = []
+    ranks = np.arange(NUM_CARDS) // 4
+    suits = np.arange(NUM_CARDS) % 4
+    for order in permutations(range(len(SUITS))):
+        card_map = ranks * 4 + np.array(order)[suits]
+        perms.append(COMBO_INDEX[card_map[COMBO_CARDS[:, 0]], card_map[COMBO_CARDS[:, 1]]])
+    return np.array(perms, dtype=np.int64)
+
+
+def build_combo_equity(boards=20000, seed=0, progress=None):
+    """
+    Estimate the 1326x1326 all-in equity matrix by Monte Carlo over random boards.
+
+    Every sampled board is evaluated for all 1326 combos at once, and each
+    board scores every non-conflicting pair of combos. The counts are then
+    averaged over the 24 suit relabellings, which leave equity unchanged.
+    Entry [i, j] is combo i's equity against combo j; conflicting pairs are 0.
+    """
+    rng = np.random.default_rng(seed)
+    wins = np.zeros((NUM_COMBOS, NUM_COMBOS), dtype=np.int32)
+    seen = np.zeros((NUM_COMBOS, NUM_COMBOS), dtype=np.float64)
+
+    done = 0
+    while done < boards:
+        count = min(BOARD_CHUNK, boards - done)
+        board_cards = np.argsort(rng.random((count, NUM_CARDS)), axis=1)[:, :5]
+
+        hands = np.empty((count, NUM_COMBOS, 7), dtype=np.uint8)
+        hands[:, :, :2] = COMBO_CARDS
+        hands[:, :, 2:] = board_cards[:, None, :]
+        values = evaluate(hands.reshape(-1, 7)).reshape(count, NUM_COMBOS).astype(np.float32)
+
+        board_mask = np.zeros((count, NUM_CARDS), dtype=np.float32)
+        board_mask[np.arange(count)[:, None], board_cards] = 1
+        live = (board_mask @ _CARD_INCIDENCE) == 0
+        # NaN compares false both ways, so dead combos never score
+        values[~live] = np.nan
+        live = live.astype(np.float32)
+        seen += live.T @ live
+
+        for row in values:
+            np.add(wins, row[:, None] > row[None, :], out=wins, casting='unsafe')
+        done += count
+        if progress is not None:
+            progress(done, boards)
+
+    symmetric_wins = np.zeros((NUM_COMBOS, NUM_COMBOS), dtype=np.float64)
+    symmetric_seen = np.zeros((NUM_COMBOS, NUM_COMBOS), dtype=np.float64)
+    for perm in _suit_permutations():
+        symmetric_wins += wins[np.ix_(perm, perm)]
+        symmetric_seen += seen[np.ix_(perm, perm)]
+    symmetric_seen[COMBO_CONFLICTS] = 0
+
+    # Ties split the pot: equity = (wins + ties / 2) / seen with ties = seen - wins - wins.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        equity = 0.5 + (symmetric_wins - symmetric_wins.T) / (2 * symmetric_seen)
+    equity[symmetric_seen == 0] = 0
+    return equity.astype(np.float32)
+
+
+def _class_membership():
+    membership = np.zeros((NUM_COMBOS, NUM_CLASSES), dtype=np.float64)
+    membership[np.arange(NUM_COMBOS), COMBO_CLASS] = 1
+    return membership
+
+
+def build_class_equity(combo_equity):
+    """Reduce the combo matrix to 169x169 class equities, averaging over non-conflicting pairs."""
+    membership = _class_membership()
+    live = (~COMBO_CONFLICTS).astype(np.float64)
+    pairs = membership.T @ live @ membership
+    total = membership.T @ (combo_equity * live) @ membership
+    with np.errstate(invalid='ignore', divide='ignore'):
+        equity = np.where(pairs > 0, total / pairs, 0)
+    return equity.astype(np.float32)
+
+
+def save_tables(directory, combo_equity, class_equity):
+    """Write both tables as .npy files (temp file plus rename) and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, table in ((COMBO_EQUITY_FILE, combo_equity), (CLASS_EQUITY_FILE, class_equity)):
+        path = os.path.join(directory, name)
+        temp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(temp_path, table)
+        os.replace(temp_path, path)
+        paths.append(path)
+    return paths
+
+
+class EquityTable:
+    """Memory-mapped preflop equity matrices with hand-vs-range and range-vs-range lookups."""
+
+    def __init__(self, directory=EQUITY_DIR):
+        self.directory = directory
+        # Read-only maps: pages load on first touch and are shared between processes
+        self.combo = np.load(os.path.join(directory, COMBO_EQUITY_FILE), mmap_mode='r')
+        self.classes = np.load(os.path.join(directory, CLASS_EQUITY_FILE), mmap_mode='r')
+        if self.combo.shape != (NUM_COMBOS, NUM_COMBOS) or self.classes.shape != (NUM_CLASSES, NUM_CLASSES):
+            raise ValueError(f"Equity tables in {directory} have the wrong shape")
+
+    @property
+    def nbytes(self):
+        return self.combo.nbytes + self.classes.nbytes
+
+    def _weights(self, villain, dead_cards=None):
+        """Get the villain frequency vector with dead combos removed; None means a random hand."""
+        return stack_ranges([villain], dead_cards)[0]
+
+    def combo_equities(self, villain=None, dead_cards=None):
+        """Get every combo's equity against a range as a 1326 vector (NaN where fully blocked or dead)."""
+        weights = self._weights(villain, dead_cards)
+        live = live_weights(weights)
+        live[dead_combo_mask(dead_cards)] = 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            equity = (self.combo @ weights) / live
+        equity[live <= 0] = np.nan
+        return equity.astype(np.float32)
+
+    def hand_vs_range(self, hand, villain=None, dead_cards=None):
+        """
+        Get the equity of a hand against a range.
+
+        hand is a combo ('AcKd'), a class ('AKs') or a combo index; a class is
+        averaged over its live combos, weighted by how often each meets the
+        range. Returns None when nothing is left after card removal.
+        """
+        if isinstance(hand, str) and hand in CLASS_INDEX:
+            hero = (COMBO_CLASS == CLASS_INDEX[hand]).astype(np.float32)
+        else:
+            index = combo_index(hand) if isinstance(hand, str) else int(hand)
+            if not 0 <= index < NUM_COMBOS:
+                raise ValueError(f"Unknown hand: {hand!r}")
+            hero = np.zeros(NUM_COMBOS, dtype=np.float32)
+            hero[index] = 1
+        return self.range_vs_range(hero, villain, dead_cards)
+
+    def range_vs_range(self, hero, villain=None, dead_cards=None):
+        """Get a range's equity against another range (None = random hand), with card removal."""
+        hero_weights = stack_ranges([hero], dead_cards)[0]
+        weights = self._weights(villain, dead_cards)
+        # Only the table rows of combos the hero plays are read
+        combos = np.flatnonzero(hero_weights)
+        hero_weights = hero_weights[combos]
+        matchups = float(hero_weights @ live_weights(weights)[combos])
+        if matchups <= 0:
+            return None
+        return float(hero_weights @ (self.combo[combos] @ weights)) / matchups
+
+    def pairwise_equity(self, heroes, villains, dead_cards=None):
+        """
+        Get the equity of heroes[i] against villains[i] for a batch of pairings.
+
+        Both arguments are (n, 1326) matrices or sequences of ranges (None =
+        random hand). All pairings share one matrix product with the table, so
+        large batches run thousands of pairings per second. Pairings with no
+        live matchups are NaN.
+        """
+        heroes = stack_ranges(heroes, dead_cards)
+        villains = stack_ranges(villains, dead_cards)
+        if len(heroes) != len(villains):
+            raise ValueError("heroes and villains must have the same length")
+        wins = np.einsum('ij,ij->i', villains @ self.combo.T, heroes, dtype=np.float64)
+        matchups = np.einsum('ij,ij->i', live_weights(villains), heroes, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(matchups > 0, wins / matchups, np.nan)
+
+    def equity_matrix(self, heroes, villains, dead_cards=None):
+        """Get the (n, m) equity of every hero range against every villain range (NaN if no matchups)."""
+        heroes = stack_ranges(heroes, dead_cards)
+        villains = stack_ranges(villains, dead_cards)
+        wins = (heroes @ self.combo) @ villains.T
+        matchups = pair_weights(heroes, villains)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(matchups > 0, wins / matchups, np.nan)
+
+    def class_vs_class(self, hand1, hand2):
+        """Get the equity of one hand class against another, e.g. ('AKs', 'QQ')."""
+        return float(self.classes[CLASS_INDEX[hand1], CLASS_INDEX[hand2]])
+
+    def class_equities(self):
+        """Get the 169 class equities against a random hand."""
+        equity = self.combo_equities()
+        counts = np.bincount(COMBO_CLASS, minlength=NUM_CLASSES)
+        return (np.bincount(COMBO_CLASS, weights=equity, minlength=NUM_CLASSES) / counts).astype(np.float32)
+
+
+def load_equity_table(directory=EQUITY_DIR):
+    """
+    Get the shared EquityTable for a directory, or None if it is missing or unreadable.
+
+    Only loaded tables are kept, so tables built later in the same process are picked up.
+    """
+    directory = os.path.abspath(directory)
+    table = _loaded_tables.get(directory)
+    if table is None:
+        try:
+            table = _loaded_tables[directory] = EquityTable(directory)
+        except (OSError, ValueError, EOFError):
+            return None
+    return table
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build or inspect the preflop equity tables.")
+    arg_parser.add_argument('command', choices=['build', 'info'])
+    arg_parser.add_argument('--dir', default=EQUITY_DIR, help="table directory")
+    arg_parser.add_argument('--boards', type=int, default=20000, help="random boards sampled when building")
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+
+        def report(done, total):
+            print(f"\r{done}/{total} boards", end='', flush=True)
+
+        combo_equity = build_combo_equity(args.boards, args.seed, progress=report)
+        class_equity = build_class_equity(combo_equity)
+        paths = save_tables(args.dir, combo_equity, class_equity)
+        print(f"\nBuilt equity tables in {time.perf_counter() - start:.1f}s")
+        for path in paths:
+            print(f"  {path}: {os.path.getsize(path) / 1e6:.2f} MB")
+        return
+
+    table = load_equity_table(args.dir)
+    if table is None:
+        print(f"No equity tables in {args.dir}; run: python -m data.equity_table build")
+        return
+    print(f"Equity tables in {args.dir}: {table.nbytes / 1e6:.2f} MB")
+    for hand1, hand2 in (('AA', 'KK'), ('AKs', 'QQ'), ('AKo', '22'), ('72o', 'AA')):
+        print(f"  {hand1} vs {hand2}: {table.class_vs_class(hand1, hand2):.3f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Vectorized poker hand evaluator for 5-, 6- and 7-card hands.
+Evaluates whole batches with NumPy using lookup tables indexed by 13-bit rank masks.
+
+Cards use the same 0-51 indexes as hand_range (rank * 4 + suit, rank 0 = '2').
+A hand value is category << 20 plus five 4-bit ranks; a higher value is a better hand.
+"""
+
+from itertools import combinations, permutations
+import numpy as np
+from .hand_range import (
+    NUM_CLASSES, NUM_CARDS, NUM_COMBOS, COMBO_CARDS, COMBO_CLASS, COMBO_CARD_MASK, CLASS_COMBO_COUNTS, card_index
+)
+from .preflop_equity import CLASS_EQUITY_VS_RANDOM
+
+CATEGORY_NAMES = [
+    'High Card', 'Pair', 'Two Pair', 'Three of a Kind', 'Straight',
+    'Flush', 'Full House', 'Four of a Kind', 'Straight Flush'
+]
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+
+# Hands are evaluated in slices of this many rows to keep temporaries small
+BATCH_SIZE = 1 << 16
+
+
+def _build_tables():
+    """Build the rank-mask lookup tables."""
+    masks = np.arange(1 << 13, dtype=np.int32)
+
+    popcount = np.zeros(len(masks), dtype=np.int8)
+    top_bit = np.zeros(len(masks), dtype=np.int32)
+    top_ranks = np.zeros(len(masks), dtype=np.int32)
+    for rank in range(12, -1, -1):
+        has = ((masks >> rank) & 1).astype(bool)
+        top_bit[(masks >> rank) == 1] = rank
+        # Pack the five highest ranks as 4-bit digits, highest first
+        slot = has & (popcount < 5)
+        top_ranks[slot] |= rank << (4 * (4 - popcount[slot].astype(np.int32)))
+        popcount += has
+
+    straight_high = np.full(len(masks), -1, dtype=np.int32)
+    for high in range(12, 3, -1):
+        pattern = 0b11111 << (high - 4)
+        straight_high[(straight_high < 0) & ((masks & pattern) == pattern)] = high
+    wheel = (1 << 12) | 0b1111
+    straight_high[(straight_high < 0) & ((masks & wheel) == wheel)] = 3
+
+    for table in (popcount, top_bit, top_ranks, straight_high):
+        table.setflags(write=False)
+    return popcount, top_bit, top_ranks, straight_high
+
+
+POPCOUNT, TOP_BIT, TOP_RANKS, STRAIGHT_HIGH = _build_tables()
+
+
+def parse_cards(text):
+    """Convert a card string like 'AcKd7h' into an array of card indexes."""
+    cards = [card_index(text[i:i + 2]) for i in range(0, len(text), 2)]
+    if len(text) % 2 or min(cards, default=0) < 0:
+        raise ValueError(f"Invalid cards: {text!r}")
+    return np.array(cards, dtype=np.uint8)
+
+
+def evaluate(cards):
+    """
+    Evaluate a batch of hands.
+
+    cards is an integer array of shape (n, k) or (k,) with 5 <= k <= 7 distinct
+    card indexes per row. Returns int32 hand values of shape (n,) or a scalar.
+    """
+    cards = np.asarray(cards)
+    single = cards.ndim == 1
+    cards = np.atleast_2d(cards)
+    if not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"Hands need 5 to 7 cards, got {cards.shape[1]}")
+
+    values = np.empty(len(cards), dtype=np.int32)
+    for start in range(0, len(cards), BATCH_SIZE):
+        values[start:start + BATCH_SIZE] = _evaluate_batch(cards[start:start + BATCH_SIZE])
+    return values[0] if single else values
+
+
+def _evaluate_batch(cards):
+    cards = cards.astype(np.int32)
+    rank_bits = 1 << (cards >> 2)
+    suits = cards & 3
+
+    # m1..m4: ranks seen at least 1..4 times
+    m1 = np.zeros(len(cards), dtype=np.int32)
+    m2 = np.zeros_like(m1)
+    m3 = np.zeros_like(m1)
+    m4 = np.zeros_like(m1)
+    suit_masks = np.zeros((4, len(cards)), dtype=np.int32)
+    for i in range(cards.shape[1]):
+        bit = rank_bits[:, i]
+        m4 |= m3 & bit
+        m3 |= m2 & bit
+        m2 |= m1 & bit
+        m1 |= bit
+        for suit in range(4):
+            suit_masks[suit] |= np.where(suits[:, i] == suit, bit, 0)
+
+    # At most one suit can hold five of seven cards
+    flush_mask = np.zeros_like(m1)
+    for suit in range(4):
+        flush_mask = np.where(POPCOUNT[suit_masks[suit]] >= 5, suit_masks[suit], flush_mask)
+
+    straight_flush = STRAIGHT_HIGH[flush_mask]
+    straight = STRAIGHT_HIGH[m1]
+
+    quad_rank = TOP_BIT[m4]
+    trip_rank = TOP_BIT[m3]
+    trip_bit = 1 << trip_rank
+    full_house_rest = m2 & ~trip_bit
+    pair_rank = TOP_BIT[m2]
+    pair_bit = 1 << pair_rank
+    second_pair = TOP_BIT[m2 & ~pair_bit]
+    two_pair_bits = pair_bit | (1 << second_pair)
+
+    conditions = [
+        straight_flush >= 0,
+        m4 != 0,
+        (m3 != 0) & (full_house_rest != 0),
+        flush_mask != 0,
+        straight >= 0,
+        m3 != 0,
+        POPCOUNT[m2] >= 2,
+        m2 != 0
+    ]
+    choices = [
+        (STRAIGHT_FLUSH << 20) | (straight_flush << 16),
+        (QUADS << 20) | (quad_rank << 16) | (TOP_BIT[m1 & ~m4] << 12),
+        (FULL_HOUSE << 20) | (trip_rank << 16) | (TOP_BIT[full_house_rest] << 12),
+        (FLUSH << 20) | TOP_RANKS[flush_mask],
+        (STRAIGHT << 20) | (straight << 16),
+        (TRIPS << 20) | (trip_rank << 16) | ((TOP_RANKS[m1 & ~trip_bit] >> 12) << 8),
+        (TWO_PAIR << 20) | (pair_rank << 16) | (second_pair << 12) | (TOP_BIT[m1 & ~two_pair_bits] << 8),
+        (PAIR << 20) | (pair_rank << 16) | ((TOP_RANKS[m1 & ~pair_bit] >> 8) << 4)
+    ]
+    return np.select(conditions, choices, default=(HIGH_CARD << 20) | TOP_RANKS[m1])
+
+
+def hand_category(values):
+    """Get the category index (see CATEGORY_NAMES) of hand values."""
+    return np.asarray(values) >> 20
+
+
+# Deals counted per hero combo by the exact enumeration: C(50, 5) boards times C(45, 2) villain combos
+_DEALS_PER_COMBO = 2118760 * 990
+
+_CLASS_EQUITY_VS_RANDOM = np.array(CLASS_EQUITY_VS_RANDOM, dtype=np.float32)
+_CLASS_EQUITY_VS_RANDOM.setflags(write=False)
+
+
+def _canonical_boards():
+    """
+    Get every five-card board up to suit relabelling, with how many boards each stands for.
+
+    Returns (boards, counts): 134459 sorted boards as a (n, 5) uint8 array and
+    the size of each one's class; the counts add up to all C(52, 5) boards.
+    """
+    boards = np.array(list(combinations(range(NUM_CARDS), 5)), dtype=np.int64)
+    ranks, suits = boards >> 2, boards & 3
+    digits = NUM_CARDS ** np.arange(4, -1, -1, dtype=np.int64)
+    keys = None
+    for order in permutations(range(4)):
+        relabelled = np.sort(ranks * 4 + np.array(order)[suits], axis=1)
+        key = relabelled @ digits
+        keys = key if keys is None else np.minimum(keys, key)
+    keys, counts = np.unique(keys, return_counts=True)
+    canonical = (keys[:, None] // digits) % NUM_CARDS
+    return canonical.astype(np.uint8), counts
+
+
+def _combos_by_card():
+    """Get the (52, 51) combos holding each card, and each combo's column in its two cards' rows."""
+    by_card = np.zeros((NUM_CARDS, NUM_CARDS - 1), dtype=np.int64)
+    column = np.zeros((NUM_COMBOS, 2), dtype=np.int64)
+    filled = np.zeros(NUM_CARDS, dtype=np.int64)
+    for combo, cards in enumerate(COMBO_CARDS):
+        for side, card in enumerate(cards):
+            by_card[card, filled[card]] = combo
+            column[combo, side] = filled[card]
+            filled[card] += 1
+    return by_card, column
+
+
+_BY_CARD, _BY_CARD_COLUMN = _combos_by_card()
+
+
+def _below_and_equal(rows):
+    """For each entry of an integer matrix, count the entries of its row below it and equal to it (not itself)."""
+    # Lift each row into its own key range so one sort and search covers every row
+    row_ids = np.arange(len(rows), dtype=np.int64)[:, None]
+    keys = (rows + (row_ids << 32)).ravel()
+    ordered = np.sort(keys)
+    starts = row_ids * rows.shape[1]
+    first = np.searchsorted(ordered, keys, 'left').reshape(rows.shape) - starts
+    last = np.searchsorted(ordered, keys, 'right').reshape(rows.shape) - starts
+    return first, last - first - 1
+
+
+def _board_scores(boards):
+    """
+    Score every combo against every other live combo on each of a batch of boards.
+
+    Returns (n, 1326) float64: for each combo, wins plus half the ties over all
+    villain combos that share no card with it or the board; combos blocked by
+    the board score 0. Villains are counted by ranking all combos at once and
+    then taking back the ones that share a card with the hero.
+    """
+    boards = np.asarray(boards, dtype=np.uint8)
+    count = len(boards)
+    hands = np.empty((count, NUM_COMBOS, 7), dtype=np.uint8)
+    hands[:, :, :2] = COMBO_CARDS
+    hands[:, :, 2:] = boards[:, None, :]
+    # Live combos rank from 1 up; blocked ones are all 0, below every live combo
+    values = evaluate(hands.reshape(-1, 7)).reshape(count, NUM_COMBOS).astype(np.int64) + 1
+    blocked = COMBO_CARD_MASK[:, boards].any(axis=2).T
+    values[blocked] = 0
+
+    below, equal = _below_and_equal(values)
+    below -= blocked.sum(axis=1)[:, None]
+
+    # The same counts within the 51 combos holding each card
+    by_card = values[:, _BY_CARD].reshape(count * NUM_CARDS, NUM_CARDS - 1)
+    card_below, card_equal = _below_and_equal(by_card)
+    card_below -= (by_card == 0).sum(axis=1)[:, None]
+    card_below = card_below.reshape(count, NUM_CARDS, NUM_CARDS - 1)
+    card_equal = card_equal.reshape(count, NUM_CARDS, NUM_CARDS - 1)
+
+    for side in range(2):
+        cards, columns = COMBO_CARDS[:, side], _BY_CARD_COLUMN[:, side]
+        below -= card_below[:, cards, columns]
+        equal -= card_equal[:, cards, columns]
+    scores = below + 0.5 * equal
+    scores[blocked] = 0
+    return scores
+
+
+def exact_class_equity_vs_random(chunk=64, progress=None):
+    """
+    Compute each hand class's all-in preflop equity against a random hand exactly.
+
+    Enumerates every board up to suit relabelling (about 134k instead of 2.6M),
+    scores all 1326 combos on each, and averages over every deal. Takes about
+    a minute; the result is shipped in preflop_equity.py, see class_equity_vs_random.
+    """
+    boards, counts = _canonical_boards()
+    totals = np.zeros(NUM_CLASSES, dtype=np.float64)
+    for start in range(0, len(boards), chunk):
+        scores = _board_scores(boards[start:start + chunk])
+        combo_totals = counts[start:start + chunk].astype(np.float64) @ scores
+        totals += np.bincount(COMBO_CLASS, weights=combo_totals, minlength=NUM_CLASSES)
+        if progress is not None:
+            progress(min(start + chunk, len(boards)), len(boards))
+    return totals / (CLASS_COMBO_COUNTS * float(_DEALS_PER_COMBO))
+
+
+def class_equity_vs_random():
+    """
+    Get each hand class's exact all-in preflop equity against a random hand.
+
+    Returns a read-only float32 vector of 169 equities in class-index order,
+    from the table generated by exact_class_equity_vs_random.
+    """
+    return _CLASS_EQUITY_VS_RANDOM
+
+
+def write_equity_module(path, equity):
+    """Write the class equity table as the preflop_equity module."""
+    lines = ['"""', 'Exact all-in preflop equity of each hand class against a random hand, in class-index order.',
+             'Generated by: python -m data.hand_evaluator', '"""', '', 'CLASS_EQUITY_VS_RANDOM = (']
+    for start in range(0, NUM_CLASSES, 13):
+        lines.append('    ' + ' '.join(f"{value:.6f}," for value in equity[start:start + 13]))
+    lines.append(')')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\r\n'.join(lines))
+
+
+def main():
+    import os
+    import time
+
+    start = time.perf_counter()
+
+    def report(done, total):
+        print(f"\r{done}/{total} boards", end='', flush=True)
+
+    equity = exact_class_equity_vs_random(progress=report)
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.py')
+    write_equity_module(path, equity)
+    print(f"\nWrote {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
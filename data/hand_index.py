@@ -0,0 +1,360 @@
+"""
+Inverted index from hands to the ranges that play them.
+Each of the 169 hand classes (and optionally the 1326 combos) has a posting list of
+(range id, frequency bucket) sorted by id, so point lookups like "every range where KQo is
+a pure raise" never touch the solution files.
+
+Usage: python -m data.hand_index build <solutions folder> [--combos] [--workers N]
+       python -m data.hand_index search <solutions folder> KQo [--min 0.25] [--max 0.75] [--pure]
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from .hand_range import NUM_COMBOS, NUM_CLASSES, CLASS_INDEX, combo_index
+from .preload import preload
+from .range_store import class_matrix
+from .scan_index import ScanIndex
+
+HAND_INDEX_SUFFIX = '.hand-index.npz'
+INDEX_VERSION = 1
+
+# Buckets 0..99 hold frequencies in [k / 100, (k + 1) / 100); PURE_BUCKET holds exactly 1.0
+BUCKETS = 100
+PURE_BUCKET = BUCKETS
+
+# Merge the pending segments into the main one once they hold this share of its postings
+MERGE_RATIO = 0.1
+
+
+def default_index_path(folder):
+    """Get the index file kept beside a solutions folder."""
+    return os.path.abspath(folder).rstrip(os.sep) + HAND_INDEX_SUFFIX
+
+
+# Slack for float32 rounding, so 0.35 lands in bucket 35 and a six-combo average of 1.0 counts as pure
+_BUCKET_EPSILON = 1e-4
+
+
+def frequency_buckets(frequencies):
+    """Quantize frequencies in (0, 1] to bucket numbers."""
+    scaled = frequencies * np.float32(BUCKETS) + np.float32(_BUCKET_EPSILON)
+    buckets = np.minimum(np.floor(scaled), BUCKETS - 1).astype(np.uint8)
+    buckets[scaled >= BUCKETS] = PURE_BUCKET
+    return buckets
+
+
+def bucket_range(min_frequency, max_frequency):
+    """Get the (first, last) bucket covering a frequency interval; edges are exact to 1 / BUCKETS."""
+    first = 0 if min_frequency is None else int(np.floor(min_frequency * BUCKETS + _BUCKET_EPSILON))
+    if max_frequency is None or max_frequency >= 1:
+        last = PURE_BUCKET
+    else:
+        last = int(np.floor(max_frequency * BUCKETS + _BUCKET_EPSILON))
+    return min(first, PURE_BUCKET), last
+
+
+class PostingSegment:
+    """Posting lists of a batch of ranges in CSR form: term t owns ids[offsets[t]:offsets[t + 1]]."""
+
+    def __init__(self, offsets, ids, buckets):
+        self.offsets = offsets
+        self.ids = ids
+        self.buckets = buckets
+
+    @classmethod
+    def from_matrix(cls, matrix, first_id):
+        """Build postings for the rows of a (n, terms) frequency matrix numbered from first_id."""
+        by_term = np.ascontiguousarray(matrix.T).ravel()
+        # Row-major positions of the transpose come out grouped by term with ids ascending
+        positions = np.flatnonzero(by_term)
+        terms, rows = np.divmod(positions, len(matrix))
+        offsets = np.zeros(matrix.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=matrix.shape[1]), out=offsets[1:])
+        return cls(offsets, (rows + first_id).astype(np.int32), frequency_buckets(by_term[positions]))
+
+    @classmethod
+    def empty(cls, terms):
+        return cls(np.zeros(terms + 1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.uint8))
+
+    @classmethod
+    def merge(cls, segments, live):
+        """Merge segments into one, dropping postings of ranges that are no longer live."""
+        terms = len(segments[0].offsets) - 1
+        all_terms = np.concatenate([np.repeat(np.arange(terms), np.diff(segment.offsets)) for segment in segments])
+        all_ids = np.concatenate([segment.ids for segment in segments])
+        all_buckets = np.concatenate([segment.buckets for segment in segments])
+        keep = live[all_ids]
+        all_terms, all_ids, all_buckets = all_terms[keep], all_ids[keep], all_buckets[keep]
+        # Each segment's ids are larger than the previous one's, so a stable sort by term keeps ids ascending
+        order = np.argsort(all_terms.astype(np.int16 if terms < 2 ** 15 else np.int32), kind='stable')
+        offsets = np.zeros(terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_terms, minlength=terms), out=offsets[1:])
+        return cls(offsets, all_ids[order], all_buckets[order])
+
+    def postings(self, term):
+        start, end = self.offsets[term], self.offsets[term + 1]
+        return self.ids[start:end], self.buckets[start:end]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class HandIndex:
+    """
+    Hand -> ranges posting lists for a solution library.
+
+    Every range (file plus range slot) gets an integer id. Changing a file
+    retires its old ids and gives its new ranges fresh, larger ids in a
+    small pending segment, so posting lists stay sorted without a rebuild.
+    """
+
+    def __init__(self, include_combos=False):
+        self.include_combos = include_combos
+        # Per range id: relative path, range slot, file mtime, and whether it is still current
+        self.paths = []
+        self.slots = []
+        self.mtimes = np.zeros(0, dtype=np.int64)
+        self.live = np.zeros(0, dtype=bool)
+        self.classes = [PostingSegment.empty(NUM_CLASSES)]
+        self.combos = [PostingSegment.empty(NUM_COMBOS)] if include_combos else None
+
+    def __len__(self):
+        return int(self.live.sum())
+
+    @property
+    def nbytes(self):
+        segments = self.classes + (self.combos or [])
+        return sum(segment.ids.nbytes + segment.buckets.nbytes + segment.offsets.nbytes for segment in segments)
+
+    # -- building --
+
+    def add_ranges(self, matrix, paths, slots, mtimes):
+        """Index the rows of an (n, 1326) range matrix as new range ids."""
+        first_id = len(self.paths)
+        self.paths.extend(paths)
+        self.slots.extend(slots)
+        self.mtimes = np.concatenate([self.mtimes, np.asarray(mtimes, dtype=np.int64)])
+        self.live = np.concatenate([self.live, np.ones(len(paths), dtype=bool)])
+        if not len(paths):
+            return
+        self.classes.append(PostingSegment.from_matrix(class_matrix(matrix), first_id))
+        if self.combos is not None:
+            self.combos.append(PostingSegment.from_matrix(matrix, first_id))
+        self._maybe_merge()
+
+    def add_preload(self, result):
+        """Index every range of a PreloadResult."""
+        rows, paths, slots, mtimes = [], [], [], []
+        for relative_path in result.paths:
+            try:
+                mtime_ns = os.stat(os.path.join(result.folder, relative_path)).st_mtime_ns
+            except OSError:
+                mtime_ns = 0
+            for slot, row in result.rows[relative_path].items():
+                rows.append(row)
+                paths.append(relative_path)
+                slots.append(slot)
+                mtimes.append(mtime_ns)
+        matrix = result.ranges[np.array(rows, dtype=np.int64)] if rows else np.zeros((0, NUM_COMBOS), dtype=np.float32)
+        self.add_ranges(matrix, paths, slots, mtimes)
+
+    @classmethod
+    def from_preload(cls, result, include_combos=False):
+        index = cls(include_combos)
+        index.add_preload(result)
+        index.merge()
+        return index
+
+    @classmethod
+    def build(cls, folder, include_combos=False, workers=None, progress=None):
+        """Parse a whole library and index it."""
+        return cls.from_preload(preload(folder, workers=workers, progress=progress), include_combos)
+
+    def update(self, folder, workers=None, progress=None):
+        """
+        Re-index only what changed in a library: new and modified files are
+        parsed, and ranges of modified or deleted files are retired.
+        Returns (added, replaced, removed) file counts.
+        """
+        index = ScanIndex(folder)
+        index.refresh()
+        index.save()
+        current = {}
+        for relative_path in index.solution_files():
+            try:
+                current[relative_path] = os.stat(os.path.join(folder, relative_path)).st_mtime_ns
+            except OSError:
+                continue
+
+        known = {}
+        for range_id in np.flatnonzero(self.live):
+            known[self.paths[range_id]] = self.mtimes[range_id]
+        stale = {path for path, mtime_ns in known.items() if current.get(path) != mtime_ns}
+        added = [path for path in current if path not in known]
+        replaced = [path for path in stale if path in current]
+
+        if stale:
+            self.live[[range_id for range_id in np.flatnonzero(self.live) if self.paths[range_id] in stale]] = False
+        if added or replaced:
+            self.add_preload(preload(folder, workers=workers, progress=progress, paths=sorted(added + replaced)))
+        return len(added), len(replaced), len(stale) - len(replaced)
+
+    def _maybe_merge(self):
+        pending = sum(len(segment) for segment in self.classes[1:])
+        if len(self.classes) > 1 and pending > MERGE_RATIO * max(len(self.classes[0]), 1):
+            self.merge()
+
+    def merge(self):
+        """Fold pending segments (and retired ranges) into one segment per posting type."""
+        if len(self.classes) == 1 and self.live.all():
+            return
+        if len(self.classes) == 2 and not len(self.classes[0]) and self.live.all():
+            self.classes = self.classes[1:]
+            self.combos = self.combos[1:] if self.combos is not None else None
+            return
+        self.classes = [PostingSegment.merge(self.classes, self.live)]
+        if self.combos is not None:
+            self.combos = [PostingSegment.merge(self.combos, self.live)]
+
+    # -- queries --
+
+    def _postings(self, hand):
+        """Get the concatenated (ids, buckets) of a class ('KQo') or, if indexed, a combo ('KhQd')."""
+        if hand in CLASS_INDEX:
+            segments, term = self.classes, CLASS_INDEX[hand]
+        elif len(hand) == 4 and combo_index(hand) >= 0:
+            if self.combos is None:
+                raise KeyError(f"Combo lookups need an index built with combos ({hand!r})")
+            segments, term = self.combos, combo_index(hand)
+        else:
+            raise KeyError(f"Unknown hand {hand!r}")
+        # Later segments only hold larger ids, so concatenation keeps the list sorted
+        parts = [segment.postings(term) for segment in segments]
+        return np.concatenate([ids for ids, _ in parts]), np.concatenate([buckets for _, buckets in parts])
+
+    def search(self, hand, min_frequency=None, max_frequency=None, pure=False):
+        """
+        Get the sorted ids of current ranges playing hand within a frequency interval.
+
+        pure=True means exactly 1.0. Interval edges are resolved to 1 / BUCKETS.
+        Ranges that do not play the hand at all are never returned.
+        """
+        ids, buckets = self._postings(hand)
+        if pure:
+            first, last = PURE_BUCKET, PURE_BUCKET
+        else:
+            first, last = bucket_range(min_frequency, max_frequency)
+        hits = ids[(buckets >= first) & (buckets <= last)]
+        return hits[self.live[hits]]
+
+    def search_all(self, conditions):
+        """
+        Get ids matching every condition, e.g. [('KQo', {'pure': True}), ('22', {'min_frequency': 0.25,
+        'max_frequency': 0.75})]; posting lists are intersected in sorted order.
+        """
+        result = None
+        for hand, options in conditions:
+            ids = self.search(hand, **options)
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+            if not len(result):
+                break
+        return result if result is not None else np.flatnonzero(self.live).astype(np.int32)
+
+    def frequency_buckets_for(self, hand, ids):
+        """Get the bucket of hand in each of the given range ids (0 where it is not played)."""
+        posting_ids, buckets = self._postings(hand)
+        positions = np.searchsorted(posting_ids, ids)
+        positions = np.minimum(positions, max(len(posting_ids) - 1, 0))
+        found = (posting_ids[positions] == ids) if len(posting_ids) else np.zeros(len(ids), dtype=bool)
+        return np.where(found, buckets[positions] if len(buckets) else 0, 0)
+
+    def describe(self, ids):
+        """Get (path, slot) for range ids."""
+        return [(self.paths[range_id], self.slots[range_id]) for range_id in ids]
+
+    # -- persistence --
+
+    def save(self, path):
+        """Write the index to one .npz file (pending segments are merged first)."""
+        self.merge()
+        arrays = {
+            'version': np.array(INDEX_VERSION),
+            'paths': np.array(self.paths, dtype=str),
+            'slots': np.array(self.slots, dtype=str),
+            'mtimes': self.mtimes,
+            'live': self.live,
+            'class_offsets': self.classes[0].offsets,
+            'class_ids': self.classes[0].ids,
+            'class_buckets': self.classes[0].buckets
+        }
+        if self.combos is not None:
+            arrays.update(combo_offsets=self.combos[0].offsets, combo_ids=self.combos[0].ids,
+                          combo_buckets=self.combos[0].buckets)
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Open a saved index, or return None if there is none (or it is from another version)."""
+        try:
+            data = np.load(path)
+        except (OSError, ValueError):
+            return None
+        with data:
+            if int(data['version']) != INDEX_VERSION:
+                return None
+            index = cls('combo_ids' in data.files)
+            index.paths = data['paths'].tolist()
+            index.slots = data['slots'].tolist()
+            index.mtimes = data['mtimes']
+            index.live = data['live']
+            index.classes = [PostingSegment(data['class_offsets'], data['class_ids'], data['class_buckets'])]
+            if index.include_combos:
+                index.combos = [PostingSegment(data['combo_offsets'], data['combo_ids'], data['combo_buckets'])]
+        return index
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build or search the hand index of a solutions folder.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build the index, or update it if one exists")
+    build.add_argument('folder')
+    build.add_argument('--combos', action='store_true', help="also index the 1326 specific combos")
+    build.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    search = commands.add_parser('search', help="list ranges that play a hand")
+    search.add_argument('folder')
+    search.add_argument('hand', help="hand class like KQo, or a combo like KhQd with a --combos index")
+    search.add_argument('--min', type=float, default=None, help="minimum frequency")
+    search.add_argument('--max', type=float, default=None, help="maximum frequency")
+    search.add_argument('--pure', action='store_true', help="only ranges playing the hand 100%%")
+    args = arg_parser.parse_args()
+
+    path = default_index_path(args.folder)
+    start = time.perf_counter()
+    if args.command == 'build':
+        index = HandIndex.load(path)
+        if index is None or index.include_combos != args.combos:
+            index = HandIndex.build(args.folder, include_combos=args.combos, workers=args.workers)
+            action = "built"
+        else:
+            added, replaced, removed = index.update(args.folder, workers=args.workers)
+            action = f"updated ({added} added, {replaced} replaced, {removed} removed files)"
+        index.save(path)
+        print(f"Hand index {path} {action}: {len(index)} ranges, {index.nbytes / 1e6:.1f} MB "
+              f"in {time.perf_counter() - start:.2f}s")
+    else:
+        index = HandIndex.load(path)
+        if index is None:
+            raise SystemExit(f"No hand index at {path}; run 'build' first")
+        ids = index.search(args.hand, args.min, args.max, args.pure)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for relative_path, slot in index.describe(ids):
+            print(f"{relative_path}  [{slot}]")
+        print(f"{len(ids)} ranges ({elapsed_ms:.1f} ms including load)")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Compact range representation backed by a fixed 1326-combo vector.
+Holds the card, combo and hand-class index tables shared by the parser and the grid.
+"""
+
+import numpy as np
+
+# Card ranks from low to high; card index = rank_index * 4 + suit_index
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+
+# Ranks in the order they appear on the 13x13 grid (top-left is AA)
+GRID_RANKS = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
+
+NUM_CARDS = 52
+NUM_COMBOS = 1326
+NUM_CLASSES = 169
+
+
+def card_index(card):
+    """Convert a card string like 'Ac' to its 0-51 index, or -1 if invalid."""
+    if len(card) != 2:
+        return -1
+    rank = RANKS.find(card[0])
+    suit = SUITS.find(card[1])
+    if rank < 0 or suit < 0:
+        return -1
+    return rank * 4 + suit
+
+
+def card_string(index):
+    """Convert a 0-51 card index back to a string like 'Ac'."""
+    return RANKS[index // 4] + SUITS[index % 4]
+
+
+def class_grid_index(rank1, rank2, suited):
+    """Get the class index (row * 13 + col) for two rank indexes (0 = '2')."""
+    high, low = max(rank1, rank2), min(rank1, rank2)
+    high_pos, low_pos = 12 - high, 12 - low
+    if high == low or suited:
+        # Pairs sit on the diagonal, suited hands above it
+        return high_pos * 13 + low_pos
+    return low_pos * 13 + high_pos
+
+
+def _build_tables():
+    """Precompute the combo <-> card and combo -> class tables."""
+    combo_cards = np.zeros((NUM_COMBOS, 2), dtype=np.uint8)
+    combo_index = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.int16)
+    combo_class = np.zeros(NUM_COMBOS, dtype=np.int16)
+
+    index = 0
+    for card1 in range(NUM_CARDS):
+        for card2 in range(card1 + 1, NUM_CARDS):
+            combo_cards[index] = (card1, card2)
+            combo_index[card1, card2] = index
+            combo_index[card2, card1] = index
+            combo_class[index] = class_grid_index(
+                card1 // 4, card2 // 4, card1 % 4 == card2 % 4
+            )
+            index += 1
+
+    class_names = []
+    for row in range(13):
+        for col in range(13):
+            rank1, rank2 = GRID_RANKS[row], GRID_RANKS[col]
+            if row == col:
+                class_names.append(f"{rank1}{rank2}")
+            elif row < col:
+                class_names.append(f"{rank1}{rank2}s")
+            else:
+                class_names.append(f"{rank2}{rank1}o")
+
+    return combo_cards, combo_index, combo_class, class_names
+
+
+COMBO_CARDS, COMBO_INDEX, COMBO_CLASS, HAND_CLASSES = _build_tables()
+CLASS_INDEX = {hand: idx for idx, hand in enumerate(HAND_CLASSES)}
+CLASS_COMBO_COUNTS = np.bincount(COMBO_CLASS, minlength=NUM_CLASSES).astype(np.float32)
+
+COMBO_IS_PAIR = (COMBO_CARDS[:, 0] // 4) == (COMBO_CARDS[:, 1] // 4)
+COMBO_IS_SUITED = (COMBO_CARDS[:, 0] % 4) == (COMBO_CARDS[:, 1] % 4)
+COMBO_IS_OFFSUIT = ~(COMBO_IS_PAIR | COMBO_IS_SUITED)
+
+# (1326, 52) card incidence: COMBO_CARD_MASK[i, c] is True when combo i holds card c
+COMBO_CARD_MASK = np.zeros((NUM_COMBOS, NUM_CARDS), dtype=bool)
+COMBO_CARD_MASK[np.arange(NUM_COMBOS), COMBO_CARDS[:, 0]] = True
+COMBO_CARD_MASK[np.arange(NUM_COMBOS), COMBO_CARDS[:, 1]] = True
+
+# (1326, 1326) card removal: True where two combos share a card (including a combo with itself)
+_incidence = COMBO_CARD_MASK.astype(np.float32)
+COMBO_CONFLICTS = (_incidence @ _incidence.T) > 0
+del _incidence
+
+for _table in (COMBO_CARDS, COMBO_INDEX, COMBO_CLASS, CLASS_COMBO_COUNTS,
+               COMBO_IS_PAIR, COMBO_IS_SUITED, COMBO_IS_OFFSUIT,
+               COMBO_CARD_MASK, COMBO_CONFLICTS):
+    _table.setflags(write=False)
+
+
+def combo_index(specific_hand):
+    """Get the combo index for a hand like 'AcKd', or -1 if invalid."""
+    if len(specific_hand) != 4:
+        return -1
+    card1 = card_index(specific_hand[:2])
+    card2 = card_index(specific_hand[2:])
+    if card1 < 0 or card2 < 0:
+        return -1
+    return int(COMBO_INDEX[card1, card2])
+
+
+def _build_token_table():
+    """Map every 'AcKd_' style token prefix (both card orders) to its combo index."""
+    table = {}
+    for card1 in range(NUM_CARDS):
+        for card2 in range(NUM_CARDS):
+            if card1 != card2:
+                token = card_string(card1) + card_string(card2) + '_'
+                table[token] = int(COMBO_INDEX[card1, card2])
+    return table
+
+
+# Keys include the '_' separator so one dict lookup also validates the token shape
+COMBO_TOKENS = _build_token_table()
+
+
+def combo_string(index):
+    """Get the hand string for a combo index, higher card first (e.g. 'AcKd')."""
+    card1, card2 = COMBO_CARDS[index]
+    return card_string(int(card2)) + card_string(int(card1))
+
+
+def class_combo_mask(hands):
+    """Build a boolean combo mask selecting every combo of the given hand classes."""
+    class_mask = np.zeros(NUM_CLASSES, dtype=bool)
+    for hand in hands:
+        if hand in CLASS_INDEX:
+            class_mask[CLASS_INDEX[hand]] = True
+    return class_mask[COMBO_CLASS]
+
+
+class Range:
+    """A range stored as one float32 frequency per combo."""
+
+    __slots__ = ('frequencies',)
+
+    def __init__(self, frequencies=None):
+        if frequencies is None:
+            frequencies = np.zeros(NUM_COMBOS, dtype=np.float32)
+        else:
+            frequencies = np.asarray(frequencies, dtype=np.float32)
+            if frequencies.shape != (NUM_COMBOS,):
+                raise ValueError(f"Range needs {NUM_COMBOS} combo frequencies, got shape {frequencies.shape}")
+        self.frequencies = frequencies
+
+    @classmethod
+    def from_combos(cls, combo_frequencies):
+        """Build a range from a {specific_hand: frequency} mapping like {'AcKd': 0.5}."""
+        result = cls()
+        for hand, frequency in combo_frequencies.items():
+            index = combo_index(hand)
+            if index >= 0:
+                result.frequencies[index] = frequency
+        return result
+
+    @classmethod
+    def from_class_frequencies(cls, class_frequencies):
+        """Build a range from a {generic_hand: frequency} mapping or a 169-length vector."""
+        if isinstance(class_frequencies, dict):
+            vector = np.zeros(NUM_CLASSES, dtype=np.float32)
+            for hand, frequency in class_frequencies.items():
+                if hand in CLASS_INDEX:
+                    vector[CLASS_INDEX[hand]] = frequency
+        else:
+            vector = np.asarray(class_frequencies, dtype=np.float32)
+        return cls(vector[COMBO_CLASS])
+
+    def class_weights(self):
+        """Get the played combos per hand class as a 169-length vector."""
+        return np.bincount(COMBO_CLASS, weights=self.frequencies,
+                           minlength=NUM_CLASSES).astype(np.float32)
+
+    def class_frequencies(self):
+        """Get the average frequency per hand class as a 169-length vector."""
+        return self.class_weights() / CLASS_COMBO_COUNTS
+
+    def hand_frequency(self, hand):
+        """Get the frequency of a generic hand ('AKs') or a specific combo ('AcKs')."""
+        if len(hand) == 4:
+            index = combo_index(hand)
+            return float(self.frequencies[index]) if index >= 0 else 0.0
+        if hand not in CLASS_INDEX:
+            return 0.0
+        return float(self.class_frequencies()[CLASS_INDEX[hand]])
+
+    def masked(self, mask):
+        """Return a copy keeping only the combos selected by a boolean mask."""
+        return Range(np.where(mask, self.frequencies, np.float32(0)))
+
+    def to_dict(self):
+        """Convert to the legacy {generic_hand: frequency} dict of played classes."""
+        class_freqs = self.class_frequencies()
+        return {HAND_CLASSES[idx]: float(class_freqs[idx])
+                for idx in np.flatnonzero(class_freqs > 0)}
+
+    @property
+    def combo_count(self):
+        """Number of combos with a non-zero frequency."""
+        return int(np.count_nonzero(self.frequencies))
+
+    @property
+    def nbytes(self):
+        return self.frequencies.nbytes
+
+    def __bool__(self):
+        return bool(self.frequencies.any())
+
+    def __eq__(self, other):
+        if not isinstance(other, Range):
+            return NotImplemented
+        return bool(np.array_equal(self.frequencies, other.frequencies))
+
+    def __repr__(self):
+        return f"Range(combos={self.combo_count}, played={float(self.frequencies.sum()):.2f})"
+
+
+def as_range(range_data):
+    """Coerce a Range, a legacy {generic_hand: frequency} dict or None into a Range."""
+    if isinstance(range_data, Range):
+        return range_data
+    if not range_data:
+        return Range()
+    return Range.from_class_frequencies(range_data)
\ No newline at end of file
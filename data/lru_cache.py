@@ -0,0 +1,186 @@
+"""
+In-process LRU cache for parsed solutions.
+Evicts by a resident-memory budget rather than entry count and keeps hit/miss statistics.
+"""
+
+import mmap
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from .hand_range import Range
+from .palette import CompactSolution
+
+
+def file_backed(array):
+    """True if an array is a view of a memory-mapped file, whose pages the OS can drop and reload."""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = array.obj if isinstance(array, memoryview) else getattr(array, 'base', None)
+    return False
+
+
+def range_arrays(solution):
+    """Get the distinct in-memory range arrays of a solution; arrays mapped from a .solc cache or pack are left out."""
+    arrays = {id(value.frequencies): value.frequencies for value in solution.values()
+              if isinstance(value, Range) and not file_backed(value.frequencies)}
+    return list(arrays.values())
+
+
+def solution_nbytes(solution, ranges=True):
+    """
+    Estimate the resident bytes of a parsed solution dict.
+
+    Memory-mapped range arrays are not counted; with ranges=False no range
+    array is, so the caller can count arrays shared between solutions once.
+    """
+    total = sys.getsizeof(solution)
+    for key, value in solution.items():
+        total += sys.getsizeof(key)
+        if isinstance(value, Range):
+            total += sys.getsizeof(value)
+            if ranges and not file_backed(value.frequencies):
+                total += value.nbytes
+        elif isinstance(value, dict):
+            total += sys.getsizeof(value)
+            total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+        else:
+            total += sys.getsizeof(value)
+    return total
+
+
+def _freeze(solution):
+    """Mark a solution's range arrays read-only so cached copies cannot be changed in place."""
+    for value in solution.values():
+        if isinstance(value, Range) and value.frequencies.flags.writeable:
+            value.frequencies.setflags(write=False)
+
+
+class SolutionLRUCache:
+    """
+    Thread-safe LRU cache of parsed solutions bounded by a byte budget.
+
+    With compact=True solutions are held palette-coded (see data/palette.py) and
+    decoded on every get, trading a few microseconds per hit for several times
+    more solutions in the same budget.
+
+    By default a range array shared by several cached solutions (an interned
+    range) is counted once, and memory-mapped ranges are not counted at all.
+    A custom sizeof(solution) is used as the whole size of an entry instead.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, sizeof=None, compact=False):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.compact = compact
+        # key -> (solution, bytes of the entry itself, ids of the range arrays it holds)
+        self._entries = OrderedDict()
+        # id(range array) -> [entries holding it, its bytes]; entries keep the arrays alive
+        self._shared = {}
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Get a cached solution and mark it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            solution = entry[0]
+        return solution.decode() if self.compact else solution
+
+    def put(self, key, solution):
+        """Cache a solution, evicting least recently used entries to stay in budget; returns the bytes it added."""
+        arrays = []
+        if self.compact:
+            solution = CompactSolution(solution)
+            size = solution.nbytes
+        elif self.sizeof is not None:
+            size = self.sizeof(solution)
+        else:
+            size = solution_nbytes(solution, ranges=False)
+            arrays = range_arrays(solution)
+        if size + sum(array.nbytes for array in arrays) > self.max_bytes:
+            return 0
+        if not self.compact:
+            _freeze(solution)
+
+        with self._lock:
+            self._remove(key)
+            added = size
+            for array in arrays:
+                holders = self._shared.setdefault(id(array), [0, array.nbytes])
+                if not holders[0]:
+                    added += array.nbytes
+                holders[0] += 1
+            self._entries[key] = (solution, size, [id(array) for array in arrays])
+            self.resident_bytes += added
+            self._evict()
+        return added
+
+    def _remove(self, key):
+        """Drop one entry and release the range arrays only it held (lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, size, array_ids = entry
+        self.resident_bytes -= size
+        for array_id in array_ids:
+            holders = self._shared[array_id]
+            holders[0] -= 1
+            if not holders[0]:
+                del self._shared[array_id]
+                self.resident_bytes -= holders[1]
+        return True
+
+    def discard(self, key):
+        """Drop one entry if present."""
+        with self._lock:
+            self._remove(key)
+
+    def resize(self, max_bytes):
+        """Change the byte budget, evicting immediately if it shrank."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """Drop every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._shared.clear()
+            self.resident_bytes = 0
+
+    def _evict(self):
+        while self.resident_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Get hits, misses, evictions, hit rate and resident bytes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'resident_bytes': self.resident_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'compact': self.compact,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Palette-coded storage for frequency arrays.
+
+Solver frequencies mostly sit on a small grid (0, 0.25, 0.5, 0.75, 1), so an
+array is stored as small integer codes into a float32 palette: 4-bit codes
+packed two per byte for up to 16 distinct values, uint8 codes for up to 256.
+Arrays with more distinct values fall back to float16 when that is lossless,
+otherwise float32. Decoding always gives back the exact float32 values,
+bit for bit (so -0.0 stays distinct from 0.0).
+
+Usage: python -m data.palette <solutions folder> [--workers N]   (memory report)
+"""
+
+import argparse
+import math
+import sys
+import numpy as np
+from .hand_range import Range, combo_string
+from .preload import preload
+
+# Storage kinds, smallest first
+PALETTE4 = 'palette4'
+PALETTE8 = 'palette8'
+FLOAT16 = 'float16'
+FLOAT32 = 'float32'
+
+# (high nibble, low nibble) of every byte value
+_NIBBLES = np.stack([np.arange(256) >> 4, np.arange(256) & 0x0F], axis=1).astype(np.uint8)
+
+
+class PaletteArray:
+    """A float32 array of any shape stored as palette codes (or a lossless float fallback)."""
+
+    __slots__ = ('kind', 'shape', 'palette', 'data')
+
+    def __init__(self, kind, shape, palette, data):
+        self.kind = kind
+        self.shape = shape
+        # float32 palette for the palette kinds, None for the float fallbacks
+        self.palette = palette
+        self.data = data
+
+    @classmethod
+    def encode(cls, values):
+        """Pick the smallest lossless storage for an array."""
+        values = np.asarray(values, dtype=np.float32)
+        flat = values.ravel()
+        # Unique bit patterns rather than values: np.unique would merge -0.0 into 0.0
+        bits, codes = np.unique(flat.view(np.uint32), return_inverse=True)
+        palette = bits.view(np.float32)
+        codes = codes.reshape(-1)
+        if len(palette) <= 16:
+            if len(codes) % 2:
+                codes = np.append(codes, 0)
+            packed = (codes[0::2] << 4 | codes[1::2]).astype(np.uint8)
+            return cls(PALETTE4, values.shape, palette, packed)
+        if len(palette) <= 256:
+            return cls(PALETTE8, values.shape, palette, codes.astype(np.uint8))
+        halves = flat.astype(np.float16)
+        if np.array_equal(halves.astype(np.float32).view(np.uint32), flat.view(np.uint32)):
+            return cls(FLOAT16, values.shape, None, halves)
+        return cls(FLOAT32, values.shape, None, flat.copy())
+
+    def decode(self):
+        """Get the float32 array back."""
+        if self.kind == PALETTE4:
+            # Look up both values of each byte at once through a 256-entry pair table
+            palette = np.zeros(16, dtype=np.float32)
+            palette[:len(self.palette)] = self.palette
+            pairs = np.take(palette, _NIBBLES)
+            values = np.take(pairs, self.data, axis=0).reshape(-1)[:math.prod(self.shape)]
+        elif self.kind == PALETTE8:
+            values = np.take(self.palette, self.data)
+        else:
+            values = self.data.astype(np.float32)
+        return values.reshape(self.shape)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + (self.palette.nbytes if self.palette is not None else 0)
+
+    def __repr__(self):
+        return f"PaletteArray(kind={self.kind!r}, shape={self.shape}, nbytes={self.nbytes})"
+
+
+class CompactSolution:
+    """
+    A parsed solution with all its ranges encoded together, so they share one palette.
+    Everything but the ranges is kept as is; decode() rebuilds the solution dict.
+    """
+
+    __slots__ = ('names', 'ranges', 'rest')
+
+    def __init__(self, solution):
+        self.names = [key for key, value in solution.items() if isinstance(value, Range)]
+        self.ranges = (PaletteArray.encode(np.stack([solution[name].frequencies for name in self.names]))
+                       if self.names else None)
+        self.rest = {key: value for key, value in solution.items() if key not in self.names}
+
+    def decode(self):
+        solution = dict(self.rest)
+        if self.names:
+            for name, frequencies in zip(self.names, self.ranges.decode()):
+                solution[name] = Range(frequencies)
+        return solution
+
+    @property
+    def nbytes(self):
+        """Estimate resident bytes: the encoded ranges plus the plain entries."""
+        total = sys.getsizeof(self) + sys.getsizeof(self.rest) + sys.getsizeof(self.names)
+        if self.ranges is not None:
+            total += self.ranges.nbytes + sys.getsizeof(self.ranges)
+        for key, value in self.rest.items():
+            total += sys.getsizeof(key) + sys.getsizeof(value)
+            if isinstance(value, dict):
+                total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+        return total
+
+
+def memory_report(arrays):
+    """Summarize how a collection of float32 arrays would encode: bytes before and after, kinds used."""
+    kinds = {}
+    raw = encoded = 0
+    for values in arrays:
+        packed = PaletteArray.encode(values)
+        kinds[packed.kind] = kinds.get(packed.kind, 0) + 1
+        raw += np.asarray(values, dtype=np.float32).nbytes
+        encoded += packed.nbytes
+    return {'arrays': sum(kinds.values()), 'raw_bytes': raw, 'encoded_bytes': encoded,
+            'ratio': raw / encoded if encoded else 0.0, 'kinds': kinds}
+
+
+def dict_nbytes(frequencies):
+    """Estimate a range held the old way: a {'AcKd': float} dict of its played combos."""
+    played = np.flatnonzero(frequencies)
+    sample = {combo_string(index): float(frequencies[index]) for index in played}
+    return sys.getsizeof(sample) + sum(sys.getsizeof(value) for value in sample.values())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Report how much memory palette coding saves on a library.")
+    arg_parser.add_argument('folder')
+    arg_parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = arg_parser.parse_args()
+
+    result = preload(args.folder, workers=args.workers)
+    # One palette per file, shared by all of its ranges
+    per_file = [result.ranges[sorted(result.rows[path].values())] for path in result.paths if result.rows[path]]
+    report = memory_report(per_file)
+    as_dicts = sum(dict_nbytes(row) for row in result.ranges)
+
+    print(f"{len(result.paths)} files, {len(result.ranges)} ranges")
+    print(f"{'per-combo dicts (estimate)':<28} {as_dicts / 1e6:10.2f} MB")
+    print(f"{'float32 vectors':<28} {report['raw_bytes'] / 1e6:10.2f} MB")
+    print(f"{'palette coded':<28} {report['encoded_bytes'] / 1e6:10.2f} MB  "
+          f"({report['ratio']:.1f}x smaller than float32, {as_dicts / max(report['encoded_bytes'], 1):.0f}x than dicts)")
+    print("files per storage kind: " + ', '.join(f"{kind} {count}" for kind, count in sorted(report['kinds'].items())))
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Background prefetch of solutions the user is likely to open next.
+Warms a SolutionLoader's memory cache on a low-priority thread within a memory and CPU budget.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Seconds between prefetch errors written to stderr; the rest are only counted
+ERROR_REPORT_INTERVAL = 30.0
+
+
+class Prefetcher:
+    """Warms a loader's memory cache with likely next solutions and tracks how often that pays off."""
+
+    def __init__(self, loader, max_bytes=None, max_files=12, cpu_share=0.25):
+        self.loader = loader
+        # Budget per schedule() round; by default a quarter of the loader's memory cache
+        if max_bytes is None:
+            max_bytes = loader.memory_cache.max_bytes // 4 if loader.memory_cache is not None else 0
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        # Share of one core the worker may use: it idles (1 - share) / share as long as each load took
+        self.cpu_share = cpu_share
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._resolve = None
+        self._generation = 0
+        self._stopped = False
+        self._thread = None
+
+        # Absolute paths warmed by the prefetcher and not yet requested
+        self._prefetched = set()
+        self.requests = 0
+        self.hits = 0
+        self.memory_hits = 0
+        self.prefetched_files = 0
+        self.prefetched_bytes = 0
+        self.wasted = 0
+        # Failed prefetches and the latest (key, message), shown by the GUI status bar
+        self.failures = 0
+        self.last_error = None
+        self._last_report = None
+
+    def schedule(self, keys, resolve):
+        """
+        Replace the pending work with keys, most likely first.
+
+        resolve(key) runs on the prefetch thread and returns a file path or
+        None, so file discovery never happens on the caller's thread. Work
+        from the previous round that has not started is dropped.
+        """
+        if self.max_bytes <= 0 or self.max_files <= 0:
+            return
+        with self._condition:
+            self._generation += 1
+            self._pending = list(keys)
+            self._resolve = resolve
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="solution-prefetch", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def record_request(self, file_path):
+        """Count a user request; returns True when a prefetch made it a memory hit."""
+        path = os.path.abspath(file_path)
+        cached = self.loader.is_cached(path)
+        with self._condition:
+            self.requests += 1
+            if cached:
+                self.memory_hits += 1
+            if path not in self._prefetched:
+                return False
+            self._prefetched.discard(path)
+            if cached:
+                self.hits += 1
+                return True
+            # Warmed, then evicted before anyone asked for it
+            self.wasted += 1
+            return False
+
+    def stats(self):
+        """Get request, hit and prefetch counts plus the prefetch hit rate."""
+        with self._condition:
+            return {
+                'requests': self.requests,
+                'hits': self.hits,
+                'hit_rate': self.hits / self.requests if self.requests else 0.0,
+                'memory_hits': self.memory_hits,
+                'prefetched_files': self.prefetched_files,
+                'prefetched_bytes': self.prefetched_bytes,
+                'wasted': self.wasted,
+                'failures': self.failures,
+                'last_error': self.last_error,
+                'pending': len(self._pending)
+            }
+
+    def stop(self):
+        """Stop the prefetch thread after its current file."""
+        with self._condition:
+            self._stopped = True
+            self._pending = []
+            self._condition.notify()
+
+    def _lower_priority(self):
+        """Best effort: raise this thread's nice value (Linux applies it per thread)."""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+    def _next(self, round_state):
+        """Wait for the next key; resets the round budget when a new round starts."""
+        with self._condition:
+            while True:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return None
+                if round_state['generation'] != self._generation:
+                    round_state.update(generation=self._generation, bytes=0, files=0)
+                if round_state['bytes'] < self.max_bytes and round_state['files'] < self.max_files:
+                    return self._pending.pop(0), self._resolve, self._generation
+                # Round budget spent: drop the rest until the next schedule()
+                self._pending = []
+
+    def _record_failure(self, key, error):
+        """Count a failed prefetch; write it to stderr at most once per ERROR_REPORT_INTERVAL."""
+        now = time.monotonic()
+        with self._condition:
+            self.failures += 1
+            self.last_error = (key, str(error))
+            if self._last_report is not None and now - self._last_report < ERROR_REPORT_INTERVAL:
+                return
+            self._last_report = now
+            failures = self.failures
+        print(f"Prefetch of {key} failed: {error} ({failures} failed so far)", file=sys.stderr)
+
+    def _run(self):
+        self._lower_priority()
+        round_state = {'generation': -1, 'bytes': 0, 'files': 0}
+        while True:
+            work = self._next(round_state)
+            if work is None:
+                return
+            key, resolve, generation = work
+
+            start = time.perf_counter()
+            try:
+                path = resolve(key)
+                added = self.loader.warm(path) if path else 0
+            except Exception as e:
+                self._record_failure(key, e)
+                continue
+            elapsed = time.perf_counter() - start
+            if not added:
+                continue
+
+            with self._condition:
+                self._prefetched.add(os.path.abspath(path))
+                self.prefetched_files += 1
+                self.prefetched_bytes += added
+                if generation == round_state['generation']:
+                    round_state['bytes'] += added
+                    round_state['files'] += 1
+                # Stay within the CPU share; only stop() cuts the idle time short
+                idle = elapsed * (1 - self.cpu_share) / self.cpu_share if self.cpu_share < 1 else 0
+                deadline = time.perf_counter() + idle
+                while not self._stopped:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Exact all-in preflop equity of each hand class against a random hand, in class-index order.
+Generated by: python -m data.hand_evaluator
+"""
+
+CLASS_EQUITY_VS_RANDOM = (
+    0.852037, 0.670446, 0.662089, 0.653927, 0.646024, 0.627812, 0.619438, 0.609840, 0.599058, 0.599229, 0.590336, 0.582203, 0.573789,
+    0.653201, 0.823957, 0.634004, 0.625673, 0.617886, 0.599885, 0.583124, 0.575377, 0.566407, 0.557929, 0.548846, 0.540550, 0.532117,
+    0.644318, 0.614558, 0.799252, 0.602592, 0.594676, 0.576643, 0.560177, 0.543023, 0.536126, 0.527694, 0.518553, 0.510192, 0.501690,
+    0.635633, 0.605687, 0.581347, 0.774695, 0.575279, 0.556625, 0.540156, 0.523248, 0.506059, 0.499869, 0.490705, 0.482316, 0.473782,
+    0.627217, 0.597389, 0.572908, 0.552477, 0.750118, 0.540275, 0.523344, 0.506390, 0.489407, 0.472163, 0.465305, 0.456925, 0.448395,
+    0.607728, 0.578119, 0.553604, 0.532512, 0.515317, 0.720573, 0.508008, 0.491177, 0.474283, 0.457219, 0.438620, 0.432643, 0.424152,
+    0.598726, 0.560202, 0.535998, 0.514902, 0.497213, 0.480970, 0.691630, 0.479363, 0.462433, 0.445450, 0.427016, 0.408735, 0.402716,
+    0.588412, 0.551874, 0.517657, 0.496819, 0.479081, 0.462978, 0.450508, 0.662360, 0.453718, 0.436755, 0.418493, 0.400359, 0.381559,
+    0.576825, 0.542233, 0.510241, 0.478443, 0.460920, 0.444913, 0.432409, 0.423227, 0.632847, 0.431334, 0.413333, 0.395336, 0.376690,
+    0.576965, 0.533140, 0.501201, 0.471809, 0.442510, 0.426691, 0.414275, 0.405120, 0.399443, 0.603249, 0.414534, 0.396930, 0.378493,
+    0.567297, 0.523275, 0.491277, 0.461864, 0.435041, 0.406711, 0.394468, 0.385498, 0.380105, 0.381553, 0.570228, 0.386419, 0.368290,
+    0.558446, 0.514257, 0.482194, 0.452755, 0.425946, 0.400195, 0.374838, 0.366023, 0.360776, 0.362648, 0.351459, 0.536931, 0.359844,
+    0.549286, 0.505087, 0.472954, 0.443485, 0.416684, 0.390979, 0.368277, 0.345836, 0.340751, 0.342846, 0.331998, 0.323032, 0.503340,
+)
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Parallel bulk preload of a solution library.
+Parses every solution file across a process pool into one compact float32 range matrix.
+
+Usage: python -m data.preload <solutions folder> [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from .hand_range import Range, NUM_COMBOS
+from .scan_index import ScanIndex
+
+# Range slots reserved per file in the shared block
+RANGE_SLOTS = ('range', 'oop_range', 'ip_range')
+
+_worker_state = {}
+
+
+class PreloadResult:
+    """Ranges of a preloaded library: one row per range plus a per-file row index."""
+
+    def __init__(self, folder, paths, ranges, rows, game_info, trees, errors, elapsed, combos):
+        self.folder = folder
+        self.paths = paths
+        # float32 (n_ranges, 1326) matrix
+        self.ranges = ranges
+        # relative path -> {range name: row in self.ranges}
+        self.rows = rows
+        self.game_info = game_info
+        # relative path -> {node name: node body}, as parse_solution_content keeps them
+        self.trees = trees
+        self.errors = errors
+        self.elapsed = elapsed
+        self.combos = combos
+
+    def solution(self, relative_path):
+        """Get a solution dict for a preloaded file; ranges are views into the matrix."""
+        solution = {'game_info': self.game_info.get(relative_path, {}),
+                    'decision_tree': dict(self.trees.get(relative_path, {}))}
+        for name in RANGE_SLOTS:
+            solution[name] = Range()
+        for name, row in self.rows[relative_path].items():
+            solution[name] = Range(self.ranges[row])
+        return solution
+
+    def summary(self):
+        """Get file, range and throughput figures."""
+        elapsed = max(self.elapsed, 1e-9)
+        return {
+            'files': len(self.paths),
+            'ranges': len(self.ranges),
+            'errors': len(self.errors),
+            'combos': self.combos,
+            'seconds': self.elapsed,
+            'files_per_second': len(self.paths) / elapsed,
+            'combos_per_second': self.combos / elapsed,
+            'resident_bytes': self.ranges.nbytes
+        }
+
+
+def _attach_worker(shm_name, slot_count):
+    """Process pool initializer: map the shared range block once per worker."""
+    from .solution_loader import SolutionLoader
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state['shm'] = shm
+    _worker_state['block'] = np.ndarray((slot_count, NUM_COMBOS), dtype=np.float32, buffer=shm.buf)
+    _worker_state['loader'] = SolutionLoader(memory_budget=0)
+
+
+def _load_chunk(folder, chunk):
+    """Parse a chunk of (file_number, relative_path) into the shared block; returns metadata and tree node texts."""
+    block = _worker_state['block']
+    loader = _worker_state['loader']
+    results = []
+    for file_number, relative_path in chunk:
+        try:
+            solution = loader.load_solution(os.path.join(folder, relative_path))
+        except Exception as e:
+            results.append((file_number, None, None, None, 0, str(e)))
+            continue
+
+        present = []
+        combos = 0
+        for slot, name in enumerate(RANGE_SLOTS):
+            value = solution.get(name)
+            if value:
+                block[file_number * len(RANGE_SLOTS) + slot] = value.frequencies
+                present.append(slot)
+                combos += value.combo_count
+        results.append((file_number, present, solution.get('game_info', {}),
+                        solution.get('decision_tree', {}), combos, None))
+    return results
+
+
+def preload(folder, workers=None, progress=None, chunk_size=None, paths=None):
+    """
+    Parse every solution file under folder across a process pool.
+
+    paths, if given, limits the work to those paths relative to folder.
+    progress, if given, is called as progress(done, total, elapsed, combos)
+    after each finished chunk. Returns a PreloadResult.
+    """
+    start = time.perf_counter()
+    folder = os.path.abspath(folder)
+    workers = workers or os.cpu_count() or 1
+
+    if paths is None:
+        index = ScanIndex(folder)
+        index.refresh()
+        index.save()
+        paths = list(index.solution_files())
+    else:
+        paths = list(paths)
+    total = len(paths)
+
+    slot_count = max(total * len(RANGE_SLOTS), 1)
+    shm = shared_memory.SharedMemory(create=True, size=slot_count * NUM_COMBOS * 4)
+    try:
+        block = np.ndarray((slot_count, NUM_COMBOS), dtype=np.float32, buffer=shm.buf)
+        block[:] = 0
+
+        numbered = list(enumerate(paths))
+        if chunk_size is None:
+            # Several chunks per worker keeps the pool balanced when file sizes differ
+            chunk_size = max(1, min(256, total // (workers * 8) or 1))
+        chunks = [numbered[i:i + chunk_size] for i in range(0, total, chunk_size)]
+
+        present = {}
+        game_info = {}
+        trees = {}
+        errors = {}
+        combos = 0
+        done = 0
+
+        def collect(results):
+            nonlocal combos, done
+            for file_number, slots, info, tree, file_combos, error in results:
+                relative_path = paths[file_number]
+                if error is not None:
+                    errors[relative_path] = error
+                    continue
+                present[file_number] = slots
+                game_info[relative_path] = info
+                trees[relative_path] = tree
+                combos += file_combos
+            done += len(results)
+            if progress is not None:
+                progress(done, total, time.perf_counter() - start, combos)
+
+        if workers == 1:
+            _attach_worker(shm.name, slot_count)
+            try:
+                for chunk in chunks:
+                    collect(_load_chunk(folder, chunk))
+            finally:
+                # Drop the array view before closing the mapping it points into
+                worker_shm = _worker_state.pop('shm')
+                _worker_state.clear()
+                worker_shm.close()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                     initargs=(shm.name, slot_count)) as pool:
+                futures = [pool.submit(_load_chunk, folder, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    collect(future.result())
+
+        # Compact the fixed slots down to the ranges that were actually present
+        rows = {}
+        selected = []
+        for file_number in sorted(present):
+            file_rows = {}
+            for slot in present[file_number]:
+                file_rows[RANGE_SLOTS[slot]] = len(selected)
+                selected.append(file_number * len(RANGE_SLOTS) + slot)
+            rows[paths[file_number]] = file_rows
+        ranges = block[np.array(selected, dtype=np.int64)] if selected else np.zeros((0, NUM_COMBOS), dtype=np.float32)
+        del block
+    finally:
+        shm.close()
+        shm.unlink()
+
+    ranges.setflags(write=False)
+    loaded = [path for path in paths if path in rows]
+    return PreloadResult(folder, loaded, ranges, rows, game_info, trees, errors,
+                         time.perf_counter() - start, combos)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parse a whole solution library into memory.")
+    arg_parser.add_argument('folder', help="solutions folder to preload")
+    arg_parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = arg_parser.parse_args()
+
+    def report(done, total, elapsed, combos):
+        elapsed = max(elapsed, 1e-9)
+        sys.stdout.write(f"\r{done}/{total} files  {done / elapsed:,.0f} files/s  {combos / elapsed:,.0f} combos/s")
+        sys.stdout.flush()
+
+    result = preload(args.folder, workers=args.workers, progress=report)
+    summary = result.summary()
+    print(f"\nPreloaded {summary['files']} files ({summary['ranges']} ranges, "
+          f"{summary['resident_bytes'] / 1e6:.1f} MB) in {summary['seconds']:.2f}s: "
+          f"{summary['files_per_second']:,.0f} files/s, {summary['combos_per_second']:,.0f} combos/s")
+    for path, error in sorted(result.errors.items()):
+        print(f"Error loading {path}: {error}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Content-addressed interning of parsed ranges.
+Identical range lines (or vectors) across a library map to one shared, read-only
+Range, so a preflop range repeated in every board file is parsed and held once.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from .hand_range import Range
+
+# Distinct ranges kept by default (about 5 KB each)
+DEFAULT_MAX_RANGES = 4096
+
+
+def range_digest(data):
+    """Hash range text or a frequency vector's bytes."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class RangeInterner:
+    """Thread-safe LRU table of shared Ranges keyed by the hash of their text or frequencies."""
+
+    def __init__(self, max_ranges=DEFAULT_MAX_RANGES):
+        self.max_ranges = max_ranges
+        self._ranges = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def _get(self, key, count=True):
+        with self._lock:
+            range_data = self._ranges.get(key)
+            if range_data is not None:
+                self._ranges.move_to_end(key)
+            if count:
+                self.lookups += 1
+                self.hits += range_data is not None
+            return range_data
+
+    def _put(self, key, range_data):
+        if range_data.frequencies.flags.writeable:
+            range_data.frequencies.setflags(write=False)
+        with self._lock:
+            # Another thread may have added it meanwhile; keep the first so sharing holds
+            range_data = self._ranges.setdefault(key, range_data)
+            self._ranges.move_to_end(key)
+            while len(self._ranges) > self.max_ranges:
+                self._ranges.popitem(last=False)
+        return range_data
+
+    def _shared(self, range_data, count):
+        key = b'v' + range_digest(range_data.frequencies.tobytes())
+        shared = self._get(key, count)
+        if shared is None:
+            if not range_data.frequencies.flags.c_contiguous:
+                range_data = Range(range_data.frequencies.copy())
+            shared = self._put(key, range_data)
+        return shared
+
+    def intern_text(self, text, parse):
+        """Get the shared Range for a range line, calling parse(text) only the first time it is seen."""
+        key = b't' + range_digest(text)
+        range_data = self._get(key)
+        if range_data is None:
+            # Differently written lines can still parse to a vector that is already held
+            range_data = self._put(key, self._shared(parse(text), count=False))
+        return range_data
+
+    def intern_range(self, range_data):
+        """Get the shared Range with the same frequencies as range_data (which becomes it if new)."""
+        return self._shared(range_data, count=True)
+
+    def intern_solution(self, solution):
+        """Replace every Range in a solution dict by its shared instance; returns the dict."""
+        for key, value in solution.items():
+            if isinstance(value, Range):
+                solution[key] = self.intern_range(value)
+        return solution
+
+    def clear(self):
+        with self._lock:
+            self._ranges.clear()
+
+    def stats(self):
+        """Get lookups, hits, distinct ranges held and the dedup ratio (lookups per distinct range)."""
+        with self._lock:
+            distinct = self.lookups - self.hits
+            return {
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'resident': len(self._ranges),
+                'dedup_ratio': self.lookups / distinct if distinct else 0.0
+            }
\ No newline at end of file
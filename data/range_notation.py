@@ -0,0 +1,347 @@
+"""
+Shorthand range notation, e.g. "AA-TT, AKs-ATs:0.5, KQo, AcKd:0.25".
+
+Terms are separated by commas (or spaces) and may end in ":<weight>" (a 0-1 frequency
+or a percentage like ":50%"). Later terms overwrite earlier ones, so "AK, AhKh:0" is
+every AK combo except AhKh. Supported terms:
+    AA  TT+  AA-TT           pairs
+    AKs  AKo  AK             suited, offsuit, or both
+    ATs+  AT+  AKo-ATo       a fixed high card with a run of kickers
+    87s-54s                  connectors or gappers running down together
+    AcKd                     one specific combo
+
+Usage: python -m data.range_notation "AA-TT, AKs-ATs:0.5"       (expand to per-combo tokens)
+       python -m data.range_notation --export "<AcKd_0.5 ... range line>"
+"""
+
+import argparse
+import re
+from collections import OrderedDict
+import numpy as np
+from .hand_range import (
+    Range, as_range, RANKS, NUM_COMBOS, NUM_CLASSES, COMBO_CLASS, CLASS_INDEX, HAND_CLASSES,
+    combo_index, combo_string
+)
+
+# Compiled expressions kept by default
+DEFAULT_CACHE_SIZE = 1024
+
+_SEPARATORS = re.compile(r'[\s,;]+')
+_CLASS_TERM = re.compile(r'^([2-9TJQKA])([2-9TJQKA])([so]?)(\+?)$')
+_RUN_TERM = re.compile(r'^([2-9TJQKA])([2-9TJQKA])([so]?)-([2-9TJQKA])([2-9TJQKA])([so]?)$')
+_COMBO_TERM = re.compile(r'^[2-9TJQKA][cdhs][2-9TJQKA][cdhs]$')
+
+# Combo indexes of each hand class, and all combos grouped by class for reduceat
+CLASS_COMBOS = [np.flatnonzero(COMBO_CLASS == index) for index in range(NUM_CLASSES)]
+_CLASS_ORDER = np.concatenate(CLASS_COMBOS)
+_CLASS_STARTS = np.cumsum([0] + [len(combos) for combos in CLASS_COMBOS[:-1]])
+
+
+def class_name(high, low, suffix=''):
+    """Get a class name from rank numbers (0 = '2' ... 12 = 'A'), e.g. (12, 11, 's') -> 'AKs'."""
+    if high == low:
+        return RANKS[high] * 2
+    if high < low:
+        high, low = low, high
+    return f"{RANKS[high]}{RANKS[low]}{suffix}"
+
+
+def format_weight(weight):
+    """Write a frequency with the fewest digits that still read back as the same float32."""
+    return np.format_float_positional(np.float32(weight), trim='-')
+
+
+def parse_weight(text):
+    if text.endswith('%'):
+        return float(text[:-1]) / 100
+    return float(text)
+
+
+def _classes(high, low, suffix):
+    """Get the class indexes of one rank pair; a missing suffix means both suited and offsuit."""
+    if high == low:
+        return [CLASS_INDEX[class_name(high, low)]]
+    suffixes = [suffix] if suffix else ['s', 'o']
+    return [CLASS_INDEX[class_name(high, low, s)] for s in suffixes]
+
+
+def term_classes(term):
+    """Get the class indexes a class or run term covers, or None if it is not one."""
+    match = _CLASS_TERM.match(term)
+    if match:
+        high, low = RANKS.index(match.group(1)), RANKS.index(match.group(2))
+        suffix, plus = match.group(3), match.group(4)
+        if high == low and suffix:
+            return None
+        high, low = max(high, low), min(high, low)
+        if not plus:
+            return _classes(high, low, suffix)
+        if high == low:
+            # TT+ is every pair from TT up
+            return [index for rank in range(low, len(RANKS)) for index in _classes(rank, rank, '')]
+        # ATs+ raises the kicker up to just below the high card
+        return [index for kicker in range(low, high) for index in _classes(high, kicker, suffix)]
+
+    match = _RUN_TERM.match(term)
+    if match:
+        first = sorted((RANKS.index(match.group(1)), RANKS.index(match.group(2))), reverse=True)
+        last = sorted((RANKS.index(match.group(4)), RANKS.index(match.group(5))), reverse=True)
+        suffix = match.group(3)
+        if suffix != match.group(6):
+            return None
+        if first[0] == first[1] and last[0] == last[1] and not suffix:
+            # AA-TT: a run of pairs
+            top, bottom = max(first[0], last[0]), min(first[0], last[0])
+            return [index for rank in range(bottom, top + 1) for index in _classes(rank, rank, '')]
+        if first[0] == last[0] and first[0] not in (first[1], last[1]):
+            # AKs-ATs: the high card stays and the kicker runs
+            top, bottom = max(first[1], last[1]), min(first[1], last[1])
+            return [index for kicker in range(bottom, top + 1) for index in _classes(first[0], kicker, suffix)]
+        gap = first[0] - first[1]
+        if gap > 0 and last[0] - last[1] == gap:
+            # 87s-54s: both cards run down together with the same gap
+            top, bottom = max(first[1], last[1]), min(first[1], last[1])
+            return [index for low in range(bottom, top + 1) for index in _classes(low + gap, low, suffix)]
+    return None
+
+
+def _runs(values):
+    """Split sorted integers into runs of consecutive values, highest run first."""
+    runs = []
+    for value in sorted(values, reverse=True):
+        if runs and runs[-1][-1] == value + 1:
+            runs[-1].append(value)
+        else:
+            runs.append([value])
+    return runs
+
+
+def _pair_terms(ranks):
+    terms = []
+    for run in _runs(ranks):
+        if len(run) == 1:
+            terms.append(class_name(run[0], run[0]))
+        elif run[0] == len(RANKS) - 1:
+            terms.append(class_name(run[-1], run[-1]) + '+')
+        else:
+            terms.append(f"{class_name(run[0], run[0])}-{class_name(run[-1], run[-1])}")
+    return terms
+
+
+def _kicker_terms(high, kickers, suffix):
+    terms = []
+    for run in _runs(kickers):
+        if len(run) == 1:
+            terms.append(class_name(high, run[0], suffix))
+        elif run[0] == high - 1:
+            terms.append(class_name(high, run[-1], suffix) + '+')
+        else:
+            terms.append(f"{class_name(high, run[0], suffix)}-{class_name(high, run[-1], suffix)}")
+    return terms
+
+
+def _straight_terms(names):
+    """Write class names as pair runs plus kicker runs under each high card."""
+    terms = _pair_terms([rank for rank in range(len(RANKS)) if class_name(rank, rank) in names])
+    for high in range(len(RANKS) - 1, 0, -1):
+        suited = {low for low in range(high) if class_name(high, low, 's') in names}
+        offsuit = {low for low in range(high) if class_name(high, low, 'o') in names}
+        if not suited and not offsuit:
+            continue
+        separate = _kicker_terms(high, suited, 's') + _kicker_terms(high, offsuit, 'o')
+        # Kickers held both suited and offsuit can share one term without a suffix
+        both = suited & offsuit
+        combined = (_kicker_terms(high, both, '') + _kicker_terms(high, suited - both, 's')
+                    + _kicker_terms(high, offsuit - both, 'o'))
+        terms += min((separate, combined), key=_cost)
+    return terms
+
+
+def _cost(terms):
+    return len(', '.join(terms)), len(terms)
+
+
+def _build_diagonals():
+    """List the classes along each (suffix, gap) diagonal, highest first: ('s', 1) is AKs, KQs, ... 32s."""
+    diagonals = []
+    for suffix in ('s', 'o', ''):
+        for gap in range(1, len(RANKS) - 1):
+            steps = [(low, frozenset(class_name(low + gap, low, s) for s in (suffix or 'so')))
+                     for low in range(len(RANKS) - 1 - gap, -1, -1)]
+            diagonals.append((suffix, gap, steps))
+    return diagonals
+
+
+_DIAGONALS = _build_diagonals()
+
+
+def _diagonal_runs(names):
+    """Get every maximal run like 87s, 76s, 65s (same suffix and gap) as (term, names) pairs."""
+    runs = []
+    for suffix, gap, steps in _DIAGONALS:
+        run = []
+        for low, classes in steps + [(None, None)]:
+            if classes is not None and classes <= names:
+                run.append((low, classes))
+                continue
+            if len(run) >= 3:
+                first, last = run[0][0], run[-1][0]
+                term = f"{class_name(first + gap, first, suffix)}-{class_name(last + gap, last, suffix)}"
+                runs.append((term, frozenset().union(*(covered for _, covered in run))))
+            run = []
+    return runs
+
+
+def compress_classes(classes):
+    """Write a set of class indexes as the shortest run terms, e.g. {AA, KK, QQ, AKs} -> ['QQ+', 'AKs']."""
+    names = {HAND_CLASSES[index] for index in classes}
+    diagonal = []
+    terms = _straight_terms(names)
+    # Greedily pull out connector runs (87s-54s) while that shortens the result
+    while True:
+        best = None
+        for term, covered in _diagonal_runs(names):
+            option = _straight_terms(names - covered)
+            if _cost(diagonal + [term] + option) < _cost(diagonal + terms):
+                if best is None or _cost([term] + option) < _cost([best[0]] + best[2]):
+                    best = (term, covered, option)
+        if best is None:
+            return terms + diagonal
+        diagonal.append(best[0])
+        names = names - best[1]
+        terms = best[2]
+
+
+class RangeNotation:
+    """Compiles shorthand into Range vectors (memoized) and exports Ranges as shorthand."""
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._term_combos = {}
+        self.hits = 0
+        self.misses = 0
+
+    def term_combos(self, term):
+        """Get the combo indexes of one term without its weight (cached)."""
+        combos = self._term_combos.get(term)
+        if combos is None:
+            if _COMBO_TERM.match(term):
+                index = combo_index(term)
+                if index < 0:
+                    raise ValueError(f"Invalid combo in range notation: {term!r}")
+                combos = np.array([index])
+            else:
+                classes = term_classes(term)
+                if classes is None:
+                    raise ValueError(f"Invalid range notation term: {term!r}")
+                combos = np.concatenate([CLASS_COMBOS[index] for index in classes])
+            combos.setflags(write=False)
+            self._term_combos[term] = combos
+        return combos
+
+    def compile_frequencies(self, text):
+        """Get the read-only (1326,) frequency vector of an expression; repeated expressions come from the cache."""
+        key = text.strip()
+        frequencies = self._cache.get(key)
+        if frequencies is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return frequencies
+
+        self.misses += 1
+        frequencies = np.zeros(NUM_COMBOS, dtype=np.float32)
+        for token in _SEPARATORS.split(key):
+            if not token:
+                continue
+            term, _, weight = token.partition(':')
+            try:
+                value = parse_weight(weight) if weight else 1.0
+            except ValueError:
+                raise ValueError(f"Invalid weight in range notation: {token!r}")
+            frequencies[self.term_combos(term)] = value
+        frequencies.setflags(write=False)
+
+        if self.cache_size:
+            self._cache[key] = frequencies
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return frequencies
+
+    def compile(self, text):
+        """Compile an expression into a new Range."""
+        return Range(self.compile_frequencies(text).copy())
+
+    def export(self, range_data):
+        """
+        Write a Range (or legacy class dict) as the shortest shorthand that compiles back to it exactly.
+
+        Each class is written at the frequency most of its combos share, with the other
+        combos overwritten individually; classes sharing a frequency are merged into runs.
+        """
+        frequencies = as_range(range_data).frequencies
+        class_groups = {}
+        overrides = {}
+        by_class = frequencies[_CLASS_ORDER]
+        lowest = np.minimum.reduceat(by_class, _CLASS_STARTS)
+        highest = np.maximum.reduceat(by_class, _CLASS_STARTS)
+        # Classes played at one frequency throughout need no per-combo work
+        uniform = lowest == highest
+        for index in np.flatnonzero(uniform & (lowest != 0)):
+            class_groups.setdefault(float(lowest[index]), []).append(int(index))
+
+        for index in np.flatnonzero(~uniform):
+            combos = CLASS_COMBOS[index]
+            values = frequencies[combos]
+            distinct, counts = np.unique(values, return_counts=True)
+            modal = distinct[np.argmax(counts)]
+            # Writing the class costs one term plus its exceptions; leaving it out costs every played combo
+            if modal != 0 and 1 + np.count_nonzero(values != modal) < np.count_nonzero(values):
+                base = modal
+                class_groups.setdefault(float(base), []).append(int(index))
+            else:
+                base = np.float32(0)
+            for combo, value in zip(combos, values):
+                if value != base:
+                    overrides.setdefault(float(value), []).append(int(combo))
+
+        terms = []
+        for weight in sorted(class_groups, reverse=True):
+            suffix = '' if weight == 1 else f":{format_weight(weight)}"
+            terms += [term + suffix for term in compress_classes(class_groups[weight])]
+        for weight in sorted(overrides, reverse=True):
+            suffix = '' if weight == 1 else f":{format_weight(weight)}"
+            terms += [combo_string(combo) + suffix for combo in sorted(overrides[weight], reverse=True)]
+        return ', '.join(terms)
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'max_size': self.cache_size}
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+# The process-wide compiler and shortcuts to it
+notation = RangeNotation()
+compile_range = notation.compile
+export_range = notation.export
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Convert between shorthand ranges and combo range lines.")
+    arg_parser.add_argument('text', help="a shorthand expression, or a range line with --export")
+    arg_parser.add_argument('--export', action='store_true', help="write a combo range line as shorthand")
+    args = arg_parser.parse_args()
+
+    if args.export:
+        from .range_parser import RangeParser
+        print(export_range(RangeParser(strict=True).parse_range_line(args.text)))
+    else:
+        frequencies = notation.compile_frequencies(args.text)
+        print(' '.join(f"{combo_string(combo)}_{format_weight(frequencies[combo])}"
+                       for combo in np.flatnonzero(frequencies)))
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -3,43 +3,119 @@ Range parser for processing preflop range data.
 Handles parsing of hand ranges and calculating statistics.
 """
 
-import re
+import numpy as np
+from .hand_range import (
+    Range, as_range, NUM_COMBOS, COMBO_TOKENS, COMBO_CLASS, CLASS_INDEX,
+    COMBO_IS_PAIR, COMBO_IS_SUITED, COMBO_IS_OFFSUIT
+)
+from .range_tokenizer import tokenize_range_line
+from .range_notation import notation
+from .equity_table import EQUITY_DIR, load_equity_table
+from .hand_evaluator import class_equity_vs_random
+from .card_removal import dead_combo_mask
+from .tracing import tracer
+
+# Rank values used to order the two cards of a hand
+RANK_ORDER = {'A': 14, 'K': 13, 'Q': 12, 'J': 11, 'T': 10, '9': 9, '8': 8, 
+              '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2}
+
+# Exact equity vs a random hand needed for each strength category (77 is 0.662, AKo 0.653)
+PREMIUM_EQUITY = 0.65
+STRONG_EQUITY = 0.58
 
 class RangeParser:
-    def __init__(self):
-        # Define hand rankings for strength categorization
-        self.premium_hands = {
-            'AA', 'KK', 'QQ', 'JJ', 'TT', 'AKs', 'AQs', 'AJs', 'KQs', 'AKo'
-        }
-        self.strong_hands = {
-            '99', '88', '77', 'ATs', 'A9s', 'A8s', 'KJs', 'KTs', 'QJs', 'QTs', 
-            'JTs', 'T9s', '98s', 'AQo', 'AJo', 'ATo', 'KQo', 'KJo', 'QJo'
-        }
+    def __init__(self, strict=False, equity_dir=EQUITY_DIR):
+        # Strict parsing raises on malformed tokens, lenient parsing skips them
+        self.strict = strict
+        self.equity_dir = equity_dir
+        
+        # Strength categories come from each class's all-in equity against a random hand
+        self.premium_equity = PREMIUM_EQUITY
+        self.strong_equity = STRONG_EQUITY
+        self._strength_masks = None
+    
+    def class_equities(self):
+        """Get the exact 169 class equities against a random hand."""
+        return class_equity_vs_random()
+    
+    def equity_table(self):
+        """Get the precomputed preflop equity table, or None if it has not been built."""
+        return load_equity_table(self.equity_dir)
+    
+    def hand_equity(self, hand, villain_range=None, dead_cards=None):
+        """Get the equity of a combo ('AcKd') or class ('AKs') against a range (None = random hand)."""
+        table = self.equity_table()
+        if table is None:
+            return None
+        return table.hand_vs_range(hand, villain_range, dead_cards)
+    
+    def range_equity(self, hero_range, villain_range=None, dead_cards=None):
+        """Get a range's equity against another range (None = random hand), with card removal."""
+        table = self.equity_table()
+        if table is None:
+            return None
+        return table.range_vs_range(hero_range, villain_range, dead_cards)
+    
+    def strength_masks(self):
+        """Get (premium_mask, strong_mask) combo masks from the equity thresholds."""
+        if self._strength_masks is None:
+            combo_equity = self.class_equities()[COMBO_CLASS]
+            premium = combo_equity >= self.premium_equity
+            strong = (combo_equity >= self.strong_equity) & ~premium
+            self._strength_masks = (premium, strong)
+        return self._strength_masks
+    
+    def set_strength_masks(self, masks):
+        """Use precomputed (premium_mask, strong_mask) combo masks, e.g. another parser's strength_masks()."""
+        premium, strong = masks
+        self._strength_masks = (np.asarray(premium, dtype=bool), np.asarray(strong, dtype=bool))
     
-    def parse_range_line(self, line):
-        """Parse a range line into hand-frequency pairs."""
-        range_dict = {}
+    def parse_range_line(self, line, strict=None):
+        """Parse a range line into a Range with one frequency per combo."""
+        if strict is None:
+            strict = self.strict
+        range_data = Range()
         
-        if not line.strip():
-            return range_dict
+        if not line or line.isspace():
+            return range_data
             
-        # Split the line into hand_frequency pairs
-        parts = line.split()
+        # Fast path: every token is mapped to its combo index in one vectorized pass
+        combos, frequencies, valid, spans = tokenize_range_line(line)
         
-        for part in parts:
-            if '_' in part:
-                # Format: hand_frequency (e.g., "2s2h_1", "Ac5c_0.75")
-                hand, freq_str = part.rsplit('_', 1)
-                try:
-                    frequency = float(freq_str)
-                    # Convert specific hands to generic format
-                    generic_hand = self.convert_to_generic_hand(hand)
-                    if generic_hand:
-                        range_dict[generic_hand] = frequency
-                except ValueError:
+        if not valid.all():
+            # Retry the tokens the fast path rejected (e.g. exponent notation) one by one
+            for position in np.flatnonzero(~valid):
+                start, end = spans[position]
+                token = line[start:end]
+                parsed = self.parse_range_token(token)
+                if parsed is None:
+                    if strict:
+                        raise ValueError(f"Malformed range token: {token!r}")
                     continue
-                    
-        return range_dict
+                combos[position], frequencies[position] = parsed
+                valid[position] = True
+            combos, frequencies = combos[valid], frequencies[valid]
+            
+        range_data.frequencies[combos] = frequencies
+        return range_data
+    
+    def parse_range_token(self, token):
+        """Parse a single 'AcKd_0.50' token into (combo_index, frequency), or None if malformed."""
+        index = COMBO_TOKENS.get(token[:5])
+        if index is None:
+            return None
+        try:
+            return index, float(token[5:])
+        except ValueError:
+            return None
+    
+    def parse_range_notation(self, text):
+        """Compile shorthand like 'AA-TT, AKs-ATs:0.5, KQo' into a Range."""
+        return notation.compile(text)
+    
+    def format_range_notation(self, range_data):
+        """Write a range as the shortest shorthand that compiles back to it."""
+        return notation.export(range_data)
     
     def convert_to_generic_hand(self, specific_hand):
         """Convert specific hands like 'AcKd' to generic format like 'AKo'."""
@@ -48,12 +124,8 @@ class RangeParser:
             
         rank1, suit1, rank2, suit2 = specific_hand[0], specific_hand[1], specific_hand[2], specific_hand[3]
         
-        # Convert T to 10 for sorting, then back
-        rank_order = {'A': 14, 'K': 13, 'Q': 12, 'J': 11, 'T': 10, '9': 9, '8': 8, 
-                      '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2}
-        
         # Ensure higher rank comes first
-        if rank_order.get(rank1, 0) < rank_order.get(rank2, 0):
+        if RANK_ORDER.get(rank1, 0) < RANK_ORDER.get(rank2, 0):
             rank1, rank2 = rank2, rank1
             
         if rank1 == rank2:
@@ -63,53 +135,40 @@ class RangeParser:
         else:
             return f"{rank1}{rank2}o"  # Offsuit
     
-    def calculate_range_statistics(self, range_data):
-        """Calculate statistics for a given range."""
+    def calculate_range_statistics(self, range_data, dead_cards=None):
+        """
+        Calculate statistics for a given range.
+        
+        dead_cards (e.g. a known board or exposed cards, 'AcKd7h') removes every
+        combo holding one of them before anything is counted.
+        """
+        range_data = as_range(range_data)
         if not range_data:
             return self.get_empty_stats()
             
-        total_combos = 0
-        played_combos = 0
-        
-        # Hand category counters
-        pairs = 0
-        suited = 0
-        offsuit = 0
+        freqs = range_data.frequencies
+        dead_mask = dead_combo_mask(dead_cards)
+        blocked_combos = float(freqs[dead_mask].sum())
+        if blocked_combos:
+            freqs = np.where(dead_mask, 0, freqs).astype(np.float32)
+        played = freqs > 0
         
-        # Strength categories
-        premium = 0
-        strong = 0
-        marginal = 0
+        total_combos = np.count_nonzero(played)
+        played_combos = float(freqs.sum(dtype=np.float64))
         
-        for hand, frequency in range_data.items():
-            if frequency <= 0:
-                continue
-                
-            # Count combos (simplified - assumes each hand represents standard combos)
-            hand_combos = self.get_hand_combos(hand)
-            total_combos += hand_combos
-            played_combos += hand_combos * frequency
-            
-            # Categorize hand types
-            if self.is_pocket_pair(hand):
-                pairs += hand_combos * frequency
-            elif self.is_suited(hand):
-                suited += hand_combos * frequency
-            else:
-                offsuit += hand_combos * frequency
-                
-            # Categorize by strength
-            strength = self.get_hand_strength(hand)
-            if strength == 'premium':
-                premium += hand_combos * frequency
-            elif strength == 'strong':
-                strong += hand_combos * frequency
-            else:
-                marginal += hand_combos * frequency
+        # Hand category and strength sums as masked reductions over the combo vector
+        pairs = float(freqs[COMBO_IS_PAIR].sum())
+        suited = float(freqs[COMBO_IS_SUITED].sum())
+        offsuit = float(freqs[COMBO_IS_OFFSUIT].sum())
+        premium_mask, strong_mask = self.strength_masks()
+        premium = float(freqs[premium_mask].sum())
+        strong = float(freqs[strong_mask].sum())
+        marginal = played_combos - premium - strong
+        equity = self.range_equity(Range(freqs), dead_cards=dead_cards) if played_combos > 0 else None
         
         # Calculate percentages
-        total_possible = 1326  # Total poker hand combinations
-        vpip = (played_combos / total_possible) * 100 if total_possible > 0 else 0
+        total_possible = NUM_COMBOS - int(np.count_nonzero(dead_mask))  # Live poker hand combinations
+        vpip = (played_combos / total_possible) * 100
         
         if played_combos > 0:
             pairs_pct = (pairs / played_combos) * 100
@@ -131,7 +190,9 @@ class RangeParser:
             'offsuit': offsuit_pct,
             'premium': premium_pct,
             'strong': strong_pct,
-            'marginal': marginal_pct
+            'marginal': marginal_pct,
+            'blocked_combos': blocked_combos,
+            'equity': equity * 100 if equity is not None else None
         }
     
     def get_hand_combos(self, hand):
@@ -151,10 +212,12 @@ class RangeParser:
     
     def get_hand_strength(self, hand):
         """Categorize hand strength."""
-        base_hand = hand.rstrip('so')  # Remove suit indicators
-        if hand in self.premium_hands:
+        if hand not in CLASS_INDEX:
+            return 'marginal'
+        equity = self.class_equities()[CLASS_INDEX[hand]]
+        if equity >= self.premium_equity:
             return 'premium'
-        elif hand in self.strong_hands:
+        elif equity >= self.strong_equity:
             return 'strong'
         else:
             return 'marginal'
@@ -170,7 +233,9 @@ class RangeParser:
             'offsuit': 0,
             'premium': 0,
             'strong': 0,
-            'marginal': 0
+            'marginal': 0,
+            'blocked_combos': 0,
+            'equity': None
         }
 
     # Utility functions for the range grid
@@ -210,4 +275,7 @@ class RangeParser:
         elif frequency > 0:
             return "#FFB6C1"  # Light pink for very rarely
         else:
-            return "#FFFFFF"  # White for never
\ No newline at end of file
+            return "#FFFFFF"  # White for never
+
+# Spans for the tracing layer (wrapped only while tracing is enabled)
+tracer.register(RangeParser, 'parse_range_line', 'calculate_range_statistics')
\ No newline at end of file
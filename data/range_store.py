@@ -0,0 +1,438 @@
+"""
+Columnar in-memory store of every range in a solution library.
+One float32 row of 1326 combo frequencies per range, plus metadata columns, for vectorized
+filter / group-by / aggregate queries across scenarios. Persists to a directory and grows by append.
+
+Usage: python -m data.range_store build <solutions folder> [--workers N]
+       python -m data.range_store info <store directory>
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from .hand_range import (
+    NUM_COMBOS, NUM_CLASSES, COMBO_CLASS, CLASS_COMBO_COUNTS, CLASS_INDEX, combo_index
+)
+from .preload import preload
+from .scan_index import ScanIndex, path_to_key
+from .scenario_registry import ScenarioRegistry
+
+STORE_SUFFIX = '.range-store'
+STORE_VERSION = 1
+
+# Categorical metadata columns, stored as int32 codes into a per-column category list
+CATEGORY_COLUMNS = ('path', 'game', 'position', 'facing', 'sizing', 'board', 'scenario', 'slot')
+# Numeric metadata columns
+NUMERIC_COLUMNS = {'stack': np.float32, 'mtime_ns': np.int64, 'played': np.float32}
+
+# Class averaging matrix: combos @ CLASS_AVERAGE gives the 169 class frequencies
+CLASS_AVERAGE = np.zeros((NUM_COMBOS, NUM_CLASSES), dtype=np.float32)
+CLASS_AVERAGE[np.arange(NUM_COMBOS), COMBO_CLASS] = 1 / CLASS_COMBO_COUNTS[COMBO_CLASS]
+
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+# Rows converted to class frequencies per matrix product
+_CLASS_BATCH_ROWS = 8192
+
+
+def default_store_path(folder):
+    """Get the store directory kept beside a solutions folder."""
+    return os.path.abspath(folder).rstrip(os.sep) + STORE_SUFFIX
+
+
+def class_matrix(combos):
+    """Get the (n, 169) class frequencies of an (n, 1326) combo matrix."""
+    result = np.empty((len(combos), NUM_CLASSES), dtype=np.float32)
+    for start in range(0, len(combos), _CLASS_BATCH_ROWS):
+        result[start:start + _CLASS_BATCH_ROWS] = combos[start:start + _CLASS_BATCH_ROWS] @ CLASS_AVERAGE
+    return result
+
+
+class RangeStore:
+    """
+    Every range of a library as columns.
+
+    combos is the (n, 1326) frequency matrix and classes its (n, 169) class
+    average. Metadata is one value per row: categorical columns hold codes
+    into self.categories, numeric ones hold values. Queries return boolean
+    masks or per-row vectors that combine with numpy operators, e.g.
+
+        store.records(store.select(slot='range') & (store.hand_frequency('A5s') > 0.5))
+        store.group_by(['position', 'stack'], store.vpip(), 'mean', store.select(facing='open'))
+    """
+
+    def __init__(self):
+        self.combos = np.zeros((0, NUM_COMBOS), dtype=np.float32)
+        self.classes = np.zeros((0, NUM_CLASSES), dtype=np.float32)
+        self.codes = {name: np.zeros(0, dtype=np.int32) for name in CATEGORY_COLUMNS}
+        self.categories = {name: [] for name in CATEGORY_COLUMNS}
+        self._category_codes = {name: {} for name in CATEGORY_COLUMNS}
+        self.numeric = {name: np.zeros(0, dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+        # Spare-capacity buffers behind combos / classes, so appends do not copy the whole matrix
+        self._buffers = {}
+        # Rows already on disk; anything past this is written by the next save() as an append
+        self._saved_rows = 0
+        self._rewrite = True
+        # Directory those rows were loaded from or saved to; appends only ever go back there
+        self._directory = None
+        self.registry = ScenarioRegistry()
+
+    def __len__(self):
+        return len(self.combos)
+
+    @property
+    def nbytes(self):
+        return (self.combos.nbytes + self.classes.nbytes + sum(codes.nbytes for codes in self.codes.values())
+                + sum(values.nbytes for values in self.numeric.values()))
+
+    def _encode(self, name, values):
+        """Get int32 codes for values, adding unseen categories."""
+        index = self._category_codes[name]
+        categories = self.categories[name]
+        codes = np.empty(len(values), dtype=np.int32)
+        for row, value in enumerate(values):
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(categories)
+                categories.append(value)
+            codes[row] = code
+        return codes
+
+    def append(self, combos, metadata):
+        """
+        Add rows: an (n, 1326) matrix and a {column: n values} dict.
+
+        Missing categorical columns default to '' and numeric ones to 0;
+        'played' is always computed from the rows.
+        """
+        combos = np.array(np.atleast_2d(combos), dtype=np.float32)
+        if combos.shape[1] != NUM_COMBOS:
+            raise ValueError(f"Rows need {NUM_COMBOS} combo frequencies, got shape {combos.shape}")
+        count = len(combos)
+        metadata = dict(metadata)
+        metadata['played'] = combos.sum(axis=1)
+
+        self._append_rows('combos', combos)
+        self._append_rows('classes', class_matrix(combos))
+        for name in CATEGORY_COLUMNS:
+            values = metadata.get(name, [''] * count)
+            self.codes[name] = np.concatenate([self.codes[name], self._encode(name, values)])
+        for name, dtype in NUMERIC_COLUMNS.items():
+            values = np.asarray(metadata.get(name, np.zeros(count)), dtype=dtype)
+            self.numeric[name] = np.concatenate([self.numeric[name], values])
+
+    def _append_rows(self, attribute, rows):
+        """Append rows to a matrix attribute, growing its buffer by half when it is full."""
+        current = getattr(self, attribute)
+        buffer = self._buffers.get(attribute)
+        needed = len(current) + len(rows)
+        # The buffer is only reusable while the attribute is still a view of it (not after load/keep)
+        if buffer is None or current.base is not buffer or len(buffer) < needed:
+            buffer = np.empty((max(needed, len(current) * 3 // 2, 1024), current.shape[1]), dtype=np.float32)
+            buffer[:len(current)] = current
+            self._buffers[attribute] = buffer
+        buffer[len(current):needed] = rows
+        setattr(self, attribute, buffer[:needed])
+
+    def keep(self, mask):
+        """Drop every row where mask is False (categories are kept as they are)."""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.all():
+            return
+        self.combos = self.combos[mask]
+        self.classes = self.classes[mask]
+        for name in CATEGORY_COLUMNS:
+            self.codes[name] = self.codes[name][mask]
+        for name in NUMERIC_COLUMNS:
+            self.numeric[name] = self.numeric[name][mask]
+        self._rewrite = True
+
+    # -- building from a library --
+
+    def solution_metadata(self, relative_path, slot, mtime_ns):
+        """Metadata of one range from its path: game, stack, scenario fields and board."""
+        game, stack, scenario, board = path_to_key(relative_path) or ('', '0', '', '')
+        parsed = self.registry.parse_scenario(scenario) or ('', scenario.lower(), None)
+        position, facing, sizing = parsed
+        return {
+            'path': relative_path, 'game': game, 'stack': float(stack), 'scenario': scenario,
+            'position': position, 'facing': facing, 'sizing': sizing or '', 'board': board,
+            'slot': slot, 'mtime_ns': mtime_ns
+        }
+
+    def add_library(self, folder, paths=None, workers=None, progress=None):
+        """Parse solution files (all of them, or paths relative to folder) and append their ranges."""
+        result = preload(folder, workers=workers, progress=progress, paths=paths)
+        rows = []
+        metadata = []
+        for relative_path in result.paths:
+            try:
+                mtime_ns = os.stat(os.path.join(result.folder, relative_path)).st_mtime_ns
+            except OSError:
+                mtime_ns = 0
+            for slot, row in result.rows[relative_path].items():
+                rows.append(row)
+                metadata.append(self.solution_metadata(relative_path, slot, mtime_ns))
+        if rows:
+            columns = {name: [entry[name] for entry in metadata] for name in metadata[0]}
+            self.append(result.ranges[np.array(rows)], columns)
+        return result
+
+    @classmethod
+    def build(cls, folder, workers=None, progress=None):
+        """Build a store for a whole library."""
+        store = cls()
+        store.add_library(folder, workers=workers, progress=progress)
+        return store
+
+    def update(self, folder, workers=None, progress=None):
+        """
+        Bring the store in line with a library: new files are appended, changed
+        files replaced and deleted files dropped. Returns (added, replaced, removed) file counts.
+        """
+        index = ScanIndex(folder)
+        index.refresh()
+        index.save()
+        current = {}
+        for relative_path in index.solution_files():
+            try:
+                current[relative_path] = os.stat(os.path.join(folder, relative_path)).st_mtime_ns
+            except OSError:
+                continue
+
+        paths = self.column('path')
+        known = dict(zip(paths, self.numeric['mtime_ns']))
+        stale = {path for path, mtime_ns in known.items() if current.get(path) != mtime_ns}
+        added = [path for path in current if path not in known]
+        replaced = [path for path in stale if path in current]
+
+        if stale:
+            self.keep(~np.isin(paths, list(stale)))
+        if added or replaced:
+            self.add_library(folder, paths=sorted(added + replaced), workers=workers, progress=progress)
+        return len(added), len(replaced), len(stale) - len(replaced)
+
+    # -- queries --
+
+    def column(self, name, mask=None):
+        """Get a column's values (decoded for categorical columns), optionally for masked rows."""
+        if name in NUMERIC_COLUMNS:
+            values = self.numeric[name]
+        else:
+            values = np.asarray(self.categories[name], dtype=object)[self.codes[name]] \
+                if self.categories[name] else np.zeros(len(self), dtype=object)
+        return values if mask is None else values[mask]
+
+    def select(self, **criteria):
+        """
+        Get the boolean mask of rows matching every criterion.
+
+        Each value is a single value, a list/tuple/set of allowed values, or a
+        callable that takes the column values and returns a mask, e.g.
+        select(position=['BU', 'CO'], stack=lambda s: s >= 20, slot='range').
+        Callables on categorical columns see each category once.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, wanted in criteria.items():
+            if name in NUMERIC_COLUMNS:
+                values = self.numeric[name]
+                if callable(wanted):
+                    mask &= np.asarray(wanted(values), dtype=bool)
+                elif isinstance(wanted, (list, tuple, set)):
+                    mask &= np.isin(values, list(wanted))
+                else:
+                    mask &= values == wanted
+            elif name in CATEGORY_COLUMNS:
+                categories = np.asarray(self.categories[name], dtype=object)
+                if callable(wanted):
+                    allowed = np.asarray(wanted(categories), dtype=bool) if len(categories) else np.zeros(0, dtype=bool)
+                else:
+                    wanted = set(wanted) if isinstance(wanted, (list, tuple, set)) else {wanted}
+                    allowed = np.array([category in wanted for category in categories], dtype=bool)
+                mask &= allowed[self.codes[name]] if len(allowed) else False
+            else:
+                raise KeyError(f"Unknown column {name!r}")
+        return mask
+
+    def hand_frequency(self, hand, mask=None):
+        """Get every row's frequency of a class ('A5s') or a specific combo ('Ah5h')."""
+        if len(hand) == 4:
+            index = combo_index(hand)
+            if index < 0:
+                raise KeyError(f"Unknown combo {hand!r}")
+            values = self.combos[:, index]
+        elif hand in CLASS_INDEX:
+            values = self.classes[:, CLASS_INDEX[hand]]
+        else:
+            raise KeyError(f"Unknown hand {hand!r}")
+        return values if mask is None else values[mask]
+
+    def vpip(self, mask=None):
+        """Get every row's share of all 1326 combos played (for an opening range, its VPIP)."""
+        values = self.numeric['played'] / NUM_COMBOS
+        return values if mask is None else values[mask]
+
+    def group_by(self, by, values=None, agg='mean', mask=None):
+        """
+        Aggregate a per-row vector over groups of one or more columns.
+
+        by is a column name or a list of them; values defaults to ones (so
+        'sum' counts). agg is one of count/sum/mean/min/max. Returns
+        {group: value} where group is a value, or a tuple for several columns.
+        """
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate {agg!r}; expected one of {', '.join(AGGREGATES)}")
+        columns = [by] if isinstance(by, str) else list(by)
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        values = np.ones(len(self), dtype=np.float64) if values is None else np.asarray(values, dtype=np.float64)
+        values = values[rows]
+        if not len(rows):
+            return {}
+
+        # One int64 key per row from the columns' codes (numeric columns via their unique values)
+        key = np.zeros(len(rows), dtype=np.int64)
+        decoders = []
+        for name in columns:
+            if name in NUMERIC_COLUMNS:
+                uniques, codes = np.unique(self.numeric[name][rows], return_inverse=True)
+                decoders.append([value.item() for value in uniques])
+            else:
+                codes = self.codes[name][rows]
+                decoders.append(self.categories[name])
+            key = key * max(len(decoders[-1]), 1) + codes
+
+        groups, inverse = np.unique(key, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(groups))
+        if agg == 'count':
+            result = counts.astype(np.float64)
+        elif agg in ('sum', 'mean'):
+            result = np.bincount(inverse, weights=values, minlength=len(groups))
+            if agg == 'mean':
+                result = result / counts
+        else:
+            order = np.argsort(inverse, kind='stable')
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            reduce = np.minimum if agg == 'min' else np.maximum
+            result = reduce.reduceat(values[order], starts)
+
+        output = {}
+        for group, value in zip(groups.tolist(), result.tolist()):
+            labels = []
+            for decoder in reversed(decoders):
+                group, code = divmod(group, max(len(decoder), 1))
+                labels.append(decoder[code])
+            labels.reverse()
+            output[labels[0] if len(labels) == 1 else tuple(labels)] = value
+        return output
+
+    def records(self, mask=None, limit=None):
+        """Get the metadata of the selected rows as dicts (the first limit rows)."""
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        if limit is not None:
+            rows = rows[:limit]
+        decoded = {name: [self.categories[name][code] for code in self.codes[name][rows]]
+                   for name in CATEGORY_COLUMNS}
+        decoded.update({name: self.numeric[name][rows].tolist() for name in NUMERIC_COLUMNS})
+        return [{name: values[i] for name, values in decoded.items()} for i in range(len(rows))]
+
+    # -- persistence --
+
+    def save(self, directory):
+        """
+        Write the store to a directory.
+
+        The matrices are raw float32 files: rows added since the last save
+        are appended to them, and they are only rewritten after rows were
+        dropped or when saving anywhere but the store's own directory.
+        Metadata is rewritten every time.
+        """
+        os.makedirs(directory, exist_ok=True)
+        own_directory = os.path.realpath(directory) == self._directory
+        rewrite = self._rewrite or not own_directory or not os.path.exists(os.path.join(directory, 'store.json'))
+        start = 0 if rewrite else self._saved_rows
+        for name, matrix in (('combos.f32', self.combos), ('classes.f32', self.classes)):
+            with open(os.path.join(directory, name), 'wb' if rewrite else 'r+b') as f:
+                f.seek(start * matrix.shape[1] * 4)
+                f.write(np.ascontiguousarray(matrix[start:]).tobytes())
+                f.truncate()
+
+        columns = {f"code_{name}": codes for name, codes in self.codes.items()}
+        columns.update({f"value_{name}": values for name, values in self.numeric.items()})
+        np.savez(os.path.join(directory, 'columns.npz'), **columns)
+        header = {'version': STORE_VERSION, 'rows': len(self), 'categories': self.categories}
+        temp_path = os.path.join(directory, f"store.json.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(header, f)
+        os.replace(temp_path, os.path.join(directory, 'store.json'))
+        self._saved_rows = len(self)
+        self._rewrite = False
+        self._directory = os.path.realpath(directory)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open a saved store; with mmap the matrices are mapped read-only until the next append."""
+        with open(os.path.join(directory, 'store.json'), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported range store version {header.get('version')} in {directory}")
+
+        store = cls()
+        rows = header['rows']
+        for name, attribute, width in (('combos.f32', 'combos', NUM_COMBOS), ('classes.f32', 'classes', NUM_CLASSES)):
+            path = os.path.join(directory, name)
+            if not rows:
+                matrix = np.zeros((0, width), dtype=np.float32)
+            elif mmap:
+                matrix = np.memmap(path, dtype=np.float32, mode='r', shape=(rows, width))
+            else:
+                matrix = np.fromfile(path, dtype=np.float32, count=rows * width).reshape(rows, width)
+            setattr(store, attribute, matrix)
+
+        with np.load(os.path.join(directory, 'columns.npz')) as columns:
+            for name in CATEGORY_COLUMNS:
+                store.codes[name] = columns[f"code_{name}"]
+            for name in NUMERIC_COLUMNS:
+                store.numeric[name] = columns[f"value_{name}"]
+        store.categories = {name: list(header['categories'][name]) for name in CATEGORY_COLUMNS}
+        store._category_codes = {name: {value: code for code, value in enumerate(values)}
+                                 for name, values in store.categories.items()}
+        store._saved_rows = rows
+        store._rewrite = False
+        store._directory = os.path.realpath(directory)
+        return store
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build, update or inspect a columnar range store.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build or update the store of a solutions folder")
+    build.add_argument('folder')
+    build.add_argument('-o', '--output', help=f"store directory (default: <folder>{STORE_SUFFIX})")
+    build.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    info = commands.add_parser('info', help="print a store's size and columns")
+    info.add_argument('store')
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        output = args.output or default_store_path(args.folder)
+        start = time.perf_counter()
+        if os.path.exists(os.path.join(output, 'store.json')):
+            store = RangeStore.load(output)
+            added, replaced, removed = store.update(args.folder, workers=args.workers)
+            action = f"updated ({added} added, {replaced} replaced, {removed} removed files)"
+        else:
+            store = RangeStore.build(args.folder, workers=args.workers)
+            action = "built"
+        store.save(output)
+        print(f"Range store {output} {action}: {len(store)} ranges in {time.perf_counter() - start:.2f}s")
+    else:
+        store = RangeStore.load(args.store)
+        print(f"{len(store)} ranges, {store.nbytes / 1e6:.1f} MB")
+        for name in CATEGORY_COLUMNS:
+            print(f"  {name:<10} {len(store.categories[name])} distinct")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
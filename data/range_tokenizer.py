@@ -0,0 +1,94 @@
+"""
+Vectorized tokenizer for solver range lines.
+Turns a line of 'AcKd_0.50' tokens into combo indexes and float32 frequencies in one pass over its bytes.
+"""
+
+import numpy as np
+from .hand_range import COMBO_INDEX, RANKS, SUITS
+
+# Longest frequency substring handled by the vectorized decimal parser
+MAX_FREQ_WIDTH = 15
+
+_SPACE, _UNDERSCORE, _DOT, _ZERO = ord(' '), ord('_'), ord('.'), ord('0')
+
+
+def _build_lookup_tables():
+    """Build the (rank byte, suit byte) -> card and (card, card) -> combo tables."""
+    card_lut = np.full((256, 256), -1, dtype=np.int16)
+    for rank_idx, rank in enumerate(RANKS):
+        for suit_idx, suit in enumerate(SUITS):
+            card_lut[ord(rank), ord(suit)] = rank_idx * 4 + suit_idx
+
+    # Pad the combo table with a -1 row/column so invalid cards index to -1
+    combo_lut = np.full((53, 53), -1, dtype=np.int16)
+    combo_lut[:52, :52] = COMBO_INDEX
+    return card_lut, combo_lut
+
+
+CARD_LUT, COMBO_LUT = _build_lookup_tables()
+_POWERS_OF_TEN = 10 ** np.arange(MAX_FREQ_WIDTH, dtype=np.int64)
+
+
+def tokenize_range_line(line):
+    """
+    Tokenize a range line.
+
+    Returns (combo_indexes, frequencies, valid, spans): one entry per whitespace
+    separated token, where valid flags tokens that parsed cleanly and spans holds
+    each token's (start, end) character offsets for error reporting.
+    """
+    raw = np.frombuffer(line.encode('ascii', 'replace'), dtype=np.uint8)
+
+    # Pad with spaces so every token has a terminator and fixed-offset reads stay in bounds
+    buf = np.full(len(raw) + MAX_FREQ_WIDTH + 6, _SPACE, dtype=np.uint8)
+    buf[:len(raw)] = raw
+    # Whitespace and control bytes all sort at or below the space character
+    space = buf <= _SPACE
+
+    boundaries = np.flatnonzero(space[1:] != space[:-1]) + 1
+    if not space[0]:
+        boundaries = np.concatenate(([0], boundaries))
+    starts, ends = boundaries[0::2], boundaries[1::2]
+    lengths = ends - starts
+
+    # Combo prefix: two cards then the '_' separator
+    card1 = CARD_LUT[buf[starts], buf[starts + 1]]
+    card2 = CARD_LUT[buf[starts + 2], buf[starts + 3]]
+    combos = COMBO_LUT[card1, card2]
+    valid = (combos >= 0) & (buf[starts + 4] == _UNDERSCORE) & (lengths > 5)
+
+    frequencies, freq_valid = _parse_decimals(buf, starts + 5, lengths - 5)
+    valid &= freq_valid
+
+    return combos, frequencies, valid, np.stack((starts, ends), axis=1)
+
+
+def _parse_decimals(buf, starts, widths):
+    """Parse plain decimal substrings like '1', '0.50' or '.25' without Python floats."""
+    count = len(starts)
+    width = int(min(widths.max(), MAX_FREQ_WIDTH)) if count else 0
+
+    # Horner's scheme one character column at a time: every step is a flat vector op
+    mantissa = np.zeros(count, dtype=np.int64)
+    fraction_digits = np.zeros(count, dtype=np.int64)
+    seen_digit = np.zeros(count, dtype=bool)
+    seen_dot = np.zeros(count, dtype=bool)
+    valid = (widths > 0) & (widths <= MAX_FREQ_WIDTH)
+
+    for column in range(width):
+        inside = column < widths
+        chars = buf[starts + column]
+        digits = chars - np.uint8(_ZERO)
+        is_digit = inside & (digits <= 9)
+        is_dot = inside & (chars == _DOT)
+
+        valid &= ~inside | is_digit | (is_dot & ~seen_dot)
+        mantissa = np.where(is_digit, mantissa * 10 + digits, mantissa)
+        fraction_digits += is_digit & seen_dot
+        seen_digit |= is_digit
+        seen_dot |= is_dot
+
+    valid &= seen_digit
+    # Exact integer mantissa, then one correctly rounded division by 10**k
+    frequencies = (mantissa / _POWERS_OF_TEN[fraction_digits]).astype(np.float32)
+    return frequencies, valid
\ No newline at end of file
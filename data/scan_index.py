@@ -0,0 +1,214 @@
+"""
+Persistent incremental index of a solutions folder.
+Remembers every directory's listing keyed by its mtime so a rescan only lists directories that changed.
+"""
+
+import json
+import os
+
+# Kept inside the scanned folder; scans only pick up .txt files, so it never lists itself
+SCAN_INDEX_FILE_NAME = '.scan-index.json'
+INDEX_VERSION = 2
+
+
+def path_to_key(relative_path):
+    """
+    Split a path relative to a solutions root into (game, stack, scenario, board).
+
+    Handles both <game>/<stack>/<scenario>.txt and <stack>/<scenario>/<board>.txt
+    (game is '' when the root is itself a game folder). Returns None for paths
+    with no stack folder.
+    """
+    parts = relative_path.replace('\\', '/').split('/')
+    if not parts[-1].endswith('.txt'):
+        return None
+    parts[-1] = parts[-1][:-4]
+
+    for i, part in enumerate(parts[:-1]):
+        if part.isdigit():
+            game = '/'.join(parts[:i])
+            scenario = parts[i + 1]
+            board = '/'.join(parts[i + 2:])
+            return (game, part, scenario, board)
+    return None
+
+
+def key_to_path(key):
+    """Rebuild the relative .txt path for a (game, stack, scenario, board) key."""
+    game, stack, scenario, board = key
+    parts = [part for part in (game, stack, scenario, board) if part]
+    return '/'.join(parts) + '.txt'
+
+
+def empty_available_data():
+    """Get an empty scan_solutions_folder result."""
+    return {
+        'stacks': set(),
+        'scenarios': set(),
+        'stack_scenarios': {},
+        'scenario_boards': {},
+        'scenario_files': {},
+        'games': {}
+    }
+
+
+def add_solution_key(available_data, key):
+    """
+    Record one solution file in a scan result.
+
+    Board files (<stack>/<scenario>/<board>.txt) are listed under
+    'scenario_boards', single-file scenarios (<stack>/<scenario>.txt) under
+    'scenario_files' with their path relative to the scanned folder, and
+    keys under a game folder go into a nested result in 'games'.
+    """
+    game, stack, scenario, board = key
+    add_solution_group(available_data, game, stack, scenario, [board])
+
+
+def add_solution_group(available_data, game, stack, scenario, boards):
+    """Record several files of one scenario at once, as add_solution_key would one by one."""
+    if game:
+        available_data = available_data['games'].setdefault(game, empty_available_data())
+
+    available_data['stacks'].add(stack)
+    scenarios = available_data['stack_scenarios'].setdefault(stack, [])
+    scenario_key = f"{stack}_{scenario}"
+    if scenario not in scenarios:
+        scenarios.append(scenario)
+        available_data['scenarios'].add(scenario)
+
+    board_names = [board for board in boards if board]
+    if board_names:
+        available_data['scenario_boards'].setdefault(scenario_key, []).extend(board_names)
+    if len(board_names) < len(boards):
+        available_data['scenario_files'][scenario_key] = key_to_path((game, stack, scenario, ''))
+
+
+def group_solution_files(relative, files):
+    """Group one directory's .txt files into [game, stack, scenario, boards] runs of the same scenario."""
+    groups = []
+    for name in files:
+        key = path_to_key(f"{relative}/{name}" if relative else name)
+        if key is None:
+            continue
+        if groups and groups[-1][:3] == list(key[:3]):
+            groups[-1][3].append(key[3])
+        else:
+            groups.append([*key[:3], [key[3]]])
+    return groups
+
+
+class ScanIndex:
+    """Directory listings of one solutions folder, persisted inside it."""
+
+    def __init__(self, folder_path, index_path=None):
+        self.folder_path = os.path.abspath(folder_path)
+        self.index_path = index_path or os.path.join(self.folder_path, SCAN_INDEX_FILE_NAME)
+        self.dirs = {}
+        self.dirty = False
+        self.last_listed = 0
+        self.load()
+
+    def load(self):
+        """Load the persisted listings, starting empty if there are none."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and data.get('folder') == self.folder_path:
+                self.dirs = data['dirs']
+        except (OSError, ValueError, KeyError):
+            self.dirs = {}
+
+    def save(self):
+        """Persist the listings if they changed since the last save."""
+        if not self.dirty:
+            return
+        data = {'version': INDEX_VERSION, 'folder': self.folder_path, 'dirs': self.dirs}
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+            self.dirty = False
+            # Writing the index touched the folder's own mtime; that is not a change to rescan for
+            root = self.dirs.get('')
+            if root is not None and os.path.dirname(self.index_path) == self.folder_path:
+                root['mtime_ns'] = os.stat(self.folder_path).st_mtime_ns
+        except OSError as e:
+            # A read-only library still scans, it just cannot reuse the index next time
+            print(f"Could not save scan index {self.index_path}: {e}")
+
+    def refresh(self):
+        """
+        Bring the listings up to date.
+
+        Every known directory is stat'ed, but only directories whose mtime
+        changed (or that are new) are listed again with os.scandir. The index
+        is only marked for saving when a listing's contents changed. Returns
+        the number of directories that were listed.
+        """
+        old_dirs = self.dirs
+        new_dirs = {}
+        listed = 0
+        changed = False
+        pending = ['']
+
+        while pending:
+            relative = pending.pop()
+            path = os.path.join(self.folder_path, relative) if relative else self.folder_path
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+            entry = old_dirs.get(relative)
+            if entry is None or entry['mtime_ns'] != mtime_ns:
+                old_entry = entry
+                entry = self._list_directory(relative, path, mtime_ns)
+                if entry is None:
+                    continue
+                listed += 1
+                if old_entry is None or (old_entry['dirs'], old_entry['files']) != (entry['dirs'], entry['files']):
+                    changed = True
+
+            new_dirs[relative] = entry
+            for name in entry['dirs']:
+                pending.append(f"{relative}/{name}" if relative else name)
+
+        if changed or new_dirs.keys() != old_dirs.keys():
+            self.dirty = True
+        self.dirs = new_dirs
+        self.last_listed = listed
+        return listed
+
+    def _list_directory(self, relative, path, mtime_ns):
+        """List one directory; d_type from scandir avoids a stat per entry."""
+        dirs = []
+        files = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                    elif entry.name.endswith('.txt'):
+                        files.append(entry.name)
+        except OSError:
+            return None
+        files.sort()
+        # Scan-result groups are kept per directory, so available_data never revisits every file
+        return {'mtime_ns': mtime_ns, 'dirs': sorted(dirs), 'files': files,
+                'groups': group_solution_files(relative, files)}
+
+    def solution_files(self):
+        """Iterate over every .txt path relative to the folder, in sorted order."""
+        for relative in sorted(self.dirs):
+            for name in self.dirs[relative]['files']:
+                yield f"{relative}/{name}" if relative else name
+
+    def available_data(self):
+        """Build the scan_solutions_folder result from the listings."""
+        available_data = empty_available_data()
+        for relative in sorted(self.dirs):
+            for game, stack, scenario, boards in self.dirs[relative]['groups']:
+                add_solution_group(available_data, game, stack, scenario, boards)
+        return available_data
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Scenario registry for a scanned solutions folder.
+Parses scenario names into structured keys so a GUI selection resolves to a file with one dict lookup.
+"""
+
+import re
+from collections import namedtuple
+from .scan_index import key_to_path
+
+ScenarioKey = namedtuple('ScenarioKey', ['game', 'stack', 'position', 'facing', 'sizing'])
+
+# Spellings of each seat, keyed by the lower-case token found in names
+POSITION_ALIASES = {
+    'utg': 'UTG', 'ep': 'UTG',
+    'utg1': 'UTG1', 'utg+1': 'UTG1', 'ep2': 'UTG1',
+    'lj': 'LJ', 'lojack': 'LJ',
+    'mp': 'MP', 'mp1': 'MP',
+    'hj': 'HJ', 'hijack': 'HJ', 'mp2': 'HJ',
+    'co': 'CO', 'cutoff': 'CO',
+    'bu': 'BU', 'btn': 'BU', 'button': 'BU', 'bn': 'BU', 'dealer': 'BU',
+    'sb': 'SB',
+    'bb': 'BB'
+}
+
+# Spellings of each facing action after normalization (lower case, single spaces, '3-bet' -> '3bet')
+FACING_ALIASES = {
+    '': 'open', 'open': 'open', 'first to act': 'open', 'first in': 'open', 'rfi': 'open',
+    'raise first in': 'open', 'unopened': 'open',
+    'vs raise': 'vs raise', 'vs open': 'vs raise', 'vs rfi': 'vs raise', 'facing raise': 'vs raise',
+    'vs 3bet': 'vs 3bet', 'facing 3bet': 'vs 3bet',
+    'vs 4bet': 'vs 4bet', 'facing 4bet': 'vs 4bet',
+    'vs jam': 'vs allin', 'vs shove': 'vs allin', 'vs allin': 'vs allin', 'vs all in': 'vs allin'
+}
+
+_SEPARATORS = re.compile(r'[\s_\-]+')
+_BET_COUNT = re.compile(r'(\d)\s*-\s*bet')
+_SIZING = re.compile(r'^(\d+(?:\.\d+)?)(x|bb|%)$')
+
+
+def normalize_stack(stack):
+    """Normalize a stack size like '100', '100bb' or 100.0 to '100'."""
+    text = str(stack).strip().lower()
+    if text.endswith('bb'):
+        text = text[:-2]
+    try:
+        return f"{float(text):g}"
+    except ValueError:
+        return text
+
+
+def normalize_sizing(sizing):
+    """Normalize a sizing like '2.50X' to '2.5x'; None and '' mean no sizing."""
+    if not sizing:
+        return None
+    text = str(sizing).strip().lower()
+    match = _SIZING.match(text)
+    if match is None:
+        return text
+    return f"{float(match.group(1)):g}{match.group(2)}"
+
+
+def _tokens(text):
+    """Split a name into lower-case tokens, keeping '3-bet' as one token and splitting 'vs3bet'."""
+    text = _BET_COUNT.sub(r'\1bet', text.strip().lower())
+    tokens = []
+    for token in _SEPARATORS.split(text):
+        if not token:
+            continue
+        if token.startswith('vs') and len(token) > 2:
+            tokens.append('vs')
+            if token[2:].lstrip('.'):
+                tokens.append(token[2:].lstrip('.'))
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class ScenarioRegistry:
+    """Structured keys for every scenario in a scan result, with alias-aware O(1) resolution."""
+
+    def __init__(self, position_aliases=None, facing_aliases=None):
+        self.position_aliases = dict(POSITION_ALIASES)
+        self.position_aliases.update({alias.lower(): position for alias, position in (position_aliases or {}).items()})
+        self.facing_aliases = dict(FACING_ALIASES)
+        self.facing_aliases.update({' '.join(_tokens(alias)): facing for alias, facing in (facing_aliases or {}).items()})
+
+        # ScenarioKey -> (game, stack, scenario) as named on disk
+        self.entries = {}
+        # ScenarioKey -> path relative to the scanned folder (a board-only scenario maps to its first board file)
+        self.files = {}
+        # Games with registered scenarios; '' when stacks sit directly in the scanned folder
+        self.games = set()
+        # Key without sizing -> sizings on disk, so a selection without one still resolves
+        self.sizings = {}
+        # Scenario names that could not be parsed, and names that collided with an earlier one
+        self.unparsed = []
+        self.duplicates = []
+
+    @classmethod
+    def from_available_data(cls, available_data, position_aliases=None, facing_aliases=None):
+        """Build the registry from a scan_solutions_folder result, including nested game folders."""
+        registry = cls(position_aliases, facing_aliases)
+        registry.add_available_data(available_data)
+        return registry
+
+    def add_available_data(self, available_data, game=''):
+        """Register every scenario of a scan result under a game name."""
+        for stack, scenarios in sorted(available_data.get('stack_scenarios', {}).items()):
+            for scenario in sorted(scenarios):
+                # Already relative to the scanned folder, game folders included
+                relative_path = available_data.get('scenario_files', {}).get(f"{stack}_{scenario}")
+                boards = available_data.get('scenario_boards', {}).get(f"{stack}_{scenario}")
+                if relative_path is None and boards:
+                    # Every board file starts from the same preflop ranges, so any of them will do
+                    relative_path = key_to_path((game, stack, scenario, min(boards)))
+                self.add(game, stack, scenario, relative_path)
+
+        for name, nested in sorted(available_data.get('games', {}).items()):
+            self.add_available_data(nested, f"{game}/{name}" if game else name)
+
+    def add(self, game, stack, scenario, relative_path=None):
+        """Register one scenario; returns its key, or None if the name has no position."""
+        parsed = self.parse_scenario(scenario)
+        if parsed is None:
+            self.unparsed.append((game, stack, scenario))
+            return None
+        position, facing, sizing = parsed
+        key = ScenarioKey(game, normalize_stack(stack), position, facing, sizing)
+        if key in self.entries:
+            # Two spellings of the same spot (e.g. UTG_open and 'UTG First to Act'): the first one wins
+            self.duplicates.append((key, scenario))
+            return key
+
+        self.entries[key] = (game, stack, scenario)
+        self.games.add(game)
+        if relative_path is not None:
+            self.files[key] = relative_path
+        self.sizings.setdefault(key[:4], []).append(sizing)
+        return key
+
+    def parse_scenario(self, name):
+        """
+        Parse a scenario name into (position, facing, sizing), or None without a position.
+
+        The first seat token is the position, a token like '2.5x', '3bb' or
+        '33%' is the sizing, and the remaining tokens are the facing action,
+        so 'UTG_open', 'UTG First to Act' and 'UTG' all give ('UTG', 'open', None).
+        """
+        tokens = _tokens(name)
+        position = None
+        sizing = None
+        rest = []
+        for token in tokens:
+            if position is None and token in self.position_aliases:
+                position = self.position_aliases[token]
+            elif sizing is None and _SIZING.match(token):
+                sizing = normalize_sizing(token)
+            else:
+                rest.append(token)
+        if position is None:
+            return None
+        return position, self.normalize_facing(' '.join(rest)), sizing
+
+    def normalize_facing(self, facing):
+        """Map a facing action spelling to its canonical name ('vs 3-Bet' -> 'vs 3bet', 'vs BTN' -> 'vs bu')."""
+        text = ' '.join(_tokens(facing))
+        if text in self.facing_aliases:
+            return self.facing_aliases[text]
+        words = text.split(' ')
+        if len(words) == 2 and words[0] == 'vs' and words[1] in self.position_aliases:
+            return f"vs {self.position_aliases[words[1]].lower()}"
+        return text
+
+    def default_game(self):
+        """Get the game a selection without one refers to: '' or the only game in the folder (None if several)."""
+        if '' in self.games or not self.games:
+            return ''
+        if len(self.games) == 1:
+            return next(iter(self.games))
+        return None
+
+    def key(self, stack, position, facing, sizing=None, game=''):
+        """Build the normalized key for a selection (no lookup); no game means default_game()."""
+        if not game:
+            game = self.default_game() or ''
+        position = self.position_aliases.get(str(position).strip().lower(), str(position).strip().upper())
+        return ScenarioKey(game, normalize_stack(stack), position, self.normalize_facing(facing), normalize_sizing(sizing))
+
+    def resolve(self, stack, position, facing, sizing=None, game=''):
+        """
+        Get the registered key for a selection, or None.
+
+        Without a sizing, an unsized scenario is preferred, then the first
+        sizing on disk.
+        """
+        key = self.key(stack, position, facing, sizing, game)
+        if key in self.entries:
+            return key
+        if sizing is None:
+            sizings = self.sizings.get(key[:4])
+            if sizings:
+                return key._replace(sizing=sizings[0])
+        return None
+
+    def file_for(self, stack, position, facing, sizing=None, game=''):
+        """Get the solution file for a selection relative to the scanned folder, or None."""
+        key = self.resolve(stack, position, facing, sizing, game)
+        return self.files.get(key) if key is not None else None
+
+    def scenario_name(self, key):
+        """Get the on-disk (game, stack, scenario) of a registered key, or None."""
+        return self.entries.get(key)
+
+    def keys(self, stack=None, position=None, game=''):
+        """Get the registered keys, optionally for one stack and/or position."""
+        stack = normalize_stack(stack) if stack is not None else None
+        if not game:
+            game = self.default_game() or ''
+        return [key for key in self.entries
+                if key.game == game and (stack is None or key.stack == stack)
+                and (position is None or key.position == position)]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
\ No newline at end of file
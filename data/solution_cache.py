@@ -0,0 +1,196 @@
+"""
+Compiled binary cache for solution files.
+Stores parsed ranges, game info and decision-tree offsets in a sidecar file that loads with a single mmap.
+
+Usage: python -m data.solution_cache <solutions folder> [--cache-dir DIR] [--hash]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from .hand_range import Range, NUM_COMBOS
+
+CACHE_SUFFIX = '.solc'
+MAGIC = b'SOLC'
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+# magic, format version, JSON header length
+_PREAMBLE = struct.Struct('<4sII')
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def file_stamp(path):
+    """Get the (mtime, size) stamp used to invalidate a compiled file."""
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def content_hash(path):
+    """Hash a source file's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_solution(solution, source=None):
+    """Serialize a parsed solution into the compiled binary layout."""
+    range_keys = [key for key, value in solution.items() if isinstance(value, Range)]
+    # Ranges with identical frequencies (e.g. empty slots) share one block row
+    rows = []
+    distinct = {}
+    for key in range_keys:
+        data = np.ascontiguousarray(solution[key].frequencies, dtype=np.float32).tobytes()
+        rows.append(distinct.setdefault(data, len(distinct)))
+    range_block = np.frombuffer(b''.join(distinct), dtype=np.float32).reshape(len(distinct), NUM_COMBOS)
+
+    # Decision-tree nodes go into one text blob addressed by (name, start, end) offsets
+    tree_nodes = []
+    tree_blob = bytearray()
+    for name, text in solution.get('decision_tree', {}).items():
+        encoded = str(text).encode('utf-8')
+        tree_nodes.append([name, len(tree_blob), len(tree_blob) + len(encoded)])
+        tree_blob += encoded
+
+    header = {
+        'source': source or {},
+        'game_info': solution.get('game_info', {}),
+        'ranges': {'keys': range_keys, 'rows': rows, 'offset': 0},
+        'tree': {'nodes': tree_nodes, 'offset': _align(range_block.nbytes)}
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    out = bytearray(data_start + header['tree']['offset'] + len(tree_blob))
+    out[:_PREAMBLE.size] = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes))
+    out[_PREAMBLE.size:_PREAMBLE.size + len(header_bytes)] = header_bytes
+    out[data_start:data_start + range_block.nbytes] = range_block.tobytes()
+    tree_start = data_start + header['tree']['offset']
+    out[tree_start:] = tree_blob
+    return bytes(out)
+
+
+def read_header(buffer):
+    """Read the JSON header of a compiled solution; returns (header, data_start)."""
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError("Compiled solution is truncated")
+    magic, version, header_length = _PREAMBLE.unpack(bytes(buffer[:_PREAMBLE.size]))
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a compiled solution file (or an old format version)")
+    header_end = _PREAMBLE.size + header_length
+    header = json.loads(bytes(buffer[_PREAMBLE.size:header_end]).decode('utf-8'))
+    return header, _align(header_end)
+
+
+def decode_solution(buffer, header, data_start):
+    """Build a solution dict whose ranges are zero-copy views into buffer."""
+    solution = {
+        'game_info': header.get('game_info', {}),
+        'decision_tree': {}
+    }
+
+    range_keys = header['ranges']['keys']
+    rows = header['ranges']['rows']
+    block_rows = max(rows) + 1 if rows else 0
+    range_start = data_start + header['ranges']['offset']
+    range_end = range_start + block_rows * NUM_COMBOS * 4
+    if range_end > len(buffer):
+        raise ValueError("Compiled solution is truncated")
+    block = np.frombuffer(buffer, dtype=np.float32, count=block_rows * NUM_COMBOS,
+                          offset=range_start).reshape(block_rows, NUM_COMBOS)
+    for row, key in zip(rows, range_keys):
+        solution[key] = Range(block[row])
+
+    tree_start = data_start + header['tree']['offset']
+    for name, start, end in header['tree']['nodes']:
+        solution['decision_tree'][name] = bytes(buffer[tree_start + start:tree_start + end]).decode('utf-8')
+
+    return solution
+
+
+class SolutionCache:
+    """Reads and writes compiled sidecar files for solution .txt files."""
+
+    def __init__(self, cache_dir=None, use_hash=False, write_through=False):
+        # Sidecars sit next to each .txt file unless a cache directory is given
+        self.cache_dir = cache_dir
+        # Accept a compiled file whose stamp changed if the content hash still matches
+        self.use_hash = use_hash
+        # Compile on every cache miss instead of only through an explicit compile step
+        self.write_through = write_through
+
+    def cache_path(self, source_path):
+        """Get the compiled file path for a solution file."""
+        if self.cache_dir is None:
+            return source_path + CACHE_SUFFIX
+        key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def load(self, source_path):
+        """Load a compiled solution, or return None if it is missing or stale."""
+        cache_path = self.cache_path(source_path)
+        try:
+            buffer = np.memmap(cache_path, dtype=np.uint8, mode='r')
+            header, data_start = read_header(buffer)
+            if not self._is_fresh(source_path, header.get('source', {})):
+                return None
+            return decode_solution(buffer, header, data_start)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _is_fresh(self, source_path, stored):
+        """Check a stored source stamp (and optionally hash) against the file on disk."""
+        stamp = file_stamp(source_path)
+        if stamp['mtime_ns'] == stored.get('mtime_ns') and stamp['size'] == stored.get('size'):
+            return True
+        if self.use_hash and stamp['size'] == stored.get('size') and stored.get('hash'):
+            return content_hash(source_path) == stored['hash']
+        return False
+
+    def store(self, source_path, solution):
+        """Write the compiled form of a parsed solution; returns the cache path."""
+        source = file_stamp(source_path)
+        if self.use_hash:
+            source['hash'] = content_hash(source_path)
+
+        cache_path = self.cache_path(source_path)
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file and swap it in so readers never see a partial file
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(encode_solution(solution, source))
+        try:
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # The old file may still be mapped (e.g. on Windows); keep it for now
+            os.remove(temp_path)
+        return cache_path
+
+
+def main():
+    from .solution_loader import SolutionLoader
+
+    arg_parser = argparse.ArgumentParser(description="Compile solution files into binary caches.")
+    arg_parser.add_argument('folder', help="solutions folder to compile")
+    arg_parser.add_argument('--cache-dir', help="write caches here instead of next to each file")
+    arg_parser.add_argument('--hash', action='store_true', help="also record a content hash")
+    args = arg_parser.parse_args()
+
+    loader = SolutionLoader(cache=SolutionCache(args.cache_dir, use_hash=args.hash))
+    compiled, skipped, failed = loader.compile_folder(args.folder)
+    print(f"Compiled {compiled} solution files ({skipped} up to date, {failed} failed)")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
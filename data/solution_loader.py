@@ -3,118 +3,300 @@ Solution loader for parsing poker solution files.
 Handles loading and parsing of the solution text files.
 """
 
+import io
 import os
 import re
+from collections import OrderedDict
 from .range_parser import RangeParser
+from .hand_range import Range
+from .solution_pack import SolutionPack, PACK_FILE_NAME
+from .lru_cache import SolutionLRUCache
+from .range_intern import RangeInterner
+from .scan_index import ScanIndex, empty_available_data
+from .preload import preload as preload_library
+from .hand_index import HandIndex, default_index_path
+from .solution_stream import LazySolution, iter_sections, SECTION_GAME, SECTION_RANGE
+from .decision_tree import DecisionTree
+from .tracing import tracer
+
+# Default resident-memory budget for parsed solutions kept by SolutionLoader
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
 
 class SolutionLoader:
-    def __init__(self):
+    def __init__(self, cache=None, use_packs=True, memory_budget=DEFAULT_MEMORY_BUDGET, compact_memory=False,
+                 intern_ranges=True):
         self.range_parser = RangeParser()
+        # Optional SolutionCache of compiled solution files
+        self.cache = cache
+        # Prefer a solutions.pack in a folder (or any parent) over its raw files
+        self.use_packs = use_packs
+        self._packs = {}
+        # Parsed solutions kept in memory, keyed by path plus mtime (0 disables)
+        self.memory_cache = SolutionLRUCache(memory_budget, compact=compact_memory) if memory_budget else None
+        # Keep cached solutions and tree nodes palette-coded (see data/palette.py)
+        self.compact_memory = compact_memory
+        # Persistent directory listings per scanned folder
+        self._scan_indexes = {}
+        # Recently opened decision-tree indexes, keyed like the memory cache
+        self._trees = OrderedDict()
+        # HandIndex of the last library preloaded with index_hands
+        self.hand_index = None
+        # Identical ranges across files share one read-only Range (and one parse)
+        self.interner = RangeInterner() if intern_ranges else None
+        self._empty_range = Range()
+        self._empty_range.frequencies.setflags(write=False)
+        
+    def find_pack(self, path):
+        """Find the solution pack covering a file or folder path, or None."""
+        if not self.use_packs:
+            return None
+            
+        directory = os.path.abspath(path)
+        if not os.path.isdir(directory):
+            directory = os.path.dirname(directory)
+            
+        visited = []
+        pack = None
+        while True:
+            if directory in self._packs:
+                pack = self._packs[directory]
+                break
+            visited.append(directory)
+            pack_path = os.path.join(directory, PACK_FILE_NAME)
+            if os.path.isfile(pack_path):
+                try:
+                    pack = SolutionPack(pack_path)
+                except (OSError, ValueError) as e:
+                    print(f"Error opening solution pack {pack_path}: {e}")
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+            
+        # Remember the answer for every directory on the way up
+        for directory in visited:
+            self._packs[directory] = pack
+        # A pack written above its source folder does not cover that folder's siblings
+        if pack is not None and not pack.covers(path):
+            return None
+        return pack
         
     def scan_solutions_folder(self, folder_path):
         """Scan the solutions folder and return available data."""
-        available_data = {
-            'stacks': set(),
-            'scenarios': set(),
-            'stack_scenarios': {},
-            'scenario_boards': {}
-        }
-        
         if not os.path.exists(folder_path):
-            return available_data
+            return empty_available_data()
+            
+        pack = self.find_pack(folder_path)
+        if pack is not None:
+            return pack.scan(folder_path)
             
         try:
-            # Walk through the directory structure
-            for stack_dir in os.listdir(folder_path):
-                stack_path = os.path.join(folder_path, stack_dir)
-                if not os.path.isdir(stack_path):
-                    continue
-                    
-                # Extract stack size (assuming format like "11", "14", etc.)
-                if stack_dir.isdigit():
-                    stack = stack_dir
-                    available_data['stacks'].add(stack)
-                    available_data['stack_scenarios'][stack] = []
-                    
-                    # Look for scenario folders
-                    for scenario_dir in os.listdir(stack_path):
-                        scenario_path = os.path.join(stack_path, scenario_dir)
-                        if not os.path.isdir(scenario_path):
-                            continue
-                            
-                        available_data['scenarios'].add(scenario_dir)
-                        available_data['stack_scenarios'][stack].append(scenario_dir)
-                        
-                        # Look for board files
-                        key = f"{stack}_{scenario_dir}"
-                        available_data['scenario_boards'][key] = []
-                        
-                        for file_name in os.listdir(scenario_path):
-                            if file_name.endswith('.txt'):
-                                board = file_name[:-4]  # Remove .txt extension
-                                available_data['scenario_boards'][key].append(board)
+            # Only directories whose mtime changed since the last scan are listed again
+            folder = os.path.abspath(folder_path)
+            index = self._scan_indexes.get(folder)
+            if index is None:
+                index = self._scan_indexes[folder] = ScanIndex(folder)
+            index.refresh()
+            index.save()
+            return index.available_data()
                                 
         except Exception as e:
             print(f"Error scanning solutions folder: {e}")
-            
-        return available_data
+            return empty_available_data()
     
     def load_solution(self, file_path):
-        """Load a solution file and parse it."""
+        """Load a solution file and parse it (repeat lookups come from memory)."""
+        if self.memory_cache is None:
+            return self._load_solution_uncached(file_path)
+            
+        key = self._memory_key(file_path)
+        if key is not None:
+            solution = self.memory_cache.get(key)
+            if solution is not None:
+                return solution
+                
+        solution = self._load_solution_uncached(file_path)
+        if key is not None:
+            self.memory_cache.put(key, solution)
+        return solution
+    
+    def is_cached(self, file_path):
+        """Check whether a solution is already parsed in memory."""
+        if self.memory_cache is None:
+            return False
+        key = self._memory_key(file_path)
+        return key is not None and key in self.memory_cache
+        
+    def warm(self, file_path):
+        """
+        Parse a solution into the memory cache without counting a cache lookup.
+        
+        Used for prefetching; returns the bytes added, 0 if it was already cached.
+        """
+        if self.memory_cache is None:
+            return 0
+        key = self._memory_key(file_path)
+        if key is None or key in self.memory_cache:
+            return 0
+        return self.memory_cache.put(key, self._load_solution_uncached(file_path))
+    
+    def _memory_key(self, file_path):
+        """Key a solution by path plus mtime so edited files are never served stale."""
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+            return (path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            # Files only present inside a pack are keyed by the pack's own mtime
+            pack = self.find_pack(path)
+            if pack is None:
+                return None
+            return (path, os.stat(pack.path).st_mtime_ns, 'pack')
+            
+    def cache_stats(self):
+        """Get hit/miss/eviction counts and resident bytes of the in-memory cache."""
+        if self.memory_cache is None:
+            return {}
+        return self.memory_cache.stats()
+    
+    def intern_stats(self):
+        """Get range interning lookups, hits and the dedup ratio."""
+        if self.interner is None:
+            return {}
+        return self.interner.stats()
+    
+    def _load_solution_uncached(self, file_path):
+        """Load a solution from a pack, a compiled cache or the text file."""
+        pack = self.find_pack(file_path)
+        if pack is not None:
+            solution = pack.load_path(file_path)
+            if solution is not None:
+                return self._intern(solution)
+                
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Solution file not found: {file_path}")
             
+        # A fresh compiled cache replaces text parsing with a single mmap
+        if self.cache is not None:
+            solution = self.cache.load(file_path)
+            if solution is not None:
+                return self._intern(solution)
+                
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 
-            return self.parse_solution_content(content)
+            solution = self.parse_solution_content(content)
             
         except Exception as e:
             raise Exception(f"Error loading solution file: {e}")
+            
+        if self.cache is not None and self.cache.write_through:
+            self.cache.store(file_path, solution)
+        return solution
+    
+    def open_solution(self, file_path):
+        """Open a (possibly huge) solution file lazily: only the header and section index are read up front."""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Solution file not found: {file_path}")
+        return LazySolution(file_path, self)
+    
+    def open_tree(self, file_path, max_open=8):
+        """Get the action-path index of a solution's decision tree, reusing it while the file is unchanged."""
+        key = self._memory_key(file_path)
+        tree = self._trees.get(key)
+        if tree is None:
+            tree = DecisionTree(self.open_solution(file_path), compact=self.compact_memory)
+            self._trees[key] = tree
+            if len(self._trees) > max_open:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(key)
+        return tree
+    
+    def preload(self, folder_path, workers=None, progress=None, index_hands=False):
+        """
+        Parse a whole library across a process pool and keep it in the in-memory cache.
+        With index_hands, also build the library's HandIndex and save it beside the folder.
+        """
+        result = preload_library(folder_path, workers=workers, progress=progress)
+        if self.memory_cache is not None:
+            for relative_path in result.paths:
+                key = self._memory_key(os.path.join(result.folder, relative_path))
+                if key is not None:
+                    self.memory_cache.put(key, result.solution(relative_path))
+        if index_hands:
+            self.hand_index = HandIndex.from_preload(result)
+            try:
+                self.hand_index.save(default_index_path(folder_path))
+            except OSError as e:
+                print(f"Error saving hand index for {folder_path}: {e}")
+        return result
+    
+    def compile_solution(self, file_path):
+        """Parse a solution file and write its compiled cache."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            solution = self.parse_solution_content(f.read())
+        return self.cache.store(file_path, solution)
+    
+    def compile_folder(self, folder_path, force=False):
+        """Compile every solution file under a folder; returns (compiled, skipped, failed)."""
+        if self.cache is None:
+            raise ValueError("compile_folder needs a SolutionLoader created with a cache")
+            
+        compiled = skipped = failed = 0
+        for dir_path, _, file_names in os.walk(folder_path):
+            for file_name in file_names:
+                if not file_name.endswith('.txt'):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                if not force and self.cache.load(file_path) is not None:
+                    skipped += 1
+                    continue
+                try:
+                    self.compile_solution(file_path)
+                    compiled += 1
+                except Exception as e:
+                    print(f"Error compiling {file_path}: {e}")
+                    failed += 1
+                    
+        return compiled, skipped, failed
+    
+    def _intern(self, solution):
+        return self.interner.intern_solution(solution) if self.interner is not None else solution
+    
+    def parse_range_section(self, text):
+        """Parse a range section's text, reusing the shared Range if the same text was parsed before."""
+        # Join the section's lines so a range split over several lines is kept whole
+        line = ' '.join(text.split())
+        if self.interner is None:
+            return self.range_parser.parse_range_line(line)
+        return self.interner.intern_text(line, self.range_parser.parse_range_line)
     
     def parse_solution_content(self, content):
         """Parse the solution file content."""
+        # Slots missing from the file all share one read-only empty range when interning
+        shared = self.interner is not None
         solution = {
             'game_info': {},
-            'oop_range': {},
-            'ip_range': {},
+            'range': self._empty_range if shared else Range(),
+            'oop_range': self._empty_range if shared else Range(),
+            'ip_range': self._empty_range if shared else Range(),
             'decision_tree': {}
         }
         
-        lines = content.strip().split('\n')
-        current_section = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Parse game information
-            if line.startswith('game = '):
-                solution['game_info'] = self.parse_game_info(line)
-                continue
-                
-            # Identify sections
-            if line == 'OOP preflop range':
-                current_section = 'oop_range'
-                continue
-            elif line == 'IP preflop range':
-                current_section = 'ip_range'
-                continue
-            elif line.startswith('root,') or line.startswith('1 check,') or line.startswith('2 bet'):
-                current_section = 'decision_tree'
-                continue
-                
-            # Parse range data
-            if current_section == 'oop_range':
-                solution['oop_range'] = self.range_parser.parse_range_line(line)
-            elif current_section == 'ip_range':
-                solution['ip_range'] = self.range_parser.parse_range_line(line)
-            elif current_section == 'decision_tree':
-                # Store decision tree data (for future use)
-                if line and not line.startswith('root,'):
-                    solution['decision_tree'][current_section] = line
+        data = content.encode('utf-8')
+        for kind, name, start, body_start, end in iter_sections(io.BytesIO(data)):
+            body = data[body_start:end].decode('utf-8')
+            
+            if kind == SECTION_GAME:
+                solution['game_info'] = self.parse_game_info(body.strip())
+            elif kind == SECTION_RANGE:
+                solution[name] = self.parse_range_section(body)
+            else:
+                # Keep every tree node's body under its header (see DecisionTree for lookups)
+                solution['decision_tree'].setdefault(name, body.strip())
                     
         return solution
     
@@ -132,4 +314,7 @@ class SolutionLoader:
                 value = value.strip().strip("'\"")
                 game_info[key] = value
                 
-        return game_info
\ No newline at end of file
+        return game_info
+
+# Spans for the tracing layer (wrapped only while tracing is enabled)
+tracer.register(SolutionLoader, 'scan_solutions_folder', 'load_solution', 'parse_solution_content')
\ No newline at end of file
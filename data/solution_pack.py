@@ -0,0 +1,310 @@
+"""
+Single-file solution pack for a whole solutions tree.
+Holds a sorted (game, stack, scenario, board) key index plus contiguous range and tree payloads,
+read through one memory map. Identical ranges are stored once and shared by every record using them.
+
+Usage: python -m data.solution_pack build <solutions folder> [-o PACK]
+       python -m data.solution_pack info <pack file>
+"""
+
+import argparse
+import json
+import os
+import shutil
+import struct
+import tempfile
+import time
+import numpy as np
+from .hand_range import Range, NUM_COMBOS
+from .range_intern import range_digest
+from .scan_index import path_to_key, empty_available_data, add_solution_key
+
+PACK_FILE_NAME = 'solutions.pack'
+MAGIC = b'SOLP'
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+# magic, format version, header offset, header length
+_PREAMBLE = struct.Struct('<4sIQQ')
+
+# Key components are joined with the ASCII unit separator so byte order equals tuple order
+KEY_SEPARATOR = '\x1f'
+
+RECORD_DTYPE = np.dtype([
+    ('key_offset', '<u8'), ('key_length', '<u4'),
+    ('range_row', '<u4'), ('range_count', '<u4'),
+    ('meta_offset', '<u8'), ('meta_length', '<u4'),
+    ('tree_offset', '<u8'), ('tree_length', '<u8'),
+])
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def encode_key(key):
+    return KEY_SEPARATOR.join(key).encode('utf-8')
+
+
+def decode_key(raw):
+    return tuple(raw.decode('utf-8').split(KEY_SEPARATOR))
+
+
+def build_pack(root, pack_path=None, loader=None):
+    """Parse every solution file under root into a single pack file; returns (pack_path, count)."""
+    if loader is None:
+        from .solution_loader import SolutionLoader
+        loader = SolutionLoader(use_packs=False)
+    if pack_path is None:
+        pack_path = os.path.join(root, PACK_FILE_NAME)
+
+    entries = []
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            key = path_to_key(os.path.relpath(file_path, root))
+            if key is not None:
+                entries.append((encode_key(key), file_path))
+    entries.sort()
+
+    records = np.zeros(len(entries), dtype=RECORD_DTYPE)
+    key_blob = bytearray()
+    meta_blob = bytearray()
+    range_rows = 0
+    range_refs = 0
+    # Range content hash -> row already written
+    row_of = {}
+
+    temp_path = f"{pack_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as out, tempfile.TemporaryFile() as tree_file:
+            # Ranges stream straight into the pack; tree text is spooled and appended afterwards
+            out.write(b'\0' * ALIGNMENT)
+            ranges_offset = ALIGNMENT
+
+            for i, (key_bytes, file_path) in enumerate(entries):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    stat = os.fstat(f.fileno())
+                    solution = loader.parse_solution_content(f.read())
+
+                range_keys = [name for name, value in solution.items() if isinstance(value, Range)]
+                rows = []
+                for name in range_keys:
+                    data = np.ascontiguousarray(solution[name].frequencies, dtype=np.float32).tobytes()
+                    digest = range_digest(data)
+                    if digest not in row_of:
+                        row_of[digest] = range_rows
+                        range_rows += 1
+                        out.write(data)
+                    rows.append(row_of[digest])
+                range_refs += len(rows)
+
+                tree_nodes = []
+                tree_start = tree_file.tell()
+                for name, text in solution.get('decision_tree', {}).items():
+                    encoded = str(text).encode('utf-8')
+                    node_start = tree_file.tell() - tree_start
+                    tree_file.write(encoded)
+                    tree_nodes.append([name, node_start, node_start + len(encoded)])
+
+                meta = json.dumps({
+                    'game_info': solution.get('game_info', {}),
+                    'range_keys': range_keys,
+                    'range_rows': rows,
+                    'tree_nodes': tree_nodes,
+                    # Lets readers notice a source file edited after packing
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size
+                }, separators=(',', ':')).encode('utf-8')
+
+                records[i] = (len(key_blob), len(key_bytes), rows[0] if rows else 0, len(range_keys),
+                              len(meta_blob), len(meta), tree_start, tree_file.tell() - tree_start)
+                key_blob += key_bytes
+                meta_blob += meta
+
+            sections = {'ranges': ranges_offset}
+            for name, payload in (('tree', None), ('keys', key_blob), ('meta', meta_blob), ('records', records.tobytes())):
+                out.write(b'\0' * (_align(out.tell()) - out.tell()))
+                sections[name] = out.tell()
+                if payload is None:
+                    tree_file.seek(0)
+                    shutil.copyfileobj(tree_file, out)
+                else:
+                    out.write(payload)
+
+            header = json.dumps({
+                # Source root relative to the pack, so keys resolve wherever the pack was written
+                'root': os.path.relpath(os.path.abspath(root), os.path.dirname(os.path.abspath(pack_path))),
+                'count': len(entries),
+                'range_rows': range_rows,
+                'range_refs': range_refs,
+                'sections': sections,
+                'built': time.time()
+            }).encode('utf-8')
+            header_offset = out.tell()
+            out.write(header)
+            out.seek(0)
+            out.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, header_offset, len(header)))
+
+        os.replace(temp_path, pack_path)
+    except BaseException:
+        # Never leave a half-written pack beside the real one
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return pack_path, len(entries)
+
+
+class SolutionPack:
+    """Memory-mapped reader for a solution pack."""
+
+    def __init__(self, pack_path):
+        self.path = pack_path
+        self._buffer = np.memmap(pack_path, dtype=np.uint8, mode='r')
+
+        magic, version, header_offset, header_length = _PREAMBLE.unpack(bytes(self._buffer[:_PREAMBLE.size]))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a solution pack (or an old format version): {pack_path}")
+        self.header = json.loads(bytes(self._buffer[header_offset:header_offset + header_length]))
+        self.root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(pack_path)), self.header['root']))
+
+        sections = self.header['sections']
+        count = self.header['count']
+        self._records = np.frombuffer(self._buffer, dtype=RECORD_DTYPE, count=count,
+                                      offset=sections['records'])
+        self._ranges = np.frombuffer(self._buffer, dtype=np.float32,
+                                     count=self.header['range_rows'] * NUM_COMBOS,
+                                     offset=sections['ranges']).reshape(-1, NUM_COMBOS)
+        self._keys_offset = sections['keys']
+        self._meta_offset = sections['meta']
+        self._tree_offset = sections['tree']
+
+    def __len__(self):
+        return len(self._records)
+
+    def _key_bytes(self, i):
+        record = self._records[i]
+        start = self._keys_offset + int(record['key_offset'])
+        return bytes(self._buffer[start:start + int(record['key_length'])])
+
+    def find(self, key):
+        """Binary-search the sorted key index; returns the record number or -1."""
+        target = encode_key(key)
+        lo, hi = 0, len(self._records)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._records) and self._key_bytes(lo) == target:
+            return lo
+        return -1
+
+    def keys(self):
+        """Iterate over every (game, stack, scenario, board) key in sorted order."""
+        for i in range(len(self._records)):
+            yield decode_key(self._key_bytes(i))
+
+    def lookup(self, game, stack, scenario, board=''):
+        """Get the solution stored under a key, or None if the pack does not have it."""
+        index = self.find((game, stack, scenario, board))
+        return self.solution_at(index) if index >= 0 else None
+
+    def covers(self, path):
+        """Check whether a file or folder path lies under the pack's source root."""
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        return relative != '..' and not relative.startswith('..' + os.sep)
+
+    def load_path(self, file_path):
+        """Get the solution for a .txt path under the pack root, or None if it is not packed or changed since."""
+        path = os.path.abspath(file_path)
+        key = path_to_key(os.path.relpath(path, self.root)) if self.covers(path) else None
+        index = self.find(key) if key is not None else -1
+        if index < 0:
+            return None
+        meta = self._meta(index)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Files only present inside the pack are served as packed
+            return self.solution_at(index, meta)
+        if (stat.st_mtime_ns, stat.st_size) != (meta['mtime_ns'], meta['size']):
+            return None
+        return self.solution_at(index, meta)
+
+    def _meta(self, index):
+        record = self._records[index]
+        meta_start = self._meta_offset + int(record['meta_offset'])
+        return json.loads(bytes(self._buffer[meta_start:meta_start + int(record['meta_length'])]))
+
+    def solution_at(self, index, meta=None):
+        """Build the solution dict for a record; ranges are zero-copy views into the pack."""
+        record = self._records[index]
+        if meta is None:
+            meta = self._meta(index)
+
+        solution = {'game_info': meta['game_info'], 'decision_tree': {}}
+        for name, range_row in zip(meta['range_keys'], meta['range_rows']):
+            solution[name] = Range(self._ranges[range_row])
+
+        tree_start = self._tree_offset + int(record['tree_offset'])
+        for name, start, end in meta['tree_nodes']:
+            solution['decision_tree'][name] = bytes(self._buffer[tree_start + start:tree_start + end]).decode('utf-8')
+        return solution
+
+    def scan(self, folder_path):
+        """Build the scan_solutions_folder result for a folder covered by this pack."""
+        available_data = empty_available_data()
+        prefix = os.path.relpath(os.path.abspath(folder_path), self.root).replace('\\', '/')
+        if prefix == '.':
+            prefix = ''
+
+        for game, stack, scenario, board in self.keys():
+            # Re-root each key at the scanned folder
+            if prefix:
+                if game == prefix:
+                    game = ''
+                elif game.startswith(prefix + '/'):
+                    game = game[len(prefix) + 1:]
+                else:
+                    continue
+            add_solution_key(available_data, (game, stack, scenario, board))
+
+        return available_data
+
+
+def dedup_summary(header):
+    """Describe how many range references a pack's distinct rows serve."""
+    rows = header['range_rows']
+    refs = header['range_refs']
+    ratio = refs / rows if rows else 0.0
+    return f"{refs} ranges stored as {rows} distinct rows (dedup ratio {ratio:.1f}x, {(refs - rows) * NUM_COMBOS * 4 / 1e6:.1f} MB saved)"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build or inspect a solution pack.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="pack every solution file under a folder")
+    build.add_argument('folder')
+    build.add_argument('-o', '--output', help=f"pack path (default: <folder>/{PACK_FILE_NAME})")
+    info = commands.add_parser('info', help="print a pack's header and key count")
+    info.add_argument('pack')
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        pack_path, count = build_pack(args.folder, args.output)
+        elapsed = time.perf_counter() - start
+        print(f"Packed {count} solution files into {pack_path} "
+              f"({os.path.getsize(pack_path) / 1e6:.1f} MB, {elapsed:.1f}s)")
+        print(dedup_summary(SolutionPack(pack_path).header))
+    else:
+        pack = SolutionPack(args.pack)
+        print(json.dumps(pack.header, indent=2))
+        print(f"{len(pack)} keys")
+        print(dedup_summary(pack.header))
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
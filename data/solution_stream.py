@@ -0,0 +1,183 @@
+"""
+Streaming parser for large solver exports.
+Indexes the byte offset of every section and tree node in one incremental pass and
+materializes sections only when they are accessed.
+"""
+
+import re
+import threading
+from array import array
+from .hand_range import Range
+
+SECTION_GAME = 'game'
+SECTION_RANGE = 'range'
+SECTION_NODE = 'node'
+
+RANGE_SECTIONS = {
+    b'OOP preflop range': 'oop_range',
+    b'IP preflop range': 'ip_range'
+}
+
+# Tree node headers look like "root," / "1 check," / "2 bet 75" and never contain combo tokens
+_NODE_HEADER = re.compile(rb'^(root\b|\d+ [A-Za-z])')
+
+
+def classify_header(line):
+    """Get (kind, name) if a stripped line opens a new section, otherwise None."""
+    if line.startswith(b'game = '):
+        return SECTION_GAME, 'game_info'
+    if line in RANGE_SECTIONS:
+        return SECTION_RANGE, RANGE_SECTIONS[line]
+    if b'_' not in line and _NODE_HEADER.match(line):
+        return SECTION_NODE, line.decode('utf-8')
+    return None
+
+
+def iter_sections(stream):
+    """
+    Yield (kind, name, start, body_start, end) for every section of a binary stream.
+
+    The stream is read one line at a time, so memory use does not grow with
+    the file. Offsets are byte positions: start is the header line, body_start
+    the first line after it and end the start of the next section. Range lines
+    before any header form a bare 'range' section.
+    """
+    offset = 0
+    current = None
+
+    for raw in stream:
+        line_start = offset
+        offset += len(raw)
+        line = raw.strip()
+        if not line:
+            continue
+
+        header = classify_header(line)
+        if header is None:
+            if current is None:
+                current = (SECTION_RANGE, 'range', line_start, line_start)
+            continue
+
+        if current is not None:
+            yield current + (line_start,)
+        kind, name = header
+        if kind == SECTION_GAME:
+            # The game line is a section on its own; its body is the line itself
+            yield (kind, name, line_start, line_start, offset)
+            current = None
+        else:
+            current = (kind, name, line_start, offset)
+
+    if current is not None:
+        yield current + (offset,)
+
+
+def parse_node_body(text, range_parser):
+    """
+    Parse the lines of a tree node.
+
+    'action: AcKd_0.5 ...' lines give that action's per-combo frequencies,
+    bare combo lines give the node's range, and anything else is kept as info.
+    """
+    node = {'actions': {}, 'range': None, 'info': []}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        label, separator, rest = line.partition(':')
+        if separator and '_' not in label:
+            node['actions'][label.strip()] = range_parser.parse_range_line(rest)
+        elif '_' in line:
+            node['range'] = range_parser.parse_range_line(line)
+        else:
+            node['info'].append(line)
+    return node
+
+
+class LazySolution:
+    """A solution file opened through its section index; sections are parsed on access."""
+
+    def __init__(self, file_path, loader):
+        self.file_path = file_path
+        self.loader = loader
+        self.game_info = {}
+        # range section name -> (body_start, end)
+        self.range_offsets = {}
+        # tree nodes in file order: names plus flat (header_start, body_start, end) triples
+        self.node_names = []
+        self.node_offsets = array('q')
+        self._node_lookup = {}
+        self._ranges = {}
+        self._lock = threading.Lock()
+
+        game_offsets = None
+        with open(file_path, 'rb') as f:
+            for kind, name, start, body_start, end in iter_sections(f):
+                if kind == SECTION_GAME:
+                    game_offsets = (start, end)
+                elif kind == SECTION_RANGE:
+                    self.range_offsets[name] = (body_start, end)
+                else:
+                    self._node_lookup.setdefault(name, len(self.node_names))
+                    self.node_names.append(name)
+                    self.node_offsets.extend((start, body_start, end))
+
+        if game_offsets is not None:
+            self.game_info = loader.parse_game_info(self.read(*game_offsets).strip())
+
+    def read(self, start, end):
+        """Read the text between two byte offsets of the file."""
+        with open(self.file_path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start).decode('utf-8')
+
+    def get_range(self, name):
+        """Get a range section ('range', 'oop_range' or 'ip_range'), parsing it on first access."""
+        with self._lock:
+            if name in self._ranges:
+                return self._ranges[name]
+        if name not in self.range_offsets:
+            return Range()
+        range_data = self.loader.parse_range_section(self.read(*self.range_offsets[name]))
+        with self._lock:
+            self._ranges[name] = range_data
+        return range_data
+
+    def __len__(self):
+        return len(self.node_names)
+
+    def node_index(self, name):
+        """Get the position of the first node with this header, or -1."""
+        return self._node_lookup.get(name, -1)
+
+    def node_span(self, index):
+        """Get (header_start, body_start, end) byte offsets of a node."""
+        return tuple(self.node_offsets[index * 3:index * 3 + 3])
+
+    def node_text(self, index):
+        """Read a node's raw body text."""
+        _, body_start, end = self.node_span(index)
+        return self.read(body_start, end)
+
+    def node(self, index):
+        """Materialize one tree node; nothing is kept, so memory stays flat however many are read."""
+        if isinstance(index, str):
+            index = self.node_index(index)
+            if index < 0:
+                raise KeyError("No tree node with that header")
+        return parse_node_body(self.node_text(index), self.loader.range_parser)
+
+    def iter_nodes(self):
+        """Yield (name, node) for every tree node in file order, one at a time."""
+        for index, name in enumerate(self.node_names):
+            yield name, self.node(index)
+
+    def to_solution(self):
+        """Materialize the ranges into the dict shape returned by parse_solution_content."""
+        solution = {'game_info': self.game_info, 'decision_tree': {}}
+        for name in ('range', 'oop_range', 'ip_range'):
+            solution[name] = self.get_range(name)
+        # Like parse_solution_content, the first node under a repeated header wins
+        for name, index in self._node_lookup.items():
+            solution['decision_tree'][name] = self.node_text(index).strip()
+        return solution
\ No newline at end of file
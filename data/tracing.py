@@ -0,0 +1,214 @@
+"""
+Lightweight tracing of the lookup hot path.
+Keeps per-span counts and latency histograms and can write them as JSON or as a Chrome trace-event file.
+
+Traced methods are registered with register(); they are only wrapped while
+tracing is enabled, so a disabled tracer costs nothing on the hot path.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Latency histogram buckets: bucket 0 is < 1 us, bucket i is [2^(i-1), 2^i) us
+HISTOGRAM_BUCKETS = 32
+# Raw span events kept for the Chrome trace (oldest dropped first)
+MAX_EVENTS = 200000
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def _bucket(duration_ns):
+    return min((duration_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)
+
+
+def _bucket_upper_us(bucket):
+    return float(1 << bucket)
+
+
+class SpanStats:
+    """Count, total, extremes and log2 latency histogram of one span name."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration_ns):
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.histogram[_bucket(duration_ns)] += 1
+
+    def percentile_ms(self, fraction):
+        """Approximate percentile: the upper edge of the bucket holding it, capped at the max."""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= wanted:
+                return min(_bucket_upper_us(bucket) / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total_ns / 1e6,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'min_ms': (self.min_ns or 0) / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'p50_ms': self.percentile_ms(0.5),
+            'p90_ms': self.percentile_ms(0.9),
+            'p99_ms': self.percentile_ms(0.99),
+            # Upper edge in microseconds -> count, empty buckets left out
+            'histogram_us': {f"<{_bucket_upper_us(bucket):g}": count
+                             for bucket, count in enumerate(self.histogram) if count}
+        }
+
+
+class Tracer:
+    """Collects spans from any thread."""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.enabled = False
+        self.spans = {}
+        self.events = deque(maxlen=max_events)
+        self.thread_names = {}
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        # (owner, attribute, span name) registered for wrapping, and the originals while wrapped
+        self._points = []
+        self._originals = {}
+
+    def record(self, name, start_ns, end_ns):
+        thread_id = threading.get_ident()
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.add(end_ns - start_ns)
+            self.events.append((name, start_ns, end_ns, thread_id))
+            if thread_id not in self.thread_names:
+                self.thread_names[thread_id] = threading.current_thread().name
+
+    def span(self, name):
+        """Context manager timing a block; a shared no-op while tracing is disabled."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns())
+
+    def register(self, owner, *attributes):
+        """Register methods of a class for tracing as '<Class>.<method>'."""
+        for attribute in attributes:
+            point = (owner, attribute, f"{owner.__name__}.{attribute}")
+            self._points.append(point)
+            if self.enabled:
+                self._wrap(point)
+
+    def enable(self):
+        """Start tracing: wrap every registered method."""
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+        for point in self._points:
+            self._wrap(point)
+
+    def disable(self):
+        """Stop tracing and put the original methods back; collected data is kept."""
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+        for (owner, attribute), original in self._originals.items():
+            setattr(owner, attribute, original)
+        self._originals = {}
+
+    def reset(self):
+        """Drop all collected spans and events."""
+        with self._lock:
+            self.spans = {}
+            self.events.clear()
+            self.origin_ns = time.perf_counter_ns()
+
+    def _wrap(self, point):
+        owner, attribute, name = point
+        if (owner, attribute) in self._originals:
+            return
+        original = owner.__dict__[attribute]
+        record = self.record
+
+        @functools.wraps(original)
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns())
+
+        self._originals[(owner, attribute)] = original
+        setattr(owner, attribute, traced)
+
+    def stats(self):
+        """Get {span name: counters, latency summary and histogram}, slowest total first."""
+        with self._lock:
+            spans = {name: stats.to_dict() for name, stats in self.spans.items()}
+        return dict(sorted(spans.items(), key=lambda item: -item[1]['total_ms']))
+
+    def dump_json(self, path):
+        """Write the span statistics as JSON."""
+        data = {'enabled': self.enabled, 'spans': self.stats()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def write_chrome_trace(self, path):
+        """Write the recorded spans as a Chrome trace-event file (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+            origin_ns = self.origin_ns
+
+        trace_events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+                         'args': {'name': thread_name}}
+                        for thread_id, thread_name in thread_names.items()]
+        for name, start_ns, end_ns, thread_id in events:
+            trace_events.append({'name': name, 'cat': 'lookup', 'ph': 'X', 'pid': pid, 'tid': thread_id,
+                                 'ts': (start_ns - origin_ns) / 1000, 'dur': (end_ns - start_ns) / 1000})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+
+# The process-wide tracer and shortcuts to it
+tracer = Tracer()
+register = tracer.register
+span = tracer.span
+enable = tracer.enable
+disable = tracer.disable
+reset = tracer.reset
+stats = tracer.stats
+dump_json = tracer.dump_json
+write_chrome_trace = tracer.write_chrome_trace
+
+
+def is_enabled():
+    return tracer.enabled
\ No newline at end of file
@@ -6,9 +6,18 @@ Simplified version focused on position-based preflop decisions.
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
-from .range_grid import RangeGrid
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .range_grid import CanvasRangeGrid
+from .trace_panel import TracePanel
 from data.solution_loader import SolutionLoader
+from data.solution_cache import SolutionCache
 from data.range_parser import RangeParser
+from data.prefetch import Prefetcher
+from data.scenario_registry import ScenarioRegistry
+
+# How often the Tk thread checks a background load for completion
+LOAD_POLL_MS = 15
 
 class MainWindow:
     def __init__(self, root):
@@ -17,12 +26,26 @@ class MainWindow:
         self.root.geometry("1200x800")
         
         # Initialize data components
-        self.solution_loader = SolutionLoader()
+        self.solution_loader = SolutionLoader(cache=SolutionCache())
         self.range_parser = RangeParser()
         
         # Current solution data
         self.current_solution = None
         self.available_data = {}
+        # The part of the scan the dropdowns list: the folder itself, or its only game folder
+        self.game_data = {}
+        # Structured scenario keys for the scanned folder, rebuilt on every scan
+        self.scenario_registry = ScenarioRegistry()
+        
+        # Loads run off the Tk thread; each request gets a generation so superseded results are dropped
+        self.load_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="range-loader")
+        self.load_generation = 0
+        
+        # Warms the loader's memory cache with neighbouring scenarios after each load
+        self.prefetcher = Prefetcher(self.solution_loader)
+        
+        # Span statistics window, opened on demand
+        self.trace_panel = None
         
         # Predefined positions and actions for preflop scenarios
         self.positions = ['UTG', 'MP', 'CO', 'BU', 'SB', 'BB']
@@ -30,6 +53,7 @@ class MainWindow:
         self.stack_sizes = ['9', '11', '14', '20', '25', '30', '50', '100']
         
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.load_available_solutions()
         
     def setup_ui(self):
@@ -123,6 +147,8 @@ class MainWindow:
                   command=self.load_selected_range).grid(row=0, column=0, pady=5, sticky=(tk.W, tk.E))
         ttk.Button(button_frame, text="Clear Display", 
                   command=self.clear_display).grid(row=1, column=0, pady=5, sticky=(tk.W, tk.E))
+        ttk.Button(button_frame, text="Trace Panel", 
+                  command=self.open_trace_panel).grid(row=2, column=0, pady=5, sticky=(tk.W, tk.E))
         
         # Range statistics
         stats_frame = ttk.LabelFrame(control_frame, text="Range Statistics", padding="10")
@@ -149,7 +175,7 @@ class MainWindow:
         grid_container.grid(row=0, column=0, sticky=(tk.N))
         
         # Range grid
-        self.range_grid = RangeGrid(grid_container)
+        self.range_grid = CanvasRangeGrid(grid_container)
         self.range_grid.grid.grid(row=0, column=0, sticky=(tk.W, tk.E))
         
         # Legend
@@ -176,9 +202,17 @@ class MainWindow:
         
     def create_status_bar(self):
         """Create status bar at bottom."""
+        status_frame = ttk.Frame(self.root)
+        status_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        status_frame.columnconfigure(0, weight=1)
+        
         self.status_var = tk.StringVar(value="Ready - Select position and facing action to view ranges")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief="sunken", anchor="w")
-        status_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief="sunken", anchor="w")
+        status_bar.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
+        # Spins while a range is loading in the background
+        self.load_progress = ttk.Progressbar(status_frame, mode="indeterminate", length=120)
+        self.load_progress.grid(row=0, column=1, padx=(5, 0))
         
     def browse_folder(self):
         """Browse for solutions folder."""
@@ -197,9 +231,13 @@ class MainWindow:
                 
             # Load available data
             self.available_data = self.solution_loader.scan_solutions_folder(folder_path)
+            self.scenario_registry = ScenarioRegistry.from_available_data(self.available_data)
+            # A folder holding one game folder (e.g. Settings/Solutions) lists that game's stacks
+            game = self.scenario_registry.default_game()
+            self.game_data = self.available_data.get('games', {}).get(game, self.available_data) if game else self.available_data
             
             # Update stack sizes dropdown with available stacks
-            available_stacks = sorted(self.available_data.get('stacks', []))
+            available_stacks = sorted(self.game_data.get('stacks', []))
             if available_stacks:
                 self.stack_combo['values'] = available_stacks
                 self.stack_combo.set(available_stacks[0])
@@ -213,9 +251,9 @@ class MainWindow:
     def on_stack_change(self, event=None):
         """Handle stack size selection change."""
         stack = self.stack_var.get()
-        if stack and hasattr(self, 'available_data'):
+        if stack and hasattr(self, 'game_data'):
             # Update available scenarios based on stack
-            scenarios = self.available_data.get('stack_scenarios', {}).get(stack, [])
+            scenarios = self.game_data.get('stack_scenarios', {}).get(stack, [])
             # These should be position-based scenarios like "MP vs BB", "BU vs SB", etc.
             if scenarios:
                 # Auto-select first position and update facing options
@@ -238,70 +276,165 @@ class MainWindow:
         if not position:
             return
             
+        facing_options = self.facing_options_for(position)
+        self.facing_combo['values'] = facing_options
+        if facing_options:
+            self.facing_combo.set(facing_options[0])
+            
+    def facing_options_for(self, position):
+        """Get the facing actions offered for a position."""
         # Simple facing options based on position
         if position == "UTG":
-            facing_options = ["First to Act", "vs Raise", "vs 3-Bet"]
+            return ["First to Act", "vs Raise", "vs 3-Bet"]
         elif position == "SB":
-            facing_options = ["vs BB", "vs Raise", "vs 3-Bet"]
+            return ["vs BB", "vs Raise", "vs 3-Bet"]
         elif position == "BB":
-            facing_options = ["vs SB", "vs Raise", "vs 3-Bet"] 
+            return ["vs SB", "vs Raise", "vs 3-Bet"]
         else:
-            facing_options = ["First to Act", "vs Raise", "vs 3-Bet", "vs 4-Bet"]
-            
-        self.facing_combo['values'] = facing_options
-        if facing_options:
-            self.facing_combo.set(facing_options[0])
+            return ["First to Act", "vs Raise", "vs 3-Bet", "vs 4-Bet"]
             
     def load_selected_range(self):
-        """Load and display the selected range."""
-        try:
-            position = self.position_var.get()
-            facing = self.facing_var.get()
-            stack = self.stack_var.get()
+        """Start loading the selected range in the background; the grid updates when it arrives."""
+        position = self.position_var.get()
+        facing = self.facing_var.get()
+        stack = self.stack_var.get()
+        
+        if not all([position, facing, stack]):
+            self.status_var.set("Please select position, facing action, and stack size")
+            return
             
-            if not all([position, facing, stack]):
-                self.status_var.set("Please select position, facing action, and stack size")
-                return
-                
-            # Try to find a matching solution file
-            scenario_name = f"{position} vs {facing}" if facing != "First to Act" else position
+        # A newer request supersedes every load still in flight
+        self.load_generation += 1
+        generation = self.load_generation
+        request = {
+            'position': position,
+            'facing': facing,
+            'stack': stack,
+            'started': time.perf_counter()
+        }
+        
+        # Tk variables are only read here, on the Tk thread
+        folder_path = self.folder_var.get()
+        future = self.load_executor.submit(self.load_range_job, generation, folder_path,
+                                           self.scenario_registry, stack, position, facing)
+        
+        self.status_var.set(f"Loading {position} facing {facing} ({stack}BB)...")
+        self.load_progress.start(10)
+        self.root.after(LOAD_POLL_MS, self.poll_range_load, future, generation, request)
+        
+    def load_range_job(self, generation, folder_path, registry, stack, position, facing):
+        """
+        Find, parse and summarize a range on a worker thread.
+        
+        Touches no Tk state. Returns None once the request has been superseded,
+        so a stale load stops at the next stage instead of running to the end.
+        """
+        if generation != self.load_generation:
+            return None
             
-            # Load solution data (simplified - you'll need to adapt this to your file structure)
-            solution_data = self.load_solution_for_scenario(stack, scenario_name)
+        solution_data = self.load_solution_for_scenario(stack, position, facing, folder_path, registry)
+        if generation != self.load_generation:
+            return None
             
-            if solution_data:
-                # Parse and display the range
-                range_data = self.range_parser.parse_range_line(solution_data.get('range_line', ''))
-                
-                if range_data:
-                    self.display_range(range_data)
-                    self.update_statistics(range_data)
-                    self.status_var.set(f"Loaded range for {position} facing {facing} ({stack}BB)")
-                else:
-                    self.status_var.set("No range data found for this scenario")
-            else:
-                self.status_var.set(f"No solution found for {position} vs {facing} at {stack}BB")
-                
+        range_data = solution_data.get('range') if solution_data else None
+        stats = self.range_parser.calculate_range_statistics(range_data) if range_data else None
+        return {'found': solution_data is not None, 'range': range_data, 'stats': stats}
+        
+    def poll_range_load(self, future, generation, request):
+        """Check a background load from the Tk thread and show its result if it is still current."""
+        if generation != self.load_generation:
+            # Superseded: drop the result, and skip the work entirely if it has not started
+            future.cancel()
+            return
+            
+        elapsed_ms = (time.perf_counter() - request['started']) * 1000
+        if not future.done():
+            self.status_var.set(f"Loading {request['position']} facing {request['facing']} "
+                                f"({request['stack']}BB)... {elapsed_ms:.0f} ms")
+            self.root.after(LOAD_POLL_MS, self.poll_range_load, future, generation, request)
+            return
+            
+        self.load_progress.stop()
+        position, facing, stack = request['position'], request['facing'], request['stack']
+        
+        try:
+            result = future.result()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load range: {str(e)}")
+            return
             
-    def load_solution_for_scenario(self, stack, scenario):
-        """Load solution data for a specific scenario (simplified version)."""
-        # This is a simplified version - you'll need to adapt this to your actual file structure
+        if result is None:
+            return
+            
+        if result['range']:
+            self.current_range_data = result['range']
+            self.display_range(result['range'])
+            self.update_statistics(result['range'], result['stats'])
+            self.status_var.set(f"Loaded range for {position} facing {facing} ({stack}BB) in {elapsed_ms:.0f} ms"
+                                f"{self.prefetch_summary()}")
+            self.prefetch_neighbours(position, facing, stack)
+        elif result['found']:
+            self.status_var.set("No range data found for this scenario")
+        else:
+            self.status_var.set(f"No solution found for {position} vs {facing} at {stack}BB")
+            
+    def prefetch_neighbours(self, position, facing, stack):
+        """
+        Queue the scenarios most likely to be opened next for background loading.
+        
+        Order: the same spot at adjacent stacks, the other facing actions for
+        this position, then the other positions at this stack. Keys are built
+        here on the Tk thread; files are found on the prefetch thread.
+        """
+        stacks = sorted(self.stack_combo['values'] or self.stack_sizes, key=float)
+        keys = []
+        if stack in stacks:
+            i = stacks.index(stack)
+            for neighbour in (i + 1, i - 1):
+                if 0 <= neighbour < len(stacks):
+                    keys.append((stacks[neighbour], position, facing))
+        for other_facing in self.facing_options_for(position):
+            if other_facing != facing:
+                keys.append((stack, position, other_facing))
+        for other_position in self.positions:
+            if other_position != position:
+                keys.append((stack, other_position, self.facing_options_for(other_position)[0]))
+                
         folder_path = self.folder_var.get()
-        
-        # Try to find files that match the scenario
-        stack_folder = os.path.join(folder_path, stack)
-        if os.path.exists(stack_folder):
-            for filename in os.listdir(stack_folder):
-                if scenario.replace(" ", "").lower() in filename.replace(" ", "").lower():
-                    file_path = os.path.join(stack_folder, filename)
-                    try:
-                        return self.solution_loader.load_solution_file(file_path)
-                    except:
-                        continue
-                        
-        return None
+        registry = self.scenario_registry
+        self.prefetcher.schedule(keys, lambda key: self.scenario_file(folder_path, registry, *key))
+        
+    def prefetch_summary(self):
+        """Get the prefetch hit rate and failure count for the status bar, or '' before any prefetch."""
+        stats = self.prefetcher.stats()
+        parts = []
+        if stats['prefetched_files']:
+            parts.append(f"prefetch hits {stats['hits']}/{stats['requests']}, {stats['hit_rate']:.0%}")
+        if stats['failures']:
+            parts.append(f"{stats['failures']} prefetch errors")
+        return f" ({'; '.join(parts)})" if parts else ""
+        
+    def scenario_file(self, folder_path, registry, stack, position, facing):
+        """Get the solution file for a selection from the scenario registry, or None."""
+        relative_path = registry.file_for(stack, position, facing)
+        if relative_path is None:
+            return None
+        return os.path.join(folder_path, relative_path)
+        
+    def load_solution_for_scenario(self, stack, position, facing, folder_path=None, registry=None):
+        """Load solution data for a selection; None when the folder has no such scenario."""
+        if folder_path is None:
+            folder_path = self.folder_var.get()
+        if registry is None:
+            registry = self.scenario_registry
+            
+        # One dict lookup; aliases like UTG_open / 'UTG First to Act' resolve to the same key
+        file_path = self.scenario_file(folder_path, registry, stack, position, facing)
+        if file_path is None:
+            return None
+            
+        self.prefetcher.record_request(file_path)
+        return self.solution_loader.load_solution(file_path)
         
     def display_range(self, range_data):
         """Display range data on the grid."""
@@ -311,24 +444,27 @@ class MainWindow:
             filtered_data = range_data
         else:
             # Filter based on action type (simplified)
-            filtered_data = {}
-            for hand, frequency in range_data.items():
-                if action_filter == "Raise" and frequency > 0.7:
-                    filtered_data[hand] = frequency
-                elif action_filter == "Call" and 0.3 < frequency <= 0.7:
-                    filtered_data[hand] = frequency
-                elif action_filter == "Fold" and frequency <= 0.3:
-                    filtered_data[hand] = frequency
+            frequencies = range_data.frequencies
+            if action_filter == "Raise":
+                mask = frequencies > 0.7
+            elif action_filter == "Call":
+                mask = (frequencies > 0.3) & (frequencies <= 0.7)
+            else:
+                mask = frequencies <= 0.3
+            filtered_data = range_data.masked(mask)
                     
         self.range_grid.update_range(filtered_data)
         
-    def update_statistics(self, range_data):
-        """Update the statistics display."""
-        stats = self.range_parser.calculate_range_statistics(range_data)
+    def update_statistics(self, range_data, stats=None):
+        """Update the statistics display (stats may be precomputed off the Tk thread)."""
+        if stats is None:
+            stats = self.range_parser.calculate_range_statistics(range_data)
+        equity = f"{stats['equity']:.1f}%" if stats['equity'] is not None else "n/a"
         
         stats_text = f"""Range Statistics:
 
 VPIP: {stats['vpip']:.1f}%
+Equity vs Random: {equity}
 Total Combos: {stats['total_combos']}
 Played Combos: {stats['played_combos']}
 
@@ -355,8 +491,28 @@ Marginal: {stats['marginal']:.1f}%
             
     def clear_display(self):
         """Clear the range display."""
+        # Anything still loading would otherwise repaint the grid after it was cleared
+        self.load_generation += 1
+        self.load_progress.stop()
         self.range_grid.clear()
         self.stats_text.config(state='normal')
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.config(state='disabled')
-        self.status_var.set("Display cleared")
\ No newline at end of file
+        self.status_var.set("Display cleared")
+        
+    def open_trace_panel(self):
+        """Show the tracing debug panel, or raise it if it is already open."""
+        if self.trace_panel is not None:
+            self.trace_panel.window.lift()
+            return
+        self.trace_panel = TracePanel(self.root, on_close=self.on_trace_panel_close)
+        
+    def on_trace_panel_close(self):
+        self.trace_panel = None
+        
+    def on_close(self):
+        """Stop background loading and close the window."""
+        self.load_generation += 1
+        self.load_executor.shutdown(wait=False, cancel_futures=True)
+        self.prefetcher.stop()
+        self.root.destroy()
\ No newline at end of file
@@ -5,7 +5,10 @@ Creates a 13x13 grid representing all possible starting hands.
 
 import tkinter as tk
 from tkinter import ttk
+import numpy as np
 from data.range_parser import RangeParser
+from data.hand_range import GRID_RANKS, as_range
+from data.tracing import tracer
 
 class RangeGrid:
     def __init__(self, parent):
@@ -76,38 +79,21 @@ class RangeGrid:
         self.clear()
         
         # Store current range data for reference
-        self.current_range_data = range_data
+        self.current_range_data = as_range(range_data)
         
-        # Update each hand
-        for hand_string, frequency in range_data.items():
-            if '_' in hand_string:
-                hand_part = hand_string.split('_')[0]
-            else:
-                hand_part = hand_string
-                
-            # Convert specific hand to generic format if needed
-            if len(hand_part) == 4:
-                generic_hand = self.range_parser.convert_to_generic_hand(hand_part)
-            else:
-                generic_hand = hand_part
-                
-            # Find grid position for this hand using RangeParser method
-            position = self.range_parser.get_hand_matrix_position(generic_hand)
-            if position:
-                row, col = position
-                if (row, col) in self.buttons:
-                    color = self.range_parser.frequency_to_color(frequency)
-                    display_text = self.get_hand_text(row, col)
-                    
-                    # Add frequency percentage if > 0
-                    if frequency > 0:
-                        display_text += f"\n{frequency:.0%}"
-                    
-                    self.buttons[(row, col)].config(
-                        bg=color,
-                        activebackground=color,
-                        text=display_text
-                    )
+        # Class frequencies are laid out row * 13 + col, matching the grid
+        class_freqs = self.current_range_data.class_frequencies()
+        for index in np.flatnonzero(class_freqs > 0):
+            row, col = divmod(int(index), 13)
+            frequency = float(class_freqs[index])
+            color = self.range_parser.frequency_to_color(frequency)
+            display_text = f"{self.get_hand_text(row, col)}\n{frequency:.0%}"
+            
+            self.buttons[(row, col)].config(
+                bg=color,
+                activebackground=color,
+                text=display_text
+            )
                     
     def clear(self):
         """Clear all colors from the grid."""
@@ -125,15 +111,115 @@ class RangeGrid:
         print(f"Clicked: {hand_text}")  # For debugging
         
         # Optional: Show hand details in a tooltip or status update
-        if hasattr(self, 'current_range_data') and self.current_range_data:
-            # Try to find this hand in current range data
-            for hand_string, frequency in self.current_range_data.items():
-                generic_hand = hand_string.split('_')[0] if '_' in hand_string else hand_string
-                if len(generic_hand) == 4:
-                    generic_hand = self.range_parser.convert_to_generic_hand(generic_hand)
-                
-                if generic_hand == hand_text:
-                    print(f"Hand {hand_text}: {frequency:.1%} frequency")
-                    break
+        if getattr(self, 'current_range_data', None):
+            frequency = self.current_range_data.class_frequencies()[row * 13 + col]
+            if frequency > 0:
+                print(f"Hand {hand_text}: {frequency:.1%} frequency")
             else:
-                print(f"Hand {hand_text}: Not in current range (0% frequency)")
\ No newline at end of file
+                print(f"Hand {hand_text}: Not in current range (0% frequency)")
+
+class CanvasRangeGrid(RangeGrid):
+    """
+    The same 13x13 grid drawn on one Canvas.
+    
+    Each cell is a rectangle plus a text item. A redraw only reconfigures the
+    cells whose colour or label differ from what is on screen, so stepping
+    through similar ranges or showing several grids stays cheap.
+    """
+    
+    CELL_WIDTH = 46
+    CELL_HEIGHT = 36
+    HEADER_SIZE = 20
+    
+    def setup_grid(self):
+        """Create the canvas and its 169 cells."""
+        self.ranks = list(GRID_RANKS)
+        width = self.HEADER_SIZE + 13 * self.CELL_WIDTH + 1
+        height = self.HEADER_SIZE + 13 * self.CELL_HEIGHT + 1
+        self.canvas = tk.Canvas(self.parent, width=width, height=height, highlightthickness=0, bg="white")
+        
+        # Rank labels along the top and left edges
+        header_font = ("Arial", 10, "bold")
+        for i, rank in enumerate(self.ranks):
+            x = self.HEADER_SIZE + (i + 0.5) * self.CELL_WIDTH
+            y = self.HEADER_SIZE + (i + 0.5) * self.CELL_HEIGHT
+            self.canvas.create_text(x, self.HEADER_SIZE / 2, text=rank, font=header_font)
+            self.canvas.create_text(self.HEADER_SIZE / 2, y, text=rank, font=header_font)
+            
+        # Item ids and what each cell currently shows, indexed row * 13 + col
+        self.base_texts = [self.get_hand_text(row, col) for row in range(13) for col in range(13)]
+        self.rect_items = []
+        self.text_items = []
+        self.cell_colors = ["white"] * 169
+        self.cell_texts = list(self.base_texts)
+        self.frequencies = np.zeros(169, dtype=np.float32)
+        
+        cell_font = ("Arial", 8, "bold")
+        for index, text in enumerate(self.base_texts):
+            row, col = divmod(index, 13)
+            x0 = self.HEADER_SIZE + col * self.CELL_WIDTH
+            y0 = self.HEADER_SIZE + row * self.CELL_HEIGHT
+            self.rect_items.append(self.canvas.create_rectangle(
+                x0, y0, x0 + self.CELL_WIDTH, y0 + self.CELL_HEIGHT, fill="white", outline="#A0A0A0"
+            ))
+            self.text_items.append(self.canvas.create_text(
+                x0 + self.CELL_WIDTH / 2, y0 + self.CELL_HEIGHT / 2, text=text, font=cell_font, justify="center"
+            ))
+            
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.grid = self.canvas
+        
+    def cell_changes(self, class_freqs):
+        """
+        Get (index, color, text) for every cell that must change to show class_freqs.
+        
+        Only cells whose frequency moved are formatted, and of those only the
+        ones whose colour or rounded label differs are returned.
+        """
+        changes = []
+        for index in np.flatnonzero(class_freqs != self.frequencies):
+            index = int(index)
+            frequency = float(class_freqs[index])
+            if frequency > 0:
+                color = self.range_parser.frequency_to_color(frequency)
+                text = f"{self.base_texts[index]}\n{frequency:.0%}"
+            else:
+                color = "white"
+                text = self.base_texts[index]
+            if color != self.cell_colors[index] or text != self.cell_texts[index]:
+                changes.append((index, color, text))
+        return changes
+        
+    def apply_changes(self, class_freqs, changes):
+        """Reconfigure the changed canvas items and remember the new state."""
+        for index, color, text in changes:
+            if color != self.cell_colors[index]:
+                self.canvas.itemconfigure(self.rect_items[index], fill=color)
+                self.cell_colors[index] = color
+            if text != self.cell_texts[index]:
+                self.canvas.itemconfigure(self.text_items[index], text=text)
+                self.cell_texts[index] = text
+        self.frequencies = np.array(class_freqs, dtype=np.float32)
+        
+    def update_range(self, range_data):
+        """Update the grid with range data, touching only the cells that changed."""
+        self.current_range_data = as_range(range_data)
+        class_freqs = self.current_range_data.class_frequencies()
+        self.apply_changes(class_freqs, self.cell_changes(class_freqs))
+        
+    def clear(self):
+        """Clear all colors from the grid."""
+        self.current_range_data = None
+        class_freqs = np.zeros(169, dtype=np.float32)
+        self.apply_changes(class_freqs, self.cell_changes(class_freqs))
+        
+    def on_canvas_click(self, event):
+        """Map a click to its cell and handle it like a button press."""
+        col = int((event.x - self.HEADER_SIZE) // self.CELL_WIDTH)
+        row = int((event.y - self.HEADER_SIZE) // self.CELL_HEIGHT)
+        if 0 <= row < 13 and 0 <= col < 13 and event.x >= self.HEADER_SIZE and event.y >= self.HEADER_SIZE:
+            self.on_hand_click(row, col)
+
+# Spans for the tracing layer (wrapped only while tracing is enabled)
+tracer.register(RangeGrid, 'update_range')
+tracer.register(CanvasRangeGrid, 'update_range')
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Debug panel for the tracing layer.
+Shows per-span counts and latency percentiles, and saves them as JSON or a Chrome trace.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from data.tracing import tracer
+
+# Refresh interval while the panel is open
+REFRESH_MS = 1000
+
+COLUMNS = [
+    ('count', "Calls", 70),
+    ('total_ms', "Total ms", 90),
+    ('mean_ms', "Mean ms", 80),
+    ('p50_ms', "p50 ms", 80),
+    ('p90_ms', "p90 ms", 80),
+    ('p99_ms', "p99 ms", 80),
+    ('max_ms', "Max ms", 80)
+]
+
+
+class TracePanel:
+    def __init__(self, parent, on_close=None):
+        self.on_close_callback = on_close
+        self.window = tk.Toplevel(parent)
+        self.window.title("Trace")
+        self.window.geometry("760x320")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        """Create the toolbar and the span table."""
+        toolbar = ttk.Frame(self.window, padding=5)
+        toolbar.pack(side='top', fill='x')
+
+        self.enabled_var = tk.BooleanVar(value=tracer.enabled)
+        ttk.Checkbutton(toolbar, text="Tracing enabled", variable=self.enabled_var,
+                        command=self.toggle_tracing).pack(side='left')
+        ttk.Button(toolbar, text="Reset", command=self.reset).pack(side='left', padx=(10, 0))
+        ttk.Button(toolbar, text="Save JSON...", command=self.save_json).pack(side='left', padx=(10, 0))
+        ttk.Button(toolbar, text="Save Chrome Trace...", command=self.save_chrome_trace).pack(side='left', padx=(10, 0))
+
+        self.table = ttk.Treeview(self.window, columns=[key for key, _, _ in COLUMNS], show='tree headings')
+        self.table.heading('#0', text="Span")
+        self.table.column('#0', width=220)
+        for key, title, width in COLUMNS:
+            self.table.heading(key, text=title)
+            self.table.column(key, width=width, anchor='e')
+        self.table.pack(side='top', fill='both', expand=True)
+
+    def refresh(self):
+        """Redraw the table from the tracer and schedule the next refresh."""
+        stats = tracer.stats()
+        self.table.delete(*self.table.get_children())
+        for name, span in stats.items():
+            values = [span['count']] + [f"{span[key]:.3f}" for key, _, _ in COLUMNS[1:]]
+            self.table.insert('', 'end', text=name, values=values)
+        self.enabled_var.set(tracer.enabled)
+        self.after_id = self.window.after(REFRESH_MS, self.refresh)
+
+    def toggle_tracing(self):
+        if self.enabled_var.get():
+            tracer.enable()
+        else:
+            tracer.disable()
+
+    def reset(self):
+        tracer.reset()
+
+    def save_json(self):
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")], title="Save span statistics")
+        if path:
+            self.save(tracer.dump_json, path)
+
+    def save_chrome_trace(self):
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")], title="Save Chrome trace")
+        if path:
+            self.save(tracer.write_chrome_trace, path)
+
+    def save(self, write, path):
+        try:
+            write(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save {path}: {str(e)}", parent=self.window)
+
+    def close(self):
+        """Stop refreshing and close the window; tracing keeps its current state."""
+        self.window.after_cancel(self.after_id)
+        self.window.destroy()
+        if self.on_close_callback is not None:
+            self.on_close_callback()
\ No newline at end of file
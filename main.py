@@ -2,31 +2,106 @@
 """
 Preflop Range Solver GUI
 A desktop application for looking up preflop ranges from poker solutions.
+
+Run without arguments to open the GUI, or headless:
+    python main.py batch --folder <solutions folder> --out stats.csv|stats.jsonl|stats.parquet
+    python main.py boards --folder <solutions folder> --stack 20 --scenario BU_open [--filter paired,high=AK]
 """
 
 import sys
 import os
-import tkinter as tk
-from tkinter import messagebox
+import argparse
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import MainWindow
+def parse_args(argv):
+    """Parse the command line; no command means the GUI."""
+    arg_parser = argparse.ArgumentParser(description="Preflop Range Solver")
+    arg_parser.add_argument('--trace-events', default=None, metavar='PATH',
+                            help="trace the lookup hot path and write a Chrome trace-event file on exit")
+    arg_parser.add_argument('--trace-stats', default=None, metavar='PATH',
+                            help="trace the lookup hot path and write span statistics as JSON on exit")
+    commands = arg_parser.add_subparsers(dest='command')
+    
+    batch = commands.add_parser('batch', help="write range statistics for a whole solution library")
+    batch.add_argument('--folder', required=True, help="solutions folder to walk")
+    batch.add_argument('--out', required=True, help="output file (.csv, .jsonl or .parquet)")
+    batch.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], default=None,
+                       help="output format (default: from the --out extension)")
+    batch.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    batch.add_argument('--dead-cards', default=None, help="cards removed from every range, e.g. AhKs7d")
+    
+    boards = commands.add_parser('boards', help="aggregate a scenario's strategy across all of its boards")
+    boards.add_argument('--folder', required=True, help="solutions folder holding <stack>/<scenario>/<board>.txt")
+    boards.add_argument('--stack', required=True, help="stack size folder, e.g. 20")
+    boards.add_argument('--scenario', required=True, help="scenario folder, e.g. BU_open")
+    boards.add_argument('--game', default='', help="game folder when the solutions folder holds several games")
+    boards.add_argument('--node', default='', help="action path of the tree node to aggregate (default: root)")
+    boards.add_argument('--filter', default=None,
+                        help="board filter terms, all of which must hold: paired, unpaired, monotone, "
+                             "two-tone, rainbow, high=<ranks> (e.g. paired,high=AK)")
+    boards.add_argument('--weighting', default='uniform',
+                        help="uniform, isomorphic, or a JSON file of {board: weight}")
+    boards.add_argument('--grid-action', default=None, help="action shown as a 13x13 grid (default: the first)")
+    boards.add_argument('--out-grid', default=None, help="write per-hand-class frequencies to this CSV")
+    boards.add_argument('--out-boards', default=None, help="write the per-board summary to this CSV")
+    boards.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    
+    return arg_parser.parse_args(argv)
 
-def main():
-    """Main entry point for the application."""
+def run_gui():
+    """Launch the desktop application; tkinter is only imported here."""
+    import tkinter as tk
+    from tkinter import messagebox
+    
     try:
+        from gui.main_window import MainWindow
+        
         # Create the main window
         root = tk.Tk()
         app = MainWindow(root)
         
         # Start the application
         root.mainloop()
-        
+    
     except Exception as e:
         messagebox.showerror("Error", f"Failed to start application: {str(e)}")
         sys.exit(1)
 
+def write_trace(args):
+    """Write the trace files asked for on the command line."""
+    from data.tracing import tracer
+    
+    try:
+        if args.trace_events:
+            tracer.write_chrome_trace(args.trace_events)
+        if args.trace_stats:
+            tracer.dump_json(args.trace_stats)
+    except OSError as e:
+        print(f"Could not write trace: {e}", file=sys.stderr)
+
+def main(argv=None):
+    """Main entry point for the application."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    tracing = bool(args.trace_events or args.trace_stats)
+    if tracing:
+        from data.tracing import tracer
+        tracer.enable()
+    
+    try:
+        if args.command == 'batch':
+            # Headless: only the data package is imported
+            from data.batch import main as batch_main
+            sys.exit(batch_main(args))
+        if args.command == 'boards':
+            from data.board_report import main as boards_main
+            sys.exit(boards_main(args))
+        
+        run_gui()
+    finally:
+        if tracing:
+            write_trace(args)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Tests for the vectorized hand evaluator and the exact preflop class equities.
+Hands are checked against a straightforward best-of-21 five-card reference.
+
+Run: python -m unittest discover tests
+"""
+
+import unittest
+from collections import Counter
+from itertools import combinations
+import numpy as np
+from data.hand_evaluator import (
+    evaluate, hand_category, parse_cards, class_equity_vs_random, _board_scores, _canonical_boards, CATEGORY_NAMES
+)
+from data.hand_range import CLASS_INDEX, COMBO_CLASS, COMBO_CARDS, COMBO_CARD_MASK, COMBO_CONFLICTS
+from data.range_parser import RangeParser
+
+# Rare hands that random deals almost never reach, strongest first
+KNOWN_HANDS = [
+    'AsKsQsJsTs2c3d',   # royal flush
+    '6h5h4h3h2hAhKd',   # six-high straight flush beats the wheel flush
+    '5d4d3d2dAdKdQd',   # wheel straight flush
+    '9c9d9h9sAcKcQc',   # quads, ace kicker
+    'AhAdAcKsKdKh2c',   # aces full of kings from two sets
+    'AcQc9c7c3c2cKd',   # ace-high flush with six suited cards
+    'AcKdQhJsTc2d2h',   # broadway
+    '5c4d3h2sAcKdKh',   # wheel
+]
+
+# Published all-in equities against a random hand (exhaustive enumeration)
+PUBLISHED_EQUITY = {'AA': 0.8520, 'KK': 0.8240, '22': 0.5033, 'AKs': 0.6704, 'AKo': 0.6532, '72o': 0.3458}
+
+
+def reference_five(cards):
+    """Rank one five-card hand as a comparable tuple, the slow obvious way."""
+    ranks = sorted((card >> 2 for card in cards), reverse=True)
+    flush = len({card & 3 for card in cards}) == 1
+    unique = sorted(set(ranks), reverse=True)
+    straight_high = None
+    if len(unique) == 5 and unique[0] - unique[4] == 4:
+        straight_high = unique[0]
+    elif unique == [12, 3, 2, 1, 0]:
+        straight_high = 3
+
+    counts = Counter(ranks)
+    # Ranks ordered by (count, rank): the groups that decide ties come first
+    grouped = sorted(counts, key=lambda rank: (counts[rank], rank), reverse=True)
+    shape = sorted(counts.values(), reverse=True)
+
+    if straight_high is not None and flush:
+        return (8, straight_high)
+    if shape[0] == 4:
+        return (7, *grouped)
+    if shape == [3, 2]:
+        return (6, *grouped)
+    if flush:
+        return (5, *ranks)
+    if straight_high is not None:
+        return (4, straight_high)
+    if shape[0] == 3:
+        return (3, *grouped)
+    if shape[:2] == [2, 2]:
+        return (2, *grouped)
+    if shape[0] == 2:
+        return (1, *grouped)
+    return (0, *ranks)
+
+
+def reference_evaluate(cards):
+    """Best reference rank over every five-card subset."""
+    return max(reference_five(five) for five in combinations(cards, 5))
+
+
+def random_hands(rng, count, size):
+    return np.argsort(rng.random((count, 52)), axis=1)[:, :size].astype(np.uint8)
+
+
+class EvaluatorTest(unittest.TestCase):
+
+    def test_known_hands(self):
+        values = evaluate(np.array([parse_cards(hand) for hand in KNOWN_HANDS]))
+        for hand, value in zip(KNOWN_HANDS, values):
+            expected = reference_evaluate([int(card) for card in parse_cards(hand)])
+            self.assertEqual(hand_category(value), expected[0], f"{hand}: {CATEGORY_NAMES[hand_category(value)]}")
+        self.assertEqual(list(values), sorted(values, reverse=True))
+
+    def test_matches_reference(self):
+        """Categories agree and hands are ordered (and tied) exactly as the reference orders them."""
+        rng = np.random.default_rng(0)
+        for size in (5, 6, 7):
+            hands = random_hands(rng, 3000, size)
+            values = evaluate(hands)
+            references = [reference_evaluate([int(card) for card in hand]) for hand in hands]
+            for hand, value, reference in zip(hands, values, references):
+                self.assertEqual(hand_category(value), reference[0], f"category of {list(hand)}")
+            order = sorted(range(len(hands)), key=lambda i: references[i])
+            for previous, current in zip(order, order[1:]):
+                same = references[previous] == references[current]
+                self.assertEqual(same, values[previous] == values[current], f"ties of {size}-card hands")
+                self.assertLessEqual(values[previous], values[current], f"order of {size}-card hands")
+
+
+class ClassEquityTest(unittest.TestCase):
+
+    def test_board_scores_match_brute_force(self):
+        """The enumeration's per-board win/tie counts equal a direct all-pairs count with card removal."""
+        boards = random_hands(np.random.default_rng(1), 4, 5)
+        for board, scores in zip(boards, _board_scores(boards)):
+            hands = np.concatenate([COMBO_CARDS, np.repeat(board[None], len(COMBO_CARDS), axis=0)], axis=1)
+            values = evaluate(hands).astype(np.int64)
+            live = ~COMBO_CARD_MASK[:, board].any(axis=1)
+            matchups = live[:, None] & live[None, :] & ~COMBO_CONFLICTS
+            expected = (((values[:, None] > values[None, :]) & matchups).sum(axis=1)
+                        + 0.5 * ((values[:, None] == values[None, :]) & matchups).sum(axis=1))
+            expected[~live] = 0
+            np.testing.assert_array_equal(scores, expected)
+
+    def test_canonical_boards_cover_every_board(self):
+        boards, counts = _canonical_boards()
+        self.assertEqual(len(boards), 134459)
+        self.assertEqual(int(counts.sum()), 2598960)
+        self.assertTrue((np.diff(boards.astype(np.int64), axis=1) > 0).all())
+
+    def test_table_matches_published_equities(self):
+        equity = class_equity_vs_random()
+        self.assertEqual(equity.shape, (169,))
+        self.assertFalse(equity.flags.writeable)
+        for hand, expected in PUBLISHED_EQUITY.items():
+            self.assertAlmostEqual(float(equity[CLASS_INDEX[hand]]), expected, delta=1e-4, msg=hand)
+
+    def test_strength_categories_are_fixed(self):
+        premium, strong = RangeParser().strength_masks()
+        for hand, is_premium, is_strong in (('AKo', True, False), ('77', True, False), ('AQs', True, False),
+                                            ('KQs', False, True), ('66', False, True), ('72o', False, False)):
+            members = COMBO_CLASS == CLASS_INDEX[hand]
+            self.assertEqual(bool(premium[members].all()), is_premium, hand)
+            self.assertEqual(bool(strong[members].all()), is_strong, hand)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Lossless round-trip tests for palette-coded range storage.
+
+Run: python -m unittest discover tests
+"""
+
+import unittest
+import numpy as np
+from data.hand_range import NUM_COMBOS, Range
+from data.palette import PaletteArray, CompactSolution, PALETTE4, PALETTE8, FLOAT16, FLOAT32
+
+GRID = np.array([0, 0.25, 0.5, 0.75, 1], dtype=np.float32)
+
+
+class PaletteArrayTest(unittest.TestCase):
+
+    def assertRoundTrip(self, values, kind):
+        """Encode, check the storage kind, and check the decode is the same float32 bits and shape."""
+        values = np.asarray(values, dtype=np.float32)
+        packed = PaletteArray.encode(values)
+        self.assertEqual(packed.kind, kind)
+        decoded = packed.decode()
+        self.assertEqual(decoded.dtype, np.float32)
+        self.assertEqual(decoded.shape, values.shape)
+        np.testing.assert_array_equal(decoded.view(np.uint32), values.view(np.uint32))
+        return packed
+
+    def test_palette4(self):
+        rng = np.random.default_rng(0)
+        self.assertRoundTrip(GRID[rng.integers(0, 5, NUM_COMBOS)], PALETTE4)
+        self.assertRoundTrip(GRID[rng.integers(0, 5, (4, NUM_COMBOS))], PALETTE4)
+
+    def test_palette4_odd_lengths(self):
+        rng = np.random.default_rng(1)
+        for length in (1, 3, 7, 1325):
+            self.assertRoundTrip(GRID[rng.integers(0, 5, length)], PALETTE4)
+        self.assertRoundTrip(GRID[rng.integers(0, 5, (3, 7))], PALETTE4)
+        # Sixteen distinct values is still one nibble each
+        self.assertRoundTrip(np.arange(16, dtype=np.float32) / 16, PALETTE4)
+
+    def test_empty(self):
+        self.assertRoundTrip(np.zeros(0, dtype=np.float32), PALETTE4)
+        self.assertRoundTrip(np.zeros((0, NUM_COMBOS), dtype=np.float32), PALETTE4)
+
+    def test_palette8(self):
+        rng = np.random.default_rng(2)
+        self.assertRoundTrip(np.round(rng.random(NUM_COMBOS), 2), PALETTE8)
+        self.assertRoundTrip(np.arange(17, dtype=np.float32), PALETTE8)
+        self.assertRoundTrip(np.arange(256, dtype=np.float32) / 256, PALETTE8)
+
+    def test_float16_fallback(self):
+        rng = np.random.default_rng(3)
+        packed = self.assertRoundTrip(rng.integers(0, 2048, NUM_COMBOS).astype(np.float32) / 2048, FLOAT16)
+        self.assertEqual(packed.data.dtype, np.float16)
+
+    def test_float32_fallback(self):
+        rng = np.random.default_rng(4)
+        self.assertRoundTrip(rng.random((4, NUM_COMBOS)).astype(np.float32), FLOAT32)
+        # Values float16 cannot hold exactly must not be rounded into it
+        values = np.arange(300, dtype=np.float32) / 300
+        values[0] = 1e-8
+        self.assertRoundTrip(values, FLOAT32)
+
+    def test_signed_zero(self):
+        values = np.array([0.0, -0.0, 0.5, -0.0, 1.0], dtype=np.float32)
+        packed = self.assertRoundTrip(values, PALETTE4)
+        self.assertEqual(len(packed.palette), 4)
+        self.assertTrue(np.signbit(packed.decode()[1]))
+        self.assertFalse(np.signbit(packed.decode()[0]))
+
+        rng = np.random.default_rng(5)
+        many = rng.integers(0, 2048, NUM_COMBOS).astype(np.float32) / 2048
+        many[:10] = -0.0
+        self.assertRoundTrip(many, FLOAT16)
+        many = rng.random(NUM_COMBOS).astype(np.float32)
+        many[:10] = -0.0
+        self.assertRoundTrip(many, FLOAT32)
+
+
+class CompactSolutionTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        rng = np.random.default_rng(6)
+        solution = {
+            'range': Range(GRID[rng.integers(0, 5, NUM_COMBOS)]),
+            'oop_range': Range(rng.random(NUM_COMBOS).astype(np.float32)),
+            'ip_range': Range(),
+            'name': 'UTG_open',
+            'info': {'pot': 2.5}
+        }
+        decoded = CompactSolution(solution).decode()
+        self.assertEqual(set(decoded), set(solution))
+        for name in ('range', 'oop_range', 'ip_range'):
+            np.testing.assert_array_equal(decoded[name].frequencies, solution[name].frequencies)
+        self.assertEqual(decoded['name'], 'UTG_open')
+        self.assertEqual(decoded['info'], {'pot': 2.5})
+
+    def test_without_ranges(self):
+        self.assertEqual(CompactSolution({'name': 'BB'}).decode(), {'name': 'BB'})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Tests that a preloaded library loads exactly like its files parsed one by one.
+
+Run: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from data.solution_loader import SolutionLoader
+from benchmarks.synthetic import write_solution_library
+
+
+class PreloadTest(unittest.TestCase):
+
+    def test_preload_keeps_whole_solutions(self):
+        with tempfile.TemporaryDirectory() as root:
+            write_solution_library(root, stacks=1, scenarios=2, boards=2, tree_nodes=5)
+            paths = [os.path.join(dir_path, name) for dir_path, _, names in os.walk(root)
+                     for name in names if name.endswith('.txt')]
+            expected = {path: SolutionLoader(memory_budget=0).load_solution(path) for path in paths}
+            self.assertTrue(any(len(solution['decision_tree']) == 5 for solution in expected.values()))
+
+            loader = SolutionLoader()
+            result = loader.preload(root, workers=1)
+            self.assertEqual(len(result.paths), len(paths))
+            for path, solution in expected.items():
+                self.assertTrue(loader.is_cached(path), path)
+                loaded = loader.load_solution(path)
+                self.assertEqual(loaded['game_info'], solution['game_info'])
+                self.assertEqual(loaded['decision_tree'], solution['decision_tree'])
+                for name in ('range', 'oop_range', 'ip_range'):
+                    np.testing.assert_array_equal(loaded[name].frequencies, solution[name].frequencies)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file